@@ -0,0 +1,132 @@
+"""Compare throughput and peak memory of the executor backends on the same workload.
+
+Each backend is run in a fresh interpreter so that peak memory measurements do not leak
+between runs. Synthetic input files are generated once and reused by every backend.
+Peak memory is read from ``resource.getrusage``, so this script only runs on POSIX systems.
+
+Usage:
+    python benchmarks/executor_backends.py --files 8 --points 2000000 --workers 4
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+import laspy
+import numpy as np
+
+from las_trx.config import ReferenceConfig, TransformConfig, TrxCoordType, TrxExecutor, TrxReference, TrxVd
+from las_trx.transformation import TransformationManager
+
+BACKENDS = (TrxExecutor.PROCESS, TrxExecutor.THREAD)
+
+
+def make_config(backend: TrxExecutor, max_workers: int) -> TransformConfig:
+    return TransformConfig(
+        origin=ReferenceConfig(
+            ref_frame=TrxReference.ITRF14,
+            epoch=date(2020, 1, 1),
+            vd=TrxVd.GRS80,
+            coord_type=TrxCoordType.UTM10,
+        ),
+        destination=ReferenceConfig(
+            ref_frame=TrxReference.NAD83CSRS,
+            epoch=date(2010, 1, 1),
+            vd=TrxVd.CGG2013A,
+            coord_type=TrxCoordType.UTM10,
+        ),
+        max_workers=max_workers,
+        executor=backend,
+    )
+
+
+def make_inputs(directory: Path, num_files: int, num_points: int) -> None:
+    rng = np.random.default_rng(42)
+    for i in range(num_files):
+        header = laspy.LasHeader(point_format=3, version="1.2")
+        header.scales = np.array([0.01, 0.01, 0.01])
+        header.offsets = np.array([480_000.0, 5_400_000.0, 0.0])
+
+        las = laspy.LasData(header)
+        las.x = rng.uniform(480_000, 481_000, num_points)
+        las.y = rng.uniform(5_400_000, 5_401_000, num_points)
+        las.z = rng.uniform(0, 100, num_points)
+        las.write(str(directory / f"input_{i}.laz"))
+
+
+def peak_rss_mb() -> float:
+    """Peak RSS of this process plus its largest child, in MB (ru_maxrss is KB on Linux, bytes on macOS)."""
+    unit = 1 if sys.platform == "darwin" else 1024
+    self_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit
+    child_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * unit
+    return (self_rss + child_rss) / 1024**2
+
+
+def run_one(backend: TrxExecutor, input_dir: Path, max_workers: int) -> dict:
+    config = make_config(backend, max_workers)
+    output_dir = input_dir / f"out_{backend.value}"
+    output_dir.mkdir(exist_ok=True)
+
+    start = time.perf_counter()
+    manager = TransformationManager(config, str(input_dir / "*.laz"), str(output_dir / "{}.laz"))
+    num_points = 0
+    for input_file in manager.input_files:
+        with laspy.open(str(input_file)) as las_file:
+            num_points += las_file.header.point_count
+    errors = [exc for _, _, exc in manager.execute_transformations() if exc is not None]
+    elapsed = time.perf_counter() - start
+
+    return {
+        "backend": backend.value,
+        "workers": manager.num_workers,
+        "seconds": round(elapsed, 2),
+        "points_per_second": round(num_points / elapsed),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "errors": len(errors),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=8)
+    parser.add_argument("--points", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--run-one", choices=[b.value for b in BACKENDS], help=argparse.SUPPRESS)
+    parser.add_argument("--input-dir", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_one:
+        print(json.dumps(run_one(TrxExecutor(args.run_one), args.input_dir, args.workers)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_dir = Path(tmp)
+        make_inputs(input_dir, args.files, args.points)
+
+        print(f"{'backend':<10}{'workers':>8}{'seconds':>10}{'points/s':>14}{'peak MB':>10}{'errors':>8}")
+        for backend in BACKENDS:
+            cmd = [
+                sys.executable,
+                __file__,
+                "--run-one",
+                backend.value,
+                "--input-dir",
+                str(input_dir),
+                "--workers",
+                str(args.workers),
+            ]
+            result = json.loads(subprocess.run(cmd, check=True, capture_output=True, text=True).stdout)
+            print(
+                f"{result['backend']:<10}{result['workers']:>8}{result['seconds']:>10}"
+                f"{result['points_per_second']:>14}{result['peak_rss_mb']:>10}{result['errors']:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -7,14 +7,26 @@ from multiprocessing import freeze_support
 from queue import Queue
 
 from loguru import logger
-from PyQt6.QtWidgets import QApplication
-
-from las_trx.main_window import LogDisplayThread, LogWriteStream, MainWindow
 
 
 def main() -> None:
     freeze_support()
 
+    # Any arguments select the command line interface, which must not need a display
+    if len(sys.argv) > 1:
+        from las_trx.cli import main as cli_main
+
+        sys.exit(cli_main())
+
+    run_gui()
+
+
+def run_gui() -> None:
+    """Start the graphical application."""
+    from PyQt6.QtWidgets import QApplication
+
+    from las_trx.main_window import LogDisplayThread, LogWriteStream, MainWindow
+
     # Configure logging
     log_msg_queue = Queue()
     log_write_stream = LogWriteStream(log_msg_queue)
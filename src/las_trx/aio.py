@@ -0,0 +1,109 @@
+"""Asyncio API for embedding transformations in async services.
+
+Example:
+    >>> async for event in transform_files(config, "/data/in/*.laz", "/data/out/{}_nad83.laz"):
+    ...     if isinstance(event, FileResult) and event.error:
+    ...         log.error(event.error)
+
+Planning (header scans, pool start-up) and the pool itself run on background threads, so the
+event loop is never blocked. Cancelling the consuming task stops new files from being started;
+files already running are finished in the background.
+"""
+
+import asyncio
+import contextlib
+import threading
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from loguru import logger
+
+from las_trx.config import TransformConfig
+from las_trx.constants import UIConstants
+from las_trx.transformation import TransformationManager
+
+
+@dataclass(frozen=True)
+class FileResult:
+    """Outcome of transforming one file."""
+
+    input_file: Path
+    output_file: Path
+    error: Exception | None
+
+
+@dataclass(frozen=True)
+class TransformProgress:
+    """Number of chunks processed out of the total for the batch."""
+
+    chunks: int
+    total_chunks: int
+
+
+_DONE = object()
+
+
+async def transform_files(
+    config: TransformConfig,
+    input_pattern: str,
+    output_pattern: str,
+    progress_interval: float = UIConstants.PROGRESS_UPDATE_INTERVAL,
+) -> AsyncIterator[FileResult | TransformProgress]:
+    """Transform a batch of files, yielding per-file results and progress as they happen.
+
+    Args:
+        config: Transformation configuration
+        input_pattern: Input file pattern (supports wildcards)
+        output_pattern: Output file pattern (supports {} formatting)
+        progress_interval: Seconds between progress checks while no file finishes
+
+    Yields:
+        FileResult for each file, interleaved with TransformProgress whenever progress changes
+
+    Raises:
+        FileOperationError: If the input and output paths conflict
+    """
+    manager = await asyncio.to_thread(TransformationManager, config, input_pattern, output_pattern)
+    loop = asyncio.get_running_loop()
+    results: asyncio.Queue = asyncio.Queue()
+
+    def publish(item: object) -> None:
+        # The loop may already be closed if the consumer went away
+        with contextlib.suppress(RuntimeError):
+            loop.call_soon_threadsafe(results.put_nowait, item)
+
+    def run() -> None:
+        try:
+            for input_file, output_file, exception in manager.execute_transformations():
+                publish(FileResult(input_file, output_file, exception))
+        except Exception as e:
+            logger.error(f"Transformation failed: {e}")
+            publish(e)
+        finally:
+            publish(_DONE)
+
+    threading.Thread(target=run, name="las-trx-async", daemon=True).start()
+
+    last_chunks = -1
+    try:
+        while True:
+            try:
+                item = await asyncio.wait_for(results.get(), timeout=progress_interval)
+            except asyncio.TimeoutError:
+                chunks = await asyncio.to_thread(manager.progress)
+                if chunks != last_chunks:
+                    last_chunks = chunks
+                    yield TransformProgress(chunks, manager.total_iterations)
+                continue
+
+            if item is _DONE:
+                chunks = await asyncio.to_thread(manager.progress)
+                if chunks != last_chunks:
+                    yield TransformProgress(chunks, manager.total_iterations)
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        manager.cancel()
@@ -0,0 +1,128 @@
+"""In-memory API for transforming coordinates held by other Python code.
+
+Example:
+    >>> import laspy
+    >>> from las_trx.api import transform_las
+    >>> las = laspy.read("input.laz")
+    >>> transformed = transform_las(las, config)
+    >>> transformed.write("output.laz")
+
+Transformers are cached per thread, so repeated calls with the same config do not set up the
+transformation pipeline again.
+"""
+
+import copy
+
+import laspy
+import numpy as np
+
+from las_trx.config import TransformConfig, TrxFilterFrame
+from las_trx.constants import ProcessingConstants
+from las_trx.epochs import check_gps_time, uses_gps_time_epochs
+from las_trx.filters import check_filters, source_mask, spatial_mask, uses_spatial_filter
+from las_trx.transformation import (
+    clear_header_geokeys,
+    get_transformer,
+    stack_point_dimensions,
+    transform_coords,
+    write_header_geokeys_from_crs,
+)
+
+
+def transform_coordinates(
+    coords: np.ndarray, config: TransformConfig, chunk_size: int = ProcessingConstants.DEFAULT_CHUNK_SIZE
+) -> np.ndarray:
+    """Transform an array of coordinates.
+
+    Args:
+        coords: Array of shape (N, 3) with coordinates in the origin reference system
+        config: Transformation configuration
+        chunk_size: Number of coordinates transformed at a time
+
+    Returns:
+        New float64 array of shape (N, 3) with coordinates in the destination reference system
+
+    Raises:
+        ValueError: If the array does not have shape (N, 3), or the config needs point records, for GPS time
+            epochs or filters
+    """
+    coords = np.asarray(coords, dtype=np.float64)
+    if coords.ndim != 2 or coords.shape[1] != 3:
+        raise ValueError(f"Expected coordinates of shape (N, 3), got {coords.shape}")
+    if uses_gps_time_epochs(config):
+        raise ValueError("GPS time epochs need the GPS time of each point, use transform_las")
+    if config.filters is not None:
+        raise ValueError("Filters need point records, use transform_las")
+
+    transformer = get_transformer(config)
+    result = np.empty_like(coords)
+    for start in range(0, len(coords), chunk_size):
+        chunk = coords[start : start + chunk_size]
+        result[start : start + len(chunk)] = np.array(list(transformer(chunk)))
+    return result
+
+
+def transform_las(
+    las: laspy.LasData, config: TransformConfig, chunk_size: int = ProcessingConstants.DEFAULT_CHUNK_SIZE
+) -> laspy.LasData:
+    """Transform the points of a LasData, as if it had been written to a file and transformed.
+
+    The input is left untouched. The returned copy holds the points kept by the filters of the
+    config, with the destination CRS VLRs, the default scales and offsets at the minimum of the
+    transformed coordinates.
+
+    Args:
+        las: Point cloud in the origin reference system
+        config: Transformation configuration
+        chunk_size: Number of points transformed at a time
+
+    Returns:
+        Transformed copy of the point cloud
+
+    Raises:
+        ValueError: If the origin epoch comes from GPS time and the points have no adjusted standard GPS time, or
+            the filters need a dimension the points do not have
+    """
+    if uses_gps_time_epochs(config):
+        check_gps_time(las.header)
+    filters = config.filters
+    if filters is not None:
+        check_filters(filters, las.header)
+
+    transformer = get_transformer(config)
+    kept = []
+    transformed = []
+    for start in range(0, len(las.points), chunk_size):
+        points = las.points[start : start + chunk_size]
+        indices = np.arange(start, start + len(points))
+
+        # Drop the points rejected by the filters, before transforming them unless in the destination frame
+        if filters is not None:
+            mask = source_mask(filters, points)
+            points, indices = points[mask], indices[mask]
+        if not len(points):
+            continue
+        coords = transform_coords(config, transformer, stack_point_dimensions(points), points)
+        if uses_spatial_filter(filters, TrxFilterFrame.DESTINATION):
+            mask = spatial_mask(filters, coords)
+            coords, indices = coords[mask], indices[mask]
+        kept.append(indices)
+        transformed.append(coords)
+    kept = np.concatenate(kept) if kept else np.empty(0, dtype=np.int64)
+    transformed = np.concatenate(transformed) if transformed else np.empty((0, 3))
+
+    header = copy.deepcopy(las.header)
+    header = clear_header_geokeys(header)
+    header = write_header_geokeys_from_crs(header, config.destination.crs)
+
+    header.scales = np.full(3, ProcessingConstants.DEFAULT_SCALE_PRECISION)
+    if len(transformed):
+        header.offsets = np.min(transformed, axis=0)
+
+    # Only X, Y and Z change, and they are all overwritten below in the new scaling
+    points = laspy.ScaleAwarePointRecord(las.points.array[kept], las.points.point_format, header.scales, header.offsets)
+    result = laspy.LasData(header, points)
+    result.x = transformed[:, 0]
+    result.y = transformed[:, 1]
+    result.z = transformed[:, 2]
+    return result
@@ -0,0 +1,112 @@
+"""Adaptive worker count for runs that may be either I/O- or CPU-bound."""
+
+from loguru import logger
+
+from las_trx.constants import AutoscaleConstants
+
+
+class WorkerAutoscaler:
+    """Hill-climbs the number of concurrent workers towards the best aggregate throughput.
+
+    Throughput and CPU utilization are measured over fixed time windows. While adding workers keeps
+    improving points/sec, the worker count grows: doubling when workers are CPU-bound, one at a time
+    when they mostly wait on I/O. The first change that does not pay off settles the count back on
+    the best one seen.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        initial_workers: int = AutoscaleConstants.INITIAL_WORKERS,
+        window: float = AutoscaleConstants.WINDOW_SECONDS,
+        min_gain: float = AutoscaleConstants.MIN_GAIN,
+    ) -> None:
+        """Initialize the autoscaler.
+
+        Args:
+            max_workers: Upper bound on the worker count
+            initial_workers: Worker count to start probing from
+            window: Length of a measurement window in seconds
+            min_gain: Relative throughput gain needed to keep a larger worker count
+        """
+        self.max_workers = max_workers
+        self.target = min(max_workers, initial_workers)
+        self.window = window
+        self.min_gain = min_gain
+        self.settled = max_workers <= 1
+
+        self.best_target = self.target
+        self.best_rate = 0.0
+        self.history: dict[int, float] = {}
+
+        self._window_start: float | None = None
+        self._window_points = 0
+        self._window_cpu = 0.0
+        self._warming_up = False
+
+    def update(self, points: int, cpu_seconds: float, active_workers: int, now: float) -> int:
+        """Feed the latest progress totals and get the worker count to run with.
+
+        Args:
+            points: Total points processed so far
+            cpu_seconds: Total CPU time used by workers so far
+            active_workers: Number of workers busy during the window
+            now: Current monotonic time in seconds
+
+        Returns:
+            Target number of concurrent workers
+        """
+        if self._window_start is None:
+            self._start_window(points, cpu_seconds, now)
+            return self.target
+
+        # Windows without any progress are extended, e.g. while workers open their first files
+        elapsed = now - self._window_start
+        if elapsed < self.window or points == self._window_points:
+            return self.target
+
+        rate = (points - self._window_points) / elapsed
+        utilization = (cpu_seconds - self._window_cpu) / (elapsed * max(1, active_workers))
+        self._start_window(points, cpu_seconds, now)
+
+        # The window right after a change includes worker start-up, so it is not representative
+        if self._warming_up:
+            self._warming_up = False
+        elif not self.settled:
+            self._evaluate(rate, utilization)
+        return self.target
+
+    def _start_window(self, points: int, cpu_seconds: float, now: float) -> None:
+        self._window_start = now
+        self._window_points = points
+        self._window_cpu = cpu_seconds
+
+    def _evaluate(self, rate: float, utilization: float) -> None:
+        self.history[self.target] = rate
+        message = f"Autoscale: {self.target} worker(s) at {rate:,.0f} points/s, {utilization:.0%} CPU per worker"
+
+        if rate <= self.best_rate * (1 + self.min_gain):
+            logger.info(
+                f"{message} did not beat {self.best_target} worker(s) at {self.best_rate:,.0f} points/s, "
+                f"settling on {self.best_target} worker(s)"
+            )
+            self.target = self.best_target
+            self.settled = True
+            return
+
+        self.best_target = self.target
+        self.best_rate = rate
+        if self.target >= self.max_workers:
+            logger.info(f"{message}, settling on the maximum of {self.max_workers} worker(s)")
+            self.settled = True
+            return
+
+        if utilization >= AutoscaleConstants.CPU_BOUND_UTILIZATION:
+            new_target = min(self.max_workers, self.target * 2)
+            reason = "CPU-bound"
+        else:
+            new_target = self.target + 1
+            reason = "I/O-bound"
+        logger.info(f"{message} ({reason}), scaling up to {new_target} worker(s)")
+        self.target = new_target
+        self._warming_up = True
@@ -0,0 +1,209 @@
+"""Command line interface for running LAS-TRX without the GUI."""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from loguru import logger
+
+from las_trx.config import TrxExecutor
+from las_trx.constants import DaemonConstants, SpoolConstants
+from las_trx.daemon import TransformService, serve
+from las_trx.file_operations import FileOperationError, load_config_from_file
+from las_trx.spool import FileSpool, SpoolError, SpoolWorker
+from las_trx.transformation import TransformationError, TransformationManager, transform_stream
+
+
+def _run(args: argparse.Namespace) -> int:
+    config = load_config_from_file(args.config)
+    manager = TransformationManager(config, args.input, args.output, manifest=args.manifest)
+    failed = sum(exception is not None for _, _, exception in manager.execute_transformations())
+    return 1 if failed or manager.failed_merges else 0
+
+
+def _preview(args: argparse.Namespace) -> int:
+    config = load_config_from_file(args.config)
+    manager = TransformationManager(config, args.input, args.output, manifest=args.manifest)
+    reports = manager.preview(args.write, seed=args.seed)
+    for report in reports:
+        sys.stdout.write(report.describe() + "\n")
+    if args.write is not None and reports:
+        sys.stdout.write(f"Wrote the transformed sample to {args.write}\n")
+    return 1 if any(report.failed_count for report in reports) else 0
+
+
+def _estimate(args: argparse.Namespace) -> int:
+    config = load_config_from_file(args.config)
+    manager = TransformationManager(config, args.input, args.output, manifest=args.manifest)
+    estimate = manager.estimate(seed=args.seed)
+    sys.stdout.write(estimate.describe() + "\n")
+    return 0 if estimate.fits else 1
+
+
+def _spool_submit(args: argparse.Namespace) -> int:
+    config = load_config_from_file(args.config)
+    FileSpool(args.spool).submit(config, args.input, args.output)
+    return 0
+
+
+def _spool_work(args: argparse.Namespace) -> int:
+    spool = FileSpool(args.spool)
+    with SpoolWorker(spool, args.workers, lease=args.lease, executor=args.executor) as worker:
+        _, failed = worker.run()
+    return 1 if failed else 0
+
+
+def _spool_status(args: argparse.Namespace) -> int:
+    counts = FileSpool(args.spool).counts()
+    sys.stdout.write(" ".join(f"{state}={count}" for state, count in counts.items()) + "\n")
+    return 0
+
+
+def _spool_retry(args: argparse.Namespace) -> int:
+    requeued = FileSpool(args.spool).requeue_failed()
+    sys.stdout.write(f"Requeued {requeued} failed job(s)\n")
+    return 0
+
+
+def _pipe(args: argparse.Namespace) -> int:
+    config = load_config_from_file(args.config)
+    num_points = transform_stream(config, sys.stdin.buffer, sys.stdout.buffer)
+    logger.info(f"Transformed {num_points} points")
+    return 0
+
+
+def _serve(args: argparse.Namespace) -> int:
+    service = TransformService(args.workers, args.executor)
+    token = os.environ.get(DaemonConstants.AUTH_ENV_VAR)
+    serve(service, host=args.host, port=args.port, socket_path=args.socket, token=token)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line argument parser."""
+    parser = argparse.ArgumentParser(prog="las-trx", description="Run LAS-TRX without the GUI.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Transform a batch of files on this node")
+    run.add_argument("--config", type=Path, required=True, help="Config file saved from the GUI")
+    inputs = run.add_mutually_exclusive_group(required=True)
+    inputs.add_argument("--input", help="Input file pattern, e.g. '/data/tiles/*.laz'")
+    inputs.add_argument(
+        "--manifest",
+        type=Path,
+        help="CSV or JSON lines file listing the input files with their own origin and destination overrides",
+    )
+    run.add_argument(
+        "--output",
+        required=True,
+        help="Output file pattern, e.g. '/data/out/{}_nad83.laz', or '/data/out/{x}_{y}.laz' for tiled outputs",
+    )
+    run.set_defaults(handler=_run)
+
+    preview = commands.add_parser(
+        "preview",
+        help="Transform a sample of chunks of each input and report the results, as 'run' would transform them",
+        description="Transform a stratified random sample of chunks of each input with the same config as 'run', "
+        "and report the transformed bounds, the Z shift and the points that failed to transform. "
+        "Exits with 1 if any sampled point transformed to NaN or fell outside a grid.",
+    )
+    preview.add_argument("--config", type=Path, required=True, help="Config file saved from the GUI")
+    preview_inputs = preview.add_mutually_exclusive_group(required=True)
+    preview_inputs.add_argument("--input", help="Input file pattern, e.g. '/data/tiles/*.laz'")
+    preview_inputs.add_argument("--manifest", type=Path, help="CSV or JSON lines manifest, as for 'run'")
+    preview.add_argument("--output", required=True, help="Output file pattern of the run, as for 'run'")
+    preview.add_argument("--write", type=Path, help="Also write the transformed sample to this LAS/LAZ file")
+    preview.add_argument("--seed", type=int, help="Seed of the chunk sampling, for repeatable previews")
+    preview.set_defaults(handler=_preview)
+
+    estimate = commands.add_parser(
+        "estimate",
+        help="Estimate the runtime, output size and disk space of a run without running it",
+        description="Benchmark a few chunks of a representative input of each kind on this machine, extrapolate the "
+        "runtime for the configured workers and the size of the outputs, and compare it with the free space of "
+        "their filesystems. Exits with 1 if the outputs will not fit.",
+    )
+    estimate.add_argument("--config", type=Path, required=True, help="Config file saved from the GUI")
+    estimate_inputs = estimate.add_mutually_exclusive_group(required=True)
+    estimate_inputs.add_argument("--input", help="Input file pattern, e.g. '/data/tiles/*.laz'")
+    estimate_inputs.add_argument("--manifest", type=Path, help="CSV or JSON lines manifest, as for 'run'")
+    estimate.add_argument("--output", required=True, help="Output file pattern of the run, as for 'run'")
+    estimate.add_argument("--seed", type=int, help="Seed of the chunk sampling, for repeatable estimates")
+    estimate.set_defaults(handler=_estimate)
+
+    spool = commands.add_parser("spool", help="Share a batch between workers on several nodes")
+    spool_commands = spool.add_subparsers(dest="spool_command", required=True)
+
+    submit = spool_commands.add_parser("submit", help="Add the files of a batch to a spool")
+    submit.add_argument("spool", type=Path, help="Spool directory on a shared filesystem")
+    submit.add_argument("--config", type=Path, required=True, help="Config file saved from the GUI")
+    submit.add_argument("--input", required=True, help="Input file pattern, e.g. '/data/tiles/*.laz'")
+    submit.add_argument("--output", required=True, help="Output file pattern, e.g. '/data/out/{}_nad83.laz'")
+    submit.set_defaults(handler=_spool_submit)
+
+    work = spool_commands.add_parser("work", help="Run jobs from a spool until it is drained")
+    work.add_argument("spool", type=Path, help="Spool directory on a shared filesystem")
+    work.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Jobs to run at once on this node")
+    work.add_argument(
+        "--lease",
+        type=float,
+        default=SpoolConstants.LEASE_SECONDS,
+        help="Seconds without a heartbeat after which a job is given to another worker",
+    )
+    work.add_argument("--executor", type=TrxExecutor, choices=list(TrxExecutor), default=TrxExecutor.AUTO)
+    work.set_defaults(handler=_spool_work)
+
+    status = spool_commands.add_parser("status", help="Count the jobs in each state")
+    status.add_argument("spool", type=Path, help="Spool directory on a shared filesystem")
+    status.set_defaults(handler=_spool_status)
+
+    retry = spool_commands.add_parser("retry", help="Move failed jobs back to pending")
+    retry.add_argument("spool", type=Path, help="Spool directory on a shared filesystem")
+    retry.set_defaults(handler=_spool_retry)
+
+    pipe = commands.add_parser(
+        "pipe",
+        help="Transform a LAS/LAZ stream from stdin to an uncompressed LAS stream on stdout",
+        description="Transform a LAS/LAZ stream from stdin to an uncompressed LAS stream on stdout, e.g. "
+        "'laszip -stdin -stdout < in.laz | las-trx pipe --config c.json | laszip -stdin -olaz -stdout > out.laz'",
+    )
+    pipe.add_argument("--config", type=Path, required=True, help="Config file saved from the GUI")
+    pipe.set_defaults(handler=_pipe)
+
+    server = commands.add_parser(
+        "serve",
+        help="Run a transform service with a warm worker pool",
+        description="Run a transform service with a warm worker pool. If the "
+        f"{DaemonConstants.AUTH_ENV_VAR} environment variable is set, clients must send its value "
+        "as a bearer token.",
+    )
+    server.add_argument("--host", default=DaemonConstants.DEFAULT_HOST, help="Address to listen on")
+    server.add_argument("--port", type=int, default=DaemonConstants.DEFAULT_PORT, help="Port to listen on")
+    server.add_argument("--socket", type=Path, help="Listen on this Unix socket instead of TCP")
+    server.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Files to transform at once")
+    server.add_argument("--executor", type=TrxExecutor, choices=list(TrxExecutor), default=TrxExecutor.AUTO)
+    server.set_defaults(handler=_serve)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run a command line command.
+
+    Args:
+        argv: Command line arguments, defaults to sys.argv
+
+    Returns:
+        Process exit code
+    """
+    args = build_parser().parse_args(argv)
+
+    logger.remove()
+    logger.add(sys.stderr, level="DEBUG" if os.getenv("DEBUG") else "INFO")
+
+    try:
+        return args.handler(args)
+    except (FileOperationError, SpoolError, TransformationError) as e:
+        sys.stderr.write(f"{e}\n")
+        return 2
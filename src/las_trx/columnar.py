@@ -0,0 +1,116 @@
+"""Arrow IPC and Parquet output of transformed points.
+
+Each transformed chunk is written as one Arrow record batch or Parquet row group, with the
+transformed coordinates as float64 ``x``, ``y`` and ``z`` columns followed by the other point
+dimensions. The destination CRS is stored as WKT in the ``crs`` schema metadata.
+
+Writing these formats needs the optional pyarrow dependency (``pip install las-trx[parquet]``).
+"""
+
+from pathlib import Path
+from types import TracebackType
+from typing import TYPE_CHECKING
+
+import laspy
+import numpy as np
+
+from las_trx.config import TransformConfig
+from las_trx.constants import ColumnarConstants
+
+if TYPE_CHECKING:
+    from laspy import LasHeader
+    from pyproj import CRS
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Optional dependency
+    pa = None
+    pq = None
+
+
+def is_columnar(path: Path) -> bool:
+    """Check whether a path names an Arrow or Parquet output."""
+    return path.suffix.lower() in (ColumnarConstants.PARQUET_SUFFIX, ColumnarConstants.ARROW_SUFFIX)
+
+
+def parquet_copy_path(config: TransformConfig, output_file: Path) -> Path | None:
+    """Get the path of the Parquet copy written next to a LAS output, if the config asks for one."""
+    if not config.parquet_copy or is_columnar(output_file):
+        return None
+    return output_file.with_suffix(ColumnarConstants.PARQUET_SUFFIX)
+
+
+class ColumnarWriter:
+    """Writes transformed point chunks to an Arrow IPC or Parquet file."""
+
+    def __init__(self, path: Path, header: "LasHeader", crs: "CRS") -> None:
+        """Initialize the writer.
+
+        Args:
+            path: Output path, ending in .parquet or .arrow
+            header: Header of the transformed points, used to write an empty file when no chunk is written
+            crs: Reference system of the transformed coordinates
+
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        if pa is None:
+            raise ImportError(
+                "Writing Arrow and Parquet files needs pyarrow, install it with 'pip install las-trx[parquet]'"
+            )
+        self.path = path
+        self.header = header
+        self.crs_wkt = crs.to_wkt()
+        self._writer = None
+        self._schema = None
+
+    def __enter__(self) -> "ColumnarWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        if self._writer is None and exc_type is None:
+            self.write_points(laspy.ScaleAwarePointRecord.zeros(0, header=self.header), np.empty((0, 3)))
+        if self._writer is not None:
+            self._writer.close()
+
+    def write_points(self, points: laspy.ScaleAwarePointRecord, coords: np.ndarray) -> None:
+        """Write a chunk of points.
+
+        Args:
+            points: Point records of the chunk
+            coords: Transformed coordinates of the chunk, of shape (N, 3)
+        """
+        batch = self._record_batch(points, coords)
+        if self._writer is None:
+            self._schema = batch.schema.with_metadata({ColumnarConstants.CRS_METADATA_KEY: self.crs_wkt})
+            if self.path.suffix.lower() == ColumnarConstants.PARQUET_SUFFIX:
+                self._writer = pq.ParquetWriter(str(self.path), self._schema, compression=ColumnarConstants.COMPRESSION)
+            else:
+                self._writer = pa.ipc.new_file(str(self.path), self._schema)
+        self._writer.write_batch(batch.replace_schema_metadata(self._schema.metadata))
+
+    @staticmethod
+    def _record_batch(points: laspy.ScaleAwarePointRecord, coords: np.ndarray) -> "pa.RecordBatch":
+        # Column-major coordinates give each column a contiguous buffer that Arrow wraps without copying
+        coords = np.asfortranarray(coords, dtype=np.float64)
+        names = ["x", "y", "z"]
+        arrays = [pa.array(coords[:, 0]), pa.array(coords[:, 1]), pa.array(coords[:, 2])]
+
+        for name in points.point_format.dimension_names:
+            if name in ("X", "Y", "Z"):
+                continue
+            values = np.asarray(points[name])
+            if values.ndim > 1:
+                # Extra bytes dimensions with several elements per point
+                arrays.append(pa.FixedSizeListArray.from_arrays(pa.array(values.ravel()), values.shape[1]))
+            else:
+                arrays.append(pa.array(values))
+            names.append(name)
+
+        return pa.RecordBatch.from_arrays(arrays, names=names)
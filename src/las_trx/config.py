@@ -1,6 +1,8 @@
 import enum
+import functools
 import os
 from datetime import date
+from pathlib import Path
 
 from csrspy.enums import CoordType, Reference, VerticalDatum
 from csrspy.utils import date_to_decimal_year
@@ -76,6 +78,18 @@ class TrxVd(str, enum.Enum):
             return VerticalCRS.from_epsg(5713)
         return None
 
+    @classmethod
+    def from_vertical_crs(cls, crs: CRS | None, ref_frame: "TrxReference") -> "TrxVd":
+        """Find the vertical datum of a vertical CRS, or the ellipsoid heights of a frame without one."""
+        if crs is None:
+            return TrxVd.WGS84 if ref_frame == TrxReference.WGS84 else TrxVd.GRS80
+
+        for vd in cls:
+            # Prefix matching also accepts epoch-tagged variants, e.g. CGVD2013a(2010)
+            if vd.vertical_crs is not None and crs.datum.name.startswith(vd.vertical_crs.datum.name):
+                return vd
+        raise ValueError(f"Unsupported vertical datum {crs.datum.name}")
+
     def to_csrspy(self) -> VerticalDatum:
         return {
             TrxVd.WGS84: VerticalDatum.WGS84,
@@ -141,6 +155,17 @@ class TrxReference(str, enum.Enum):
         else:
             raise KeyError(f"No implementation found for {self}")
 
+    @classmethod
+    def from_datum_name(cls, name: str) -> "TrxReference":
+        """Find the reference frame of a geodetic datum."""
+        # All NAD83(CSRS) realizations, e.g. "North American Datum of 1983 (CSRS) version 6"
+        if name.startswith("North American Datum of 1983 (CSRS)"):
+            return TrxReference.NAD83CSRS
+        for ref_frame in cls:
+            if ref_frame.geodetic_crs.datum.name == name:
+                return ref_frame
+        raise ValueError(f"Unsupported reference frame {name}")
+
     def to_csrspy(self) -> Reference:
         return {
             TrxReference.NAD83CSRS: Reference.NAD83CSRS,
@@ -230,6 +255,64 @@ class TrxCoordType(str, enum.Enum):
         }[self]
 
 
+class TrxExecutor(str, enum.Enum):
+    AUTO = "auto"
+    PROCESS = "process"
+    THREAD = "thread"
+
+
+class TrxEpochMode(str, enum.Enum):
+    FIXED = "fixed"
+    GPS_TIME = "gps_time"
+
+
+class TrxSortOrder(str, enum.Enum):
+    NONE = "none"
+    MORTON = "morton"
+    HILBERT = "hilbert"
+
+
+class TrxFilterFrame(str, enum.Enum):
+    ORIGIN = "origin"
+    DESTINATION = "destination"
+
+
+class TrxSpaceCheck(str, enum.Enum):
+    OFF = "off"
+    WARN = "warn"
+    REFUSE = "refuse"
+
+
+@functools.cache
+def reference_crs(ref_frame: TrxReference, coord_type: TrxCoordType, vd: TrxVd) -> CRS:
+    """Build the CRS of a reference, once per combination as files that share a reference share its CRS."""
+    geodetic_crs = ref_frame.geodetic_crs
+
+    # See compound CRS docs https://pyproj4.github.io/pyproj/stable/build_crs.html
+    if coord_type == TrxCoordType.CART:
+        xy_crs = GeocentricCRS(name=geodetic_crs.name, datum=geodetic_crs.datum)
+    elif coord_type == TrxCoordType.GEOG:
+        xy_crs = geodetic_crs
+    elif coord_type.is_utm():
+        xy_crs = ProjectedCRS(
+            name=f"{geodetic_crs.name} / UTM zone {coord_type.utm_zone}N",
+            conversion=UTMConversion(str(coord_type.utm_zone), hemisphere="N"),
+            geodetic_crs=geodetic_crs,
+            cartesian_cs=Cartesian2DCS(),
+        )
+    else:
+        raise IndexError(f"Could not create horizontal CRS for {coord_type}")
+
+    z_crs = vd.vertical_crs
+
+    if z_crs is not None and not xy_crs.is_geocentric:
+        return CompoundCRS(name=f"{xy_crs.name} + {z_crs.name}", components=[xy_crs, z_crs])
+    elif xy_crs.is_geographic:
+        return xy_crs.to_3d()
+
+    return xy_crs
+
+
 class ReferenceConfig(BaseModel):
     ref_frame: TrxReference
     epoch: date
@@ -238,31 +321,38 @@ class ReferenceConfig(BaseModel):
 
     @property
     def crs(self) -> CRS:
-        geodetic_crs = self.ref_frame.geodetic_crs
-
-        # See compound CRS docs https://pyproj4.github.io/pyproj/stable/build_crs.html
-        if self.coord_type == TrxCoordType.CART:
-            xy_crs = GeocentricCRS(name=geodetic_crs.name, datum=geodetic_crs.datum)
-        elif self.coord_type == TrxCoordType.GEOG:
-            xy_crs = geodetic_crs
-        elif self.coord_type.is_utm():
-            xy_crs = ProjectedCRS(
-                name=f"{geodetic_crs.name} / UTM zone {self.coord_type.utm_zone}N",
-                conversion=UTMConversion(str(self.coord_type.utm_zone), hemisphere="N"),
-                geodetic_crs=geodetic_crs,
-                cartesian_cs=Cartesian2DCS(),
-            )
-        else:
-            raise IndexError(f"Could not create horizontal CRS for {self.coord_type}")
+        return reference_crs(self.ref_frame, self.coord_type, self.vd)
+
+    @classmethod
+    def from_crs(cls, crs: CRS, epoch: date) -> "ReferenceConfig":
+        """Find the reference config of a CRS, the inverse of the crs property.
 
-        z_crs = self.vd.vertical_crs
+        Args:
+            crs: CRS to match, e.g. parsed from the VLRs of a file
+            epoch: Epoch of the coordinates, which a CRS does not hold
 
-        if z_crs is not None and not xy_crs.is_geocentric:
-            return CompoundCRS(name=f"{xy_crs.name} + {z_crs.name}", components=[xy_crs, z_crs])
-        elif xy_crs.is_geographic:
-            return xy_crs.to_3d()
+        Raises:
+            ValueError: If the CRS has no equivalent reference frame, coordinate type or vertical datum
+        """
+        horizontal, vertical = crs, None
+        if crs.is_compound:
+            horizontal, vertical = crs.sub_crs_list
 
-        return xy_crs
+        if horizontal.is_geocentric:
+            coord_type = TrxCoordType.CART
+        elif horizontal.is_projected:
+            zone = horizontal.utm_zone
+            if zone is None or not zone.endswith("N"):
+                raise ValueError(f"Unsupported projection {horizontal.name}, only northern UTM zones are supported")
+            coord_type = TrxCoordType.from_utm_zone(int(zone[:-1]))
+        elif horizontal.is_geographic:
+            coord_type = TrxCoordType.GEOG
+        else:
+            raise ValueError(f"Unsupported CRS {horizontal.name}")
+
+        ref_frame = TrxReference.from_datum_name(horizontal.datum.name)
+        vd = TrxVd.from_vertical_crs(vertical, ref_frame)
+        return cls(ref_frame=ref_frame, epoch=epoch, vd=vd, coord_type=coord_type)
 
     def to_csrspy(self) -> dict:
         return {
@@ -273,10 +363,73 @@ class ReferenceConfig(BaseModel):
         }
 
 
+class StagingConfig(BaseModel):
+    scratch_dir: Path | None = None
+    prefetch: int = 2
+    cap_mb: int = 10_240
+
+
+class TilingConfig(BaseModel):
+    size: float = 1000.0
+    max_open: int = 64
+
+
+class FilterConfig(BaseModel):
+    frame: TrxFilterFrame = TrxFilterFrame.ORIGIN
+    bbox: tuple[float, float, float, float] | None = None
+    polygon: list[tuple[float, float]] | None = None
+    classifications: list[int] | None = None
+    return_numbers: list[int] | None = None
+    gps_time: tuple[float, float] | None = None
+
+
+class TabularConfig(BaseModel):
+    x_column: int | str = 0
+    y_column: int | str = 1
+    z_column: int | str = 2
+    delimiter: str | None = None
+    header: bool = False
+    array_key: str | None = None
+
+
+class TargetConfig(BaseModel):
+    destination: ReferenceConfig
+    output: str
+
+
 class TransformConfig(BaseModel):
     origin: ReferenceConfig
     destination: ReferenceConfig
     max_workers: int = os.cpu_count()
+    executor: TrxExecutor = TrxExecutor.AUTO
+    memory_budget_mb: int | None = None
+    max_tasks_per_child: int | None = None
+    threads_per_worker: int | None = None
+    pin_workers: bool = False
+    autoscale: bool = False
+    staging: StagingConfig | None = None
+    io_limit_mb_s: float | None = None
+    low_priority: bool = False
+    tabular: TabularConfig = TabularConfig()
+    parquet_copy: bool = False
+    targets: list[TargetConfig] = []
+    epoch_mode: TrxEpochMode = TrxEpochMode.FIXED
+    epoch_resolution_days: int = 30
+    detect_origin: bool = False
+    sort_order: TrxSortOrder = TrxSortOrder.NONE
+    lax_index: bool = False
+    tiling: TilingConfig | None = None
+    merge: bool = False
+    filters: FilterConfig | None = None
+    space_check: TrxSpaceCheck = TrxSpaceCheck.OFF
+
+    def merges_inputs(self) -> bool:
+        """Check whether outputs are merged from several inputs after a whole batch, as tiled and merged outputs are."""
+        return self.tiling is not None or self.merge
+
+    def for_target(self, target: TargetConfig) -> "TransformConfig":
+        """Get the config transforming to an additional target instead of the main destination."""
+        return self.model_copy(update={"destination": target.destination, "targets": []})
 
     def to_csrspy(self) -> CSRSPYConfig:
         s = self.origin.to_csrspy()
@@ -52,9 +52,17 @@ class ConfigurationBuilder:
         origin = self.build_origin_config()
         destination = self.build_destination_config()
         max_workers = self.config_controller.validate_core_count(self.ui.get_worker_cores())
+        autoscale = self.ui.is_autoscale_enabled()
+        io_limit_mb_s = self.ui.get_io_limit()
+        low_priority = self.ui.is_low_priority_enabled()
 
         return self.config_controller.create_transform_config(
-            origin=origin, destination=destination, max_workers=max_workers
+            origin=origin,
+            destination=destination,
+            max_workers=max_workers,
+            autoscale=autoscale,
+            io_limit_mb_s=io_limit_mb_s,
+            low_priority=low_priority,
         )
 
     def apply_config_to_ui(self, config: TransformConfig) -> None:
@@ -79,6 +87,9 @@ class ConfigurationBuilder:
 
         # Apply worker configuration
         self.ui.set_worker_cores(config.max_workers)
+        self.ui.set_autoscale_enabled(config.autoscale)
+        self.ui.set_io_limit(config.io_limit_mb_s)
+        self.ui.set_low_priority_enabled(config.low_priority)
 
         # Enable epoch transformation if epochs differ
         if origin.epoch != destination.epoch:
@@ -1,5 +1,6 @@
 """Application constants and configuration values."""
 
+from datetime import datetime
 from typing import ClassVar
 
 
@@ -16,6 +17,167 @@ class ProcessingConstants:
 
     DEFAULT_CHUNK_SIZE = 10_000
     DEFAULT_SCALE_PRECISION = 0.01
+    TRANSFORMER_CACHE_SIZE = 64  # Transformers kept per worker thread for reuse across files and epochs
+
+
+class AutoscaleConstants:
+    """Worker autoscaling constants."""
+
+    INITIAL_WORKERS = 2
+    WINDOW_SECONDS = 5.0
+    MIN_GAIN = 0.05  # Relative points/sec gain needed to keep added workers
+    CPU_BOUND_UTILIZATION = 0.75  # Above this CPU time per wall time, workers are considered CPU-bound
+
+
+class EpochConstants:
+    """Constants for origin epochs taken from GPS time."""
+
+    GPS_EPOCH = datetime(1980, 1, 6)
+    ADJUSTED_GPS_TIME_OFFSET = 1e9  # Adjusted standard GPS time is GPS seconds minus one billion
+    SECONDS_PER_DAY = 86_400
+
+
+class SortConstants:
+    """Constants for output sorted along a space-filling curve."""
+
+    CURVE_BITS = 16  # Grid cells per axis as a power of two, at most 16 as keys share 64 bits with input positions
+    RUN_POINTS = 5_000_000  # Points sorted in memory; larger files are sorted in runs merged from disk
+    KEY_BYTES = 8
+
+
+class MemoryConstants:
+    """Memory estimation constants."""
+
+    WORKER_OVERHEAD_BYTES = 200 * 1024**2  # Interpreter, NumPy, PROJ and geoid grids
+    TRANSFORM_BYTES_PER_POINT = 200  # Coordinate arrays and per-point tuples from the transformer
+    LAZ_CHUNK_SIZE = 50_000
+
+
+class StagingConstants:
+    """Local scratch staging constants."""
+
+    COPY_BUFFER_SIZE = 16 * 1024**2  # Large sequential reads and writes for network shares
+    POLL_INTERVAL = 0.5  # seconds
+    PARTIAL_SUFFIX = ".part"
+
+
+class ThrottleConstants:
+    """I/O throttling and worker priority constants."""
+
+    BURST_SECONDS = 1.0  # Traffic allowed through at once before workers are made to wait
+    NICE_INCREMENT = 10
+
+    # Linux ioprio_set(2)
+    LINUX_IOPRIO_SET_SYSCALLS: ClassVar = {"x86_64": 251, "i686": 289, "aarch64": 30, "armv7l": 314}
+    IOPRIO_WHO_PROCESS = 1
+    IOPRIO_CLASS_BE = 2
+    IOPRIO_CLASS_SHIFT = 13
+
+    # macOS setiopolicy_np(3)
+    IOPOL_TYPE_DISK = 0
+    IOPOL_SCOPE_PROCESS = 0
+    IOPOL_SCOPE_THREAD = 1
+    IOPOL_THROTTLE = 3
+
+    # Windows SetPriorityClass/SetThreadPriority
+    PROCESS_MODE_BACKGROUND_BEGIN = 0x00100000
+    THREAD_MODE_BACKGROUND_BEGIN = 0x00010000
+
+
+class SpoolConstants:
+    """Shared work queue constants."""
+
+    LEASE_SECONDS = 300.0  # A job without a heartbeat for this long is given to another worker
+    HEARTBEATS_PER_LEASE = 3
+    POLL_INTERVAL = 5.0  # seconds
+    HASH_LENGTH = 16
+    PARTIAL_SUFFIX = ".partial"
+
+
+class DaemonConstants:
+    """Transform service constants."""
+
+    DEFAULT_HOST = "127.0.0.1"
+    DEFAULT_PORT = 8750
+    PROGRESS_INTERVAL = 0.5  # seconds between progress events
+    MAX_REQUEST_BYTES = 1024**2
+    LOOPBACK_HOSTS = ("localhost", "127.0.0.1", "::1")
+    AUTH_ENV_VAR = "LAS_TRX_SERVICE_TOKEN"  # Bearer token required by the service, if set
+
+
+class TabularConstants:
+    """Constants for coordinate tables in text and NumPy files."""
+
+    TEXT_SUFFIXES = (".csv", ".txt", ".xyz")
+    ARRAY_SUFFIXES = (".npy", ".npz")
+    COMMENT_PREFIX = "#"
+    COUNT_BUFFER_SIZE = 1024**2
+    TEXT_BYTES_PER_ROW = 600  # Line, split fields and formatted values held as Python strings
+    GEOGRAPHIC_DECIMALS = 9  # About 0.1 mm of latitude
+    LINEAR_DECIMALS = 4
+
+
+class ColumnarConstants:
+    """Constants for Arrow and Parquet output."""
+
+    PARQUET_SUFFIX = ".parquet"
+    ARROW_SUFFIX = ".arrow"
+    COMPRESSION = "zstd"
+    CRS_METADATA_KEY = "crs"
+
+
+class LaxConstants:
+    """Constants for LAX spatial index sidecars."""
+
+    SUFFIX = ".lax"
+    INTERVAL_THRESHOLD = 1000  # Largest gap in points between two runs of a cell that share an interval, as lasindex
+    MAX_CELLS_ACROSS = 100  # Cells are the power of ten in size giving at most this many across the bounds
+    BOUNDS_MARGIN = 0.01  # Fraction of the estimated extent added on each side, as bounds are only known at close
+
+
+class CopcConstants:
+    """Constants for Cloud-Optimized Point Cloud output."""
+
+    SUFFIX = ".copc.laz"
+    GRID_CELLS = 128  # Sampling grid cells per axis of each node, as in PDAL and untwine
+    NODE_POINTS = 100_000  # Nodes with at most this many points keep them all
+    MAX_DEPTH = 24
+    BUCKET_POINTS = 5_000_000  # Points of a subtree built in memory; larger files are split into subtrees
+    MAX_PARTITION_DEPTH = 4  # Deepest level at which the cube is split into subtrees
+    READ_POINTS = 1_000_000  # Points read back from spill files at a time
+    BYTES_PER_POINT = 64  # Cell keys, coordinates and masks used while building a subtree
+
+
+class MergeConstants:
+    """Constants for outputs merged from fragments written by several inputs."""
+
+    FRAGMENT_SUFFIX = ".fragment.las"  # Fragments are uncompressed, so that they can be appended to
+    ID_LENGTH = 12
+    READ_POINTS = 1_000_000  # Points read back from fragments at a time
+    SCAN_ANGLE_STEP = 0.006  # Degrees per unit of the scan angle of LAS 1.4 point formats
+
+
+class PreviewConstants:
+    """Constants for previews of a run on a sample of each input."""
+
+    SAMPLE_CHUNKS = 16  # Chunks sampled from each input, one from each of this many equal strata
+    Z_SHIFT_PERCENTILES = (0, 1, 50, 99, 100)
+
+
+class EstimateConstants:
+    """Constants for estimates of the runtime and disk space of a run."""
+
+    SAMPLE_CHUNKS = 4  # Chunks benchmarked from the representative input of each group
+    SPACE_MARGIN = 1.1  # Free space needed per byte of estimated output, as compression varies across files
+
+
+class ManifestConstants:
+    """Constants for manifests of per-file configs."""
+
+    RESULTS_SUFFIX = ".results"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_SKIPPED = "skipped"
 
 
 class FileConstants:
@@ -27,6 +189,9 @@ class FileConstants:
 
     # File dialog filters
     LAS_FILTER = "LAS Files (*.las *.laz)"
+    TABLE_FILTER = "Coordinate Tables (*.csv *.txt *.xyz *.npy *.npz)"
+    COLUMNAR_FILTER = "Columnar Files (*.parquet *.arrow)"
+    COPC_FILTER = "COPC Files (*.copc.laz)"
     CONFIG_FILTER = "Config Files (*.json)"
     LOG_FILTER = "Log Files (*.log)"
 
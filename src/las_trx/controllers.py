@@ -45,7 +45,7 @@ class FileController:
             self.parent,
             "Select input LAS file",
             directory=self.dialog_directory,
-            filter=FileConstants.LAS_FILTER,
+            filter=f"{FileConstants.LAS_FILTER};;{FileConstants.TABLE_FILTER}",
         )
         if file_path:
             self.ui_access.set_input_file_path(file_path)
@@ -57,7 +57,10 @@ class FileController:
             self.parent,
             "Select output LAS file",
             directory=self.dialog_directory,
-            filter=FileConstants.LAS_FILTER,
+            filter=(
+                f"{FileConstants.LAS_FILTER};;{FileConstants.COPC_FILTER};;"
+                f"{FileConstants.COLUMNAR_FILTER};;{FileConstants.TABLE_FILTER}"
+            ),
         )
         if file_path:
             self.ui_access.set_output_file_path(file_path)
@@ -139,10 +142,22 @@ class ConfigurationController:
 
     @staticmethod
     def create_transform_config(
-        origin: ReferenceConfig, destination: ReferenceConfig, max_workers: int
+        origin: ReferenceConfig,
+        destination: ReferenceConfig,
+        max_workers: int,
+        autoscale: bool = False,
+        io_limit_mb_s: float | None = None,
+        low_priority: bool = False,
     ) -> TransformConfig:
         """Create a transformation configuration."""
-        return TransformConfig(origin=origin, destination=destination, max_workers=max_workers)
+        return TransformConfig(
+            origin=origin,
+            destination=destination,
+            max_workers=max_workers,
+            autoscale=autoscale,
+            io_limit_mb_s=io_limit_mb_s,
+            low_priority=low_priority,
+        )
 
     @staticmethod
     def validate_core_count(value: int) -> int:
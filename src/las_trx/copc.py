@@ -0,0 +1,439 @@
+"""Cloud-Optimized Point Cloud (COPC) output.
+
+A COPC file is a LAZ 1.4 file whose points are grouped into the nodes of an octree. Each node is
+compressed as its own LAZ chunk and listed with its offset in a hierarchy EVLR, so web viewers
+fetch only the nodes and levels of detail they draw. See https://copc.io for the specification.
+
+The octree cube is only known once every point has been transformed, so points are appended to a
+spill file next to the output as they are written, and the tree is built when the writer closes:
+
+1. The spill file is read once to count points per voxel. The counts pick the depth at which the
+   cube is split into subtrees of at most ``CopcConstants.BUCKET_POINTS`` points.
+2. It is read again to distribute the points into one file per subtree.
+3. Subtrees are built in memory, in parallel on the threads of the worker. Each node keeps one
+   point, picked at random, per cell of a grid of ``GRID_CELLS`` cells per axis, and passes the
+   others on to its children. A node with at most ``NODE_POINTS`` points keeps them all.
+4. The nodes above the subtrees are filled bottom-up, taking one point per grid cell from the
+   roots of the subtrees below them.
+
+Nodes are compressed and written as soon as they are final, so memory is bounded by the subtree
+size times the number of threads, whatever the size of the file. As COPC only allows point
+formats 6 to 8, other formats are written as format 6, or 7 if they have colours.
+
+Writing COPC needs the optional lazrs dependency (``pip install las-trx[copc]``).
+"""
+
+import copy
+import io
+import struct
+from collections.abc import Iterator
+from concurrent import futures
+from pathlib import Path
+from types import TracebackType
+from typing import TYPE_CHECKING
+
+import laspy
+import numpy as np
+from laspy.header import Version
+from loguru import logger
+
+from las_trx.constants import CopcConstants
+
+if TYPE_CHECKING:
+    from laspy import LasHeader
+
+try:
+    import lazrs
+except ImportError:  # Optional dependency
+    lazrs = None
+
+VoxelKey = tuple[int, int, int, int]
+
+_COPC_USER_ID = "copc"
+_INFO_RECORD_ID = 1
+_HIERARCHY_RECORD_ID = 1000
+_LASZIP_USER_ID = "laszip encoded"
+_LASZIP_RECORD_ID = 22204
+_VARIABLE_CHUNK_SIZE = 0xFFFFFFFF
+_CHUNK_SIZE_OFFSET = 12  # Offset of the chunk size in the record data of the LASzip VLR
+_POINT_FORMAT_OFFSET = 104  # Offset of the point data format ID in the LAS header
+_COMPRESSED_BIT = 0x80
+
+
+def is_copc(path: Path) -> bool:
+    """Check whether a path names a COPC output."""
+    return path.name.lower().endswith(CopcConstants.SUFFIX)
+
+
+def estimate_copc_memory(header: "LasHeader", threads: int) -> int:
+    """Estimate the memory used to build the octree of one file."""
+    bucket_points = min(header.point_count, CopcConstants.BUCKET_POINTS)
+    return max(1, threads) * bucket_points * (2 * header.point_format.size + CopcConstants.BYTES_PER_POINT)
+
+
+def spill_path(path: Path) -> Path:
+    """Get the spill file that points are appended to next to a COPC output, before its subtrees are split off."""
+    return path.with_name(f".{path.name}.points")
+
+
+def estimate_copc_spill(point_count: int, record_size: int) -> int:
+    """Estimate the peak size of the spill and subtree files written next to a COPC output."""
+    # The spill file is only removed once its points have been copied into the files of the subtrees
+    copies = 2 if point_count > CopcConstants.BUCKET_POINTS else 1
+    return copies * point_count * record_size
+
+
+def copc_header(header: "LasHeader") -> "LasHeader":
+    """Get a LAS 1.4 header with a point format COPC allows, keeping any extra bytes dimensions."""
+    names = set(header.point_format.dimension_names)
+    point_format_id = 8 if "nir" in names else 7 if "red" in names else 6
+
+    new_header = copy.deepcopy(header)
+    if header.point_format.id != point_format_id or header.version != Version(1, 4):
+        point_format = laspy.PointFormat(point_format_id)
+        point_format.dimensions.extend(header.point_format.extra_dimensions)
+        new_header.set_version_and_point_format(Version(1, 4), point_format)
+    new_header.global_encoding.wkt = True
+    return new_header
+
+
+class CopcWriter:
+    """Writes transformed point chunks to a COPC file, building its octree on close."""
+
+    def __init__(self, path: Path, header: "LasHeader", threads: int = 1) -> None:
+        """Initialize the writer.
+
+        Args:
+            path: Output path, ending in .copc.laz
+            header: Header of the transformed points, with their CRS VLRs, scales and offsets
+            threads: Threads used to build and compress subtrees
+
+        Raises:
+            ImportError: If lazrs is not installed
+        """
+        if lazrs is None:
+            raise ImportError("Writing COPC files needs lazrs, install it with 'pip install las-trx[copc]'")
+        self.path = path
+        self.header = copc_header(header)
+        self.threads = max(1, threads)
+
+        # Nodes are compressed on their own, as single chunks of variable size
+        laz_vlr = lazrs.LazVlr.new_for_compression(
+            self.header.point_format.id, self.header.point_format.num_extra_bytes
+        )
+        record_data = bytearray(laz_vlr.record_data())
+        struct.pack_into("<I", record_data, _CHUNK_SIZE_OFFSET, _VARIABLE_CHUNK_SIZE)
+        self._laz_record_data = bytes(record_data)
+        self._laz_vlr = lazrs.LazVlr(self._laz_record_data)
+
+        self._dtype = self.header.point_format.dtype()
+        self._scales = np.asarray(self.header.scales, dtype=np.float64)
+        self._offsets = np.asarray(self.header.offsets, dtype=np.float64)
+        self._spill_path = spill_path(path)
+        self._spill = self._spill_path.open("wb")
+        self._point_count = 0
+        self._mins = np.full(3, np.inf)
+        self._maxs = np.full(3, -np.inf)
+        self._gps_time = [np.inf, -np.inf]
+        self._returns = np.zeros(16, dtype=np.int64)
+        self._cube_min = np.zeros(3)
+        self._cube_size = 1.0
+
+    def __enter__(self) -> "CopcWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self._spill.close()
+        try:
+            if exc_type is None:
+                self._write_file()
+        finally:
+            for spill_file in self._spill_path.parent.glob(f"{self._spill_path.name}*"):
+                spill_file.unlink(missing_ok=True)
+
+    def write_points(self, points: laspy.ScaleAwarePointRecord) -> None:
+        """Write a chunk of points.
+
+        Args:
+            points: Transformed point records, scaled with the header scales and offsets
+        """
+        records = laspy.ScaleAwarePointRecord.zeros(len(points), header=self.header)
+        records.copy_fields_from(points)
+        if not len(records):
+            return
+
+        xyz = self._coords(records.array)
+        self._mins = np.minimum(self._mins, xyz.min(axis=0))
+        self._maxs = np.maximum(self._maxs, xyz.max(axis=0))
+        gps_time = records.array["gps_time"]
+        self._gps_time = [min(self._gps_time[0], gps_time.min()), max(self._gps_time[1], gps_time.max())]
+        self._returns += np.bincount(np.clip(np.asarray(records.return_number), 0, 15), minlength=16)
+
+        records.array.tofile(self._spill)
+        self._point_count += len(records)
+
+    def _coords(self, records: np.ndarray) -> np.ndarray:
+        """Get the scaled coordinates of raw point records."""
+        return np.column_stack([records["X"], records["Y"], records["Z"]]) * self._scales + self._offsets
+
+    def _write_file(self) -> None:
+        """Build the octree from the spill file and write the COPC file."""
+        if self._point_count:
+            center = (self._mins + self._maxs) / 2
+            halfsize = max(float((self._maxs - self._mins).max()) / 2, float(self._scales.max()))
+        else:
+            center, halfsize = np.zeros(3), 1.0
+        self._cube_min = center - halfsize
+        self._cube_size = 2 * halfsize
+
+        with self.path.open("w+b") as f:
+            self._write_header(f, center, halfsize, root_hierarchy=(0, 0), evlr_start=0)
+            point_data_start = f.tell()
+            f.write(struct.pack("<q", 0))  # Offset of the chunk table, set once it is written
+
+            entries = self._write_nodes(f)
+
+            # Chunk table of the variable size chunks, for readers that do not know COPC
+            chunk_table_start = f.tell()
+            chunk_table = io.BytesIO()
+            chunks = [(count, size) for _, _, size, count in entries if count]
+            lazrs.write_chunk_table(chunk_table, chunks, self._laz_vlr)
+            f.write(chunk_table.getvalue())
+            f.seek(point_data_start)
+            f.write(struct.pack("<q", chunk_table_start))
+            f.seek(0, io.SEEK_END)
+
+            # Single hierarchy page listing every node
+            evlr_start = f.tell()
+            page = b"".join(struct.pack("<iiiiQii", *key, offset, size, count) for key, offset, size, count in entries)
+            f.write(
+                struct.pack("<H16sHQ32s", 0, _COPC_USER_ID.encode(), _HIERARCHY_RECORD_ID, len(page), b"EPT hierarchy")
+            )
+            root_hierarchy = (f.tell(), len(page))
+            f.write(page)
+
+            f.seek(0)
+            self._write_header(f, center, halfsize, root_hierarchy, evlr_start)
+            if f.tell() != point_data_start:
+                raise RuntimeError("COPC header changed size when it was rewritten")
+
+        logger.debug(f"Wrote {self.path} with {len(entries)} octree nodes")
+
+    def _write_header(
+        self,
+        f: io.BufferedRandom,
+        center: np.ndarray,
+        halfsize: float,
+        root_hierarchy: tuple[int, int],
+        evlr_start: int,
+    ) -> None:
+        """Write the LAS header and VLRs, with the COPC info VLR first as the specification requires."""
+        header = self.header
+        crs_vlrs = [vlr for vlr in header.vlrs if vlr.user_id not in (_COPC_USER_ID, _LASZIP_USER_ID)]
+        gps_time = self._gps_time if self._point_count else [0.0, 0.0]
+        info = struct.pack(
+            "<5d2Q2d11Q",
+            *center,
+            halfsize,
+            2 * halfsize / CopcConstants.GRID_CELLS,
+            *root_hierarchy,
+            *gps_time,
+            *([0] * 11),
+        )
+        header.vlrs.clear()
+        header.vlrs.extend([
+            laspy.VLR(_COPC_USER_ID, _INFO_RECORD_ID, "COPC info", info),
+            laspy.VLR(_LASZIP_USER_ID, _LASZIP_RECORD_ID, "lazrs variable size chunks", self._laz_record_data),
+            *crs_vlrs,
+        ])
+
+        header.point_count = self._point_count
+        header.number_of_points_by_return = self._returns[1:16]
+        if self._point_count:
+            header.mins = self._mins
+            header.maxs = self._maxs
+        header.start_of_first_evlr = evlr_start
+        header.number_of_evlrs = 1 if evlr_start else 0
+
+        start = f.tell()
+        header.write_to(f)
+        end = f.tell()
+        f.seek(start + _POINT_FORMAT_OFFSET)
+        f.write(bytes([header.point_format.id | _COMPRESSED_BIT]))
+        f.seek(end)
+
+    def _write_nodes(self, f: io.BufferedRandom) -> list[tuple[VoxelKey, int, int, int]]:
+        """Build and write the nodes of the octree.
+
+        Returns:
+            Key, file offset, byte size and point count of each node written
+        """
+        entries = []
+
+        def write_node(key: VoxelKey, count: int, data: bytes) -> None:
+            # Nodes whose points all moved up are kept empty, as readers reach their children through them
+            if not count:
+                entries.append((key, 0, 0, 0))
+                return
+            entries.append((key, f.tell(), len(data), count))
+            f.write(data)
+
+        depth = self._partition_depth()
+        buckets = self._distribute(depth)
+
+        # Subtrees are built in parallel, and their nodes written in order as they complete
+        roots = {}
+        with futures.ThreadPoolExecutor(self.threads, thread_name_prefix="las-trx-copc") as pool:
+            for key, root, nodes in pool.map(self._build_subtree, buckets.keys(), buckets.values()):
+                roots[key] = root
+                for node_key, count, data in nodes:
+                    write_node(node_key, count, data)
+
+        # Fill the nodes above the subtrees bottom-up, writing each level once its parents have sampled it
+        for level in range(depth - 1, -1, -1):
+            parents: dict[VoxelKey, list[VoxelKey]] = {}
+            for key in roots:
+                parents.setdefault((level, key[1] >> 1, key[2] >> 1, key[3] >> 1), []).append(key)
+
+            parent_roots = {}
+            for parent, children in parents.items():
+                records = np.concatenate([roots[child] for child in children])
+                owners = np.repeat(np.arange(len(children)), [len(roots[child]) for child in children])
+                selected = self._sample(parent, records)
+                for i, child in enumerate(children):
+                    remaining = records[(owners == i) & ~selected]
+                    write_node(child, len(remaining), self._compress(remaining) if len(remaining) else b"")
+                parent_roots[parent] = records[selected]
+            roots = parent_roots
+
+        for key, records in roots.items():
+            write_node(key, len(records), self._compress(records))
+        return entries
+
+    def _voxels(self, coords: np.ndarray, depth: int) -> np.ndarray:
+        """Get the voxel of each point at a depth, as an array of shape (N, 3)."""
+        cells = 1 << depth
+        voxels = np.floor((coords - self._cube_min) / (self._cube_size / cells)).astype(np.int64)
+        return np.clip(voxels, 0, cells - 1)
+
+    def _read_spill(self, path: Path) -> Iterator[np.ndarray]:
+        with path.open("rb") as f:
+            while len(records := np.fromfile(f, dtype=self._dtype, count=CopcConstants.READ_POINTS)):
+                yield records
+
+    def _partition_depth(self) -> int:
+        """Pick the shallowest depth at which every subtree fits in memory."""
+        counts: dict[tuple[int, int, int], int] = {}
+        for records in self._read_spill(self._spill_path):
+            voxels = self._voxels(self._coords(records), CopcConstants.MAX_PARTITION_DEPTH)
+            unique, voxel_counts = np.unique(voxels, axis=0, return_counts=True)
+            for voxel, count in zip(map(tuple, unique.tolist()), voxel_counts.tolist()):
+                counts[voxel] = counts.get(voxel, 0) + count
+
+        if not counts:
+            return 0
+        voxels = np.array(list(counts.keys()), dtype=np.int64)
+        voxel_counts = np.array(list(counts.values()), dtype=np.int64)
+        for depth in range(CopcConstants.MAX_PARTITION_DEPTH + 1):
+            _, inverse = np.unique(voxels >> (CopcConstants.MAX_PARTITION_DEPTH - depth), axis=0, return_inverse=True)
+            if np.bincount(inverse.ravel(), weights=voxel_counts).max() <= CopcConstants.BUCKET_POINTS:
+                return depth
+        logger.warning(f"Some subtrees of {self.path} exceed {CopcConstants.BUCKET_POINTS} points")
+        return CopcConstants.MAX_PARTITION_DEPTH
+
+    def _distribute(self, depth: int) -> dict[VoxelKey, Path]:
+        """Split the spill file into one file per subtree at a depth."""
+        if depth == 0:
+            return {(0, 0, 0, 0): self._spill_path} if self._point_count else {}
+
+        buckets = {}
+        for records in self._read_spill(self._spill_path):
+            voxels = self._voxels(self._coords(records), depth)
+            unique, inverse = np.unique(voxels, axis=0, return_inverse=True)
+            order = np.argsort(inverse.ravel(), kind="stable")
+            bounds = np.cumsum(np.bincount(inverse.ravel(), minlength=len(unique)))
+            start = 0
+            for voxel, end in zip(map(tuple, unique.tolist()), bounds.tolist()):
+                key = (depth, *voxel)
+                name = "-".join(map(str, key))
+                path = buckets.setdefault(key, self._spill_path.with_name(f"{self._spill_path.name}-{name}"))
+                with path.open("ab") as f:
+                    records[order[start:end]].tofile(f)
+                start = end
+        self._spill_path.unlink()
+        return buckets
+
+    def _build_subtree(
+        self, key: VoxelKey, path: Path
+    ) -> tuple[VoxelKey, np.ndarray, list[tuple[VoxelKey, int, bytes]]]:
+        """Build the subtree of a bucket, compressing every node but its root.
+
+        Returns:
+            Tuple of (key of the root, points of the root, key, point count and data of each other node)
+        """
+        records = np.fromfile(path, dtype=self._dtype)
+        path.unlink()
+
+        root = records[:0]
+        nodes = []
+        stack = [(key, records)]
+        while stack:
+            node_key, records = stack.pop()
+            if len(records) <= CopcConstants.NODE_POINTS or node_key[0] >= CopcConstants.MAX_DEPTH:
+                kept, rest = records, records[:0]
+            else:
+                selected = self._sample(node_key, records)
+                kept, rest = records[selected], records[~selected]
+
+            if node_key == key:
+                root = kept
+            elif len(kept):
+                nodes.append((node_key, len(kept), self._compress(kept)))
+
+            if len(rest):
+                # Children are found relative to the node, so rounding never moves a point out of its parent
+                depth, x, y, z = node_key
+                parent = np.array([x, y, z]) * 2
+                children = parent + np.clip(self._voxels(self._coords(rest), depth + 1) - parent, 0, 1)
+                unique, inverse = np.unique(children, axis=0, return_inverse=True)
+                for i, child in enumerate(map(tuple, unique.tolist())):
+                    stack.append(((depth + 1, *child), rest[inverse.ravel() == i]))
+        return key, root, nodes
+
+    def _sample(self, key: VoxelKey, records: np.ndarray) -> np.ndarray:
+        """Pick one point at random per cell of the sampling grid of a node.
+
+        Returns:
+            Boolean mask of the points kept by the node
+        """
+        depth, x, y, z = key
+        node_size = self._cube_size / (1 << depth)
+        node_min = self._cube_min + np.array([x, y, z]) * node_size
+        grid = CopcConstants.GRID_CELLS
+        cells = np.clip(np.floor((self._coords(records) - node_min) / (node_size / grid)).astype(np.int64), 0, grid - 1)
+        cell_ids = (cells[:, 0] * grid + cells[:, 1]) * grid + cells[:, 2]
+
+        # Seeded by the node, so the same input always gives the same file
+        order = np.random.default_rng(hash(key) & 0xFFFFFFFF).permutation(len(records))
+        _, first = np.unique(cell_ids[order], return_index=True)
+        selected = np.zeros(len(records), dtype=bool)
+        selected[order[first]] = True
+        return selected
+
+    def _compress(self, records: np.ndarray) -> bytes:
+        """Compress the points of a node as a single LAZ chunk."""
+        buffer = io.BytesIO()
+        compressor = lazrs.LasZipCompressor(buffer, self._laz_vlr)
+        compressor.compress_many(np.frombuffer(records.tobytes(), dtype=np.uint8))
+        compressor.done()
+        del compressor
+
+        # The compressor writes the offset of its chunk table, then the chunk, then the chunk table
+        data = buffer.getvalue()
+        (chunk_table_offset,) = struct.unpack_from("<q", data)
+        return data[8:chunk_table_offset]
@@ -0,0 +1,409 @@
+"""Long-running transform service with a warm worker pool and cached transformers.
+
+Clients POST a job to ``/jobs``::
+
+    {"config": {...}, "input": "/data/in/*.laz", "output": "/data/out/{}_nad83.laz"}
+
+where ``config`` is a transform config as saved from the GUI, and read newline-delimited JSON
+events from the response until the job is done::
+
+    {"event": "accepted", "job": 1, "files": 2, "total_chunks": 40}
+    {"event": "progress", "job": 1, "chunks": 12, "total_chunks": 40}
+    {"event": "file", "job": 1, "input": "...", "output": "...", "error": null}
+    {"event": "done", "job": 1, "succeeded": 2, "failed": 0}
+
+For example, ``curl --unix-socket /run/las-trx.sock -H "Content-Type: application/json" -d @job.json
+http://localhost/jobs``. ``GET /health`` reports the pool size and load. The pool and the transformers cached by its
+workers are reused across jobs, and concurrent jobs take turns submitting files to the pool.
+
+Jobs write to any path the service can, so the service only answers its own clients. Requests with
+an ``Origin`` header, which browsers send from web pages, or with a ``Host`` other than loopback or
+the listening address, which DNS rebinding gives, are refused, and jobs must be sent as JSON, which
+web pages cannot send without a preflight. The service may also require a token, sent as
+``Authorization: Bearer <token>``.
+"""
+
+import contextlib
+import hmac
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import queue
+import socketserver
+import threading
+from collections import deque
+from concurrent import futures
+from dataclasses import dataclass, field
+from functools import partial
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import TracebackType
+from urllib.parse import urlsplit
+
+import laspy
+from loguru import logger
+from pydantic import BaseModel, ValidationError
+
+from las_trx.columnar import parquet_copy_path
+from las_trx.config import TransformConfig, TrxExecutor
+from las_trx.constants import DaemonConstants, ProcessingConstants
+from las_trx.executor import create_executor, create_progress_tracker, create_shared_value, resolve_executor_backend
+from las_trx.file_operations import FileOperationError, discover_files
+from las_trx.transformation import read_point_count, transform_file
+
+
+class JobRequest(BaseModel):
+    """Body of a job submitted to the service."""
+
+    config: TransformConfig
+    input: str
+    output: str
+
+
+@dataclass
+class ServiceJob:
+    """A job accepted by the service and the files it has left to run."""
+
+    job_id: int
+    config: TransformConfig
+    tasks: deque[tuple[Path, Path]]
+    total_chunks: int
+    progress: multiprocessing.Value
+    events: queue.Queue = field(default_factory=queue.Queue)
+    remaining: int = 0
+    succeeded: int = 0
+    failed: int = 0
+
+
+def count_chunks(input_files: list[Path], config: TransformConfig) -> int:
+    """Count the chunks that transforming the files will report as progress."""
+    total = 0
+    for input_file in input_files:
+        total += math.ceil(read_point_count(input_file, config) / ProcessingConstants.DEFAULT_CHUNK_SIZE)
+    return total
+
+
+class TransformService:
+    """Runs the files of concurrent jobs on one persistent pool, taking turns between jobs."""
+
+    def __init__(self, max_workers: int, executor: TrxExecutor = TrxExecutor.AUTO) -> None:
+        """Initialize the service.
+
+        Args:
+            max_workers: Number of files transformed at once across all jobs
+            executor: Executor backend of the pool
+        """
+        self.max_workers = max_workers
+        self.backend = resolve_executor_backend(executor)
+        self.manager, self.lock, _ = create_progress_tracker(self.backend)
+        self.pool: futures.Executor | None = None
+
+        self._cond = threading.Condition()
+        self._queued: deque[ServiceJob] = deque()  # Jobs with files left to submit, in turn order
+        self._running = 0
+        self._job_ids = itertools.count(1)
+        self._closed = False
+        self._dispatcher = threading.Thread(target=self._dispatch, name="las-trx-dispatch", daemon=True)
+
+    def __enter__(self) -> "TransformService":
+        self.pool = create_executor(self.backend, self.max_workers)
+        self._dispatcher.start()
+        logger.info(f"Transform service running {self.max_workers} worker(s) ({self.backend.value} executor)")
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._dispatcher.join()
+        self.pool.shutdown(wait=True, cancel_futures=True)
+        if self.manager is not None:
+            self.manager.shutdown()
+
+    def status(self) -> dict:
+        """Get the pool size and current load."""
+        with self._cond:
+            return {
+                "workers": self.max_workers,
+                "executor": self.backend.value,
+                "running": self._running,
+                "queued_jobs": len(self._queued),
+            }
+
+    def submit(self, config: TransformConfig, input_files: list[Path], output_files: list[Path]) -> ServiceJob:
+        """Queue the files of a job.
+
+        Args:
+            config: Transformation configuration of the job
+            input_files: Input file paths
+            output_files: Output file paths, one per input
+
+        Returns:
+            The job, whose events queue receives a "file" event per file and a final "done" event
+
+        Raises:
+            ValueError: If the config writes tiled or merged outputs, which are written after a whole batch, or
+                detects the origin of each file, which is resolved for a whole batch
+        """
+        if config.merges_inputs():
+            raise ValueError(
+                "Tiled and merged outputs are not supported by the service, run the batch with 'las-trx run'"
+            )
+        if config.detect_origin:
+            raise ValueError("Origins cannot be detected by the service, set the origin in the config")
+        total_chunks = count_chunks(input_files, config)
+        job = ServiceJob(
+            job_id=next(self._job_ids),
+            config=config,
+            tasks=deque(zip(input_files, output_files)),
+            total_chunks=total_chunks,
+            progress=create_shared_value(self.manager, "i", 0),
+            remaining=len(input_files),
+        )
+        job.events.put({"event": "accepted", "job": job.job_id, "files": job.remaining, "total_chunks": total_chunks})
+
+        with self._cond:
+            if job.tasks:
+                self._queued.append(job)
+                self._cond.notify_all()
+            else:
+                self._finish(job)
+        logger.info(f"Accepted job {job.job_id} with {job.remaining} file(s)")
+        return job
+
+    def cancel(self, job: ServiceJob) -> None:
+        """Drop the files of a job that have not started yet."""
+        with self._cond:
+            if job in self._queued:
+                self._queued.remove(job)
+            dropped = len(job.tasks)
+            job.tasks.clear()
+            job.remaining -= dropped
+        if dropped:
+            logger.info(f"Cancelled {dropped} queued file(s) of job {job.job_id}")
+
+    def progress(self, job: ServiceJob) -> int:
+        """Get the number of chunks processed so far for a job."""
+        with self.lock:
+            return job.progress.value
+
+    def _dispatch(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._closed or (self._queued and self._running < self.max_workers))
+                if self._closed:
+                    return
+
+                # Take one file from the job whose turn it is, then send that job to the back of the line
+                job = self._queued.popleft()
+                input_file, output_file = job.tasks.popleft()
+                if job.tasks:
+                    self._queued.append(job)
+                self._running += 1
+
+            args = (transform_file, job.config, input_file, output_file, self.lock, job.progress)
+            kwargs = {"parquet_file": parquet_copy_path(job.config, output_file)}
+            try:
+                future = self.pool.submit(*args, **kwargs)
+            except futures.BrokenExecutor:
+                logger.error("Worker pool broke, starting a new one")
+                self.pool = create_executor(self.backend, self.max_workers)
+                future = self.pool.submit(*args, **kwargs)
+            future.add_done_callback(partial(self._on_done, job, input_file, output_file))
+
+    def _on_done(self, job: ServiceJob, input_file: Path, output_file: Path, future: futures.Future) -> None:
+        exception = future.exception()
+        if exception:
+            logger.error(f"Error transforming {input_file}: {exception}")
+        else:
+            logger.info(f"{input_file} -> {output_file}")
+
+        job.events.put({
+            "event": "file",
+            "job": job.job_id,
+            "input": str(input_file),
+            "output": str(output_file),
+            "error": str(exception) if exception else None,
+        })
+        with self._cond:
+            self._running -= 1
+            job.remaining -= 1
+            if exception:
+                job.failed += 1
+            else:
+                job.succeeded += 1
+            if job.remaining == 0:
+                self._finish(job)
+            self._cond.notify_all()
+
+    @staticmethod
+    def _finish(job: ServiceJob) -> None:
+        job.events.put({"event": "done", "job": job.job_id, "succeeded": job.succeeded, "failed": job.failed})
+
+
+class TransformRequestHandler(BaseHTTPRequestHandler):
+    """HTTP handler exposing a TransformService."""
+
+    # Responses end when the connection closes, which lets job events stream without chunked encoding
+    protocol_version = "HTTP/1.0"
+
+    def log_message(self, format: str, *args: object) -> None:
+        # The default implementation writes to stderr and fails on Unix socket client addresses
+        logger.debug(format % args)
+
+    def _send_json(self, status: HTTPStatus, body: dict) -> None:
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _refused(self) -> bool:
+        """Refuse requests from web pages or to other hosts, and those without the token of the service."""
+        host = urlsplit(f"//{self.headers.get('Host', '')}").hostname
+        if self.headers.get("Origin") is not None or host not in self.server.allowed_hosts:
+            self._send_json(HTTPStatus.FORBIDDEN, {"error": "Only local clients may use the service"})
+            return True
+        token = self.server.token
+        authorization = self.headers.get("Authorization", "").encode()
+        if token is not None and not hmac.compare_digest(authorization, f"Bearer {token}".encode()):
+            self._send_json(HTTPStatus.UNAUTHORIZED, {"error": "Missing or wrong service token"})
+            return True
+        return False
+
+    def do_GET(self) -> None:
+        """Report service health."""
+        if self._refused():
+            return
+        if self.path != "/health":
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": f"Unknown path {self.path}"})
+            return
+        self._send_json(HTTPStatus.OK, {"status": "ok", **self.server.service.status()})
+
+    def do_POST(self) -> None:
+        """Accept a job and stream its events."""
+        if self._refused():
+            return
+        if self.path != "/jobs":
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": f"Unknown path {self.path}"})
+            return
+        if self.headers.get_content_type() != "application/json":
+            self._send_json(HTTPStatus.UNSUPPORTED_MEDIA_TYPE, {"error": "Jobs must be sent as application/json"})
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        if length > DaemonConstants.MAX_REQUEST_BYTES:
+            self._send_json(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "Request body is too large"})
+            return
+
+        service: TransformService = self.server.service
+        try:
+            request = JobRequest.model_validate_json(self.rfile.read(length))
+            input_files, output_files = discover_files(request.input, request.output, request.config)
+            job = service.submit(request.config, input_files, output_files)
+        except (ValidationError, FileOperationError, OSError, ValueError, laspy.LaspyException) as e:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        try:
+            self._stream_events(service, job)
+        except (BrokenPipeError, ConnectionResetError):
+            logger.warning(f"Client of job {job.job_id} disconnected")
+            service.cancel(job)
+
+    def _stream_events(self, service: TransformService, job: ServiceJob) -> None:
+        last_progress = -1
+        while True:
+            try:
+                event = job.events.get(timeout=DaemonConstants.PROGRESS_INTERVAL)
+            except queue.Empty:
+                progress = service.progress(job)
+                if progress == last_progress:
+                    continue
+                last_progress = progress
+                event = {"event": "progress", "job": job.job_id, "chunks": progress, "total_chunks": job.total_chunks}
+
+            self.wfile.write(json.dumps(event).encode() + b"\n")
+            self.wfile.flush()
+            if event["event"] == "done":
+                return
+
+
+class TransformHTTPServer(ThreadingHTTPServer):
+    """Localhost TCP server for the transform service."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], service: TransformService, token: str | None = None) -> None:
+        super().__init__(address, TransformRequestHandler)
+        self.service = service
+        self.token = token
+        self.allowed_hosts = {*DaemonConstants.LOOPBACK_HOSTS, address[0]}
+
+
+if hasattr(socketserver, "UnixStreamServer"):
+
+    class TransformUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        """Unix socket server for the transform service, only reachable by the owner of the socket."""
+
+        daemon_threads = True
+
+        def __init__(self, socket_path: Path, service: TransformService, token: str | None = None) -> None:
+            socket_path.unlink(missing_ok=True)
+            # The socket is created without permissions for others, rather than restricted once bound
+            umask = os.umask(0o177)
+            try:
+                super().__init__(str(socket_path), TransformRequestHandler)
+            finally:
+                os.umask(umask)
+            self.service = service
+            self.token = token
+            self.allowed_hosts = set(DaemonConstants.LOOPBACK_HOSTS)
+
+
+def serve(
+    service: TransformService,
+    host: str = DaemonConstants.DEFAULT_HOST,
+    port: int = DaemonConstants.DEFAULT_PORT,
+    socket_path: Path | None = None,
+    token: str | None = None,
+) -> None:
+    """Serve the transform service until interrupted.
+
+    Args:
+        service: Service to expose
+        host: Host to listen on when not using a Unix socket
+        port: Port to listen on when not using a Unix socket
+        socket_path: Unix socket to listen on instead of TCP
+        token: Optional token clients must send as a bearer token
+    """
+    if socket_path is not None:
+        if not hasattr(socketserver, "UnixStreamServer"):
+            raise ValueError("Unix sockets are not supported on this platform, use a TCP port instead")
+        server = TransformUnixServer(socket_path, service, token)
+        logger.info(f"Listening on {socket_path}")
+    else:
+        server = TransformHTTPServer((host, port), service, token)
+        logger.info(f"Listening on http://{host}:{server.server_address[1]}")
+
+    with service, server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            logger.info("Shutting down")
+        finally:
+            if socket_path is not None:
+                with contextlib.suppress(OSError):
+                    socket_path.unlink(missing_ok=True)
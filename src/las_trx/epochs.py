@@ -0,0 +1,66 @@
+"""Per-point origin epochs from the GPS time of each point.
+
+Merged clouds from several campaigns can span years, which a single origin epoch cannot
+represent. In GPS time epoch mode, points are grouped into buckets of
+``TransformConfig.epoch_resolution_days`` by their adjusted standard GPS time, and each bucket is
+transformed in one batch with the origin epoch set to the middle of the bucket. Transformers are
+cached per epoch, so the cost grows with the number of distinct buckets rather than points.
+"""
+
+from collections.abc import Iterator
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+import numpy as np
+from laspy.header import GpsTimeType
+
+from las_trx.config import TransformConfig, TrxEpochMode
+from las_trx.constants import EpochConstants
+
+if TYPE_CHECKING:
+    from laspy import LasHeader
+
+
+def uses_gps_time_epochs(config: TransformConfig) -> bool:
+    """Check whether a config takes the origin epoch of each point from its GPS time."""
+    return config.epoch_mode == TrxEpochMode.GPS_TIME
+
+
+def check_gps_time(header: "LasHeader") -> None:
+    """Check that the points of a file carry adjusted standard GPS time.
+
+    Raises:
+        ValueError: If the points have no GPS time, or GPS week time that does not give a date
+    """
+    if "gps_time" not in header.point_format.dimension_names:
+        raise ValueError(f"Point format {header.point_format.id} has no GPS time to take epochs from")
+    if header.global_encoding.gps_time_type != GpsTimeType.STANDARD:
+        raise ValueError("GPS time epochs need adjusted standard GPS time, the file has GPS week time")
+
+
+def epoch_buckets(gps_time: np.ndarray, resolution_days: int) -> np.ndarray:
+    """Get the epoch bucket of each point, counted in periods of the resolution since the GPS epoch."""
+    seconds = np.asarray(gps_time, dtype=np.float64) + EpochConstants.ADJUSTED_GPS_TIME_OFFSET
+    return np.floor_divide(seconds, resolution_days * EpochConstants.SECONDS_PER_DAY).astype(np.int64)
+
+
+def split_by_epoch(config: TransformConfig, gps_time: np.ndarray) -> Iterator[tuple[TransformConfig, np.ndarray]]:
+    """Group points by epoch bucket.
+
+    Args:
+        config: Transformation configuration, whose origin epoch is replaced per bucket
+        gps_time: Adjusted standard GPS time of each point
+
+    Yields:
+        Tuples of (config with the origin epoch at the middle of the bucket, indices of the bucket's points)
+    """
+    resolution = config.epoch_resolution_days
+    buckets, inverse = np.unique(epoch_buckets(gps_time, resolution), return_inverse=True)
+    order = np.argsort(inverse, kind="stable")
+    bounds = np.cumsum(np.bincount(inverse, minlength=len(buckets)))
+
+    start = 0
+    for bucket, end in zip(buckets.tolist(), bounds.tolist()):
+        epoch = (EpochConstants.GPS_EPOCH + timedelta(days=(bucket + 0.5) * resolution)).date()
+        yield config.model_copy(update={"origin": config.origin.model_copy(update={"epoch": epoch})}), order[start:end]
+        start = end
@@ -0,0 +1,125 @@
+"""Estimates of the runtime, output size and disk space of a run, made before it starts.
+
+Inputs are grouped by config, point format and input and output suffixes, as those set the cost
+of a point. The largest input of each group is benchmarked on this machine: a few sampled chunks
+are read, filtered, transformed and written to a temporary output, compressed if the outputs are
+LAZ or COPC. The time and compressed size per point are then extrapolated to the points of the
+group, and the time divided among the workers of the run.
+
+Uncompressed outputs take the record size of each kept point, and Arrow and Parquet outputs are
+counted uncompressed with their float64 coordinates, as an upper bound. Tiled and merged runs also
+hold an uncompressed fragment of every point until the end of the run. Outputs that already exist
+are overwritten, so their size is counted as free.
+
+Temporary files written next to the outputs are counted too: the runs of files too large to sort in
+memory, and the spill and subtree files of COPC outputs, which hold up to two uncompressed copies of
+their points. These only exist while an input is transformed, so only those of the largest inputs,
+one per worker, are counted. The COPC files of tiled and merged outputs are built from all of their
+points once the inputs are merged.
+
+The space needed on each filesystem is compared with its free space, keeping a safety margin.
+"""
+
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+
+from las_trx.constants import EstimateConstants
+
+
+def existing_parent(path: Path) -> Path:
+    """Get the deepest existing directory of a path, which outputs will be written under."""
+    path = path.absolute()
+    while not path.is_dir() and path != path.parent:
+        path = path.parent
+    return path
+
+
+def format_bytes(num_bytes: float) -> str:
+    """Format a number of bytes for people."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(num_bytes) < 1024:
+            return f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f} TB"
+
+
+def format_duration(seconds: float) -> str:
+    """Format a duration for people, to the minute past an hour and to the second below."""
+    minutes, seconds = divmod(round(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours} h {minutes:02d} min"
+    return f"{minutes} min {seconds:02d} s" if minutes else f"{seconds} s"
+
+
+@dataclass(frozen=True)
+class DiskEstimate:
+    """Space needed by a run on one filesystem."""
+
+    path: Path
+    needed_bytes: int
+    free_bytes: int
+
+    @property
+    def fits(self) -> bool:
+        """Check whether the outputs fit in the free space, with the safety margin."""
+        return self.needed_bytes * EstimateConstants.SPACE_MARGIN <= self.free_bytes
+
+
+@dataclass(frozen=True)
+class RunEstimate:
+    """Estimated runtime and output size of a run, and the disk space it needs."""
+
+    point_count: int
+    num_workers: int
+    seconds: float
+    output_bytes: int
+    disks: list[DiskEstimate]
+    unbenchmarked_files: int = 0
+
+    @property
+    def fits(self) -> bool:
+        """Check whether the outputs fit on every filesystem they are written to."""
+        return all(disk.fits for disk in self.disks)
+
+    def describe(self) -> str:
+        """Format the estimate for people, one line per filesystem."""
+        lines = [
+            f"Estimated {format_duration(self.seconds)} on {self.num_workers} worker(s) for {self.point_count} points, "
+            f"{format_bytes(self.output_bytes)} of output"
+        ]
+        if self.unbenchmarked_files:
+            lines[0] += f" (runtime excludes {self.unbenchmarked_files} coordinate table(s))"
+        lines.extend(
+            f"  {disk.path}: needs {format_bytes(disk.needed_bytes)}, {format_bytes(disk.free_bytes)} free"
+            + ("" if disk.fits else ", NOT ENOUGH SPACE")
+            for disk in self.disks
+        )
+        return "\n".join(lines)
+
+
+def disk_estimates(needed: dict[Path, float], existing: set[Path]) -> list[DiskEstimate]:
+    """Sum the space needed by output files on each filesystem they are written to.
+
+    Args:
+        needed: Estimated size of each output or temporary file
+        existing: Output files that already exist and will be overwritten
+
+    Returns:
+        Space needed and free on each filesystem, in order of first output
+    """
+    disks: dict[int, list] = {}
+    for path, num_bytes in needed.items():
+        parent = existing_parent(path)
+        disk = disks.setdefault(parent.stat().st_dev, [parent, 0.0])
+        disk[1] += num_bytes
+    for path in existing:
+        disk = disks.get(path.parent.stat().st_dev)
+        if disk is not None:
+            disk[1] -= path.stat().st_size
+
+    return [
+        DiskEstimate(path=parent, needed_bytes=max(0, int(num_bytes)), free_bytes=shutil.disk_usage(parent).free)
+        for parent, num_bytes in disks.values()
+    ]
@@ -0,0 +1,235 @@
+"""Executor backends used to run file transformations in parallel."""
+
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent import futures
+from dataclasses import dataclass
+from multiprocessing.managers import SyncManager
+
+from loguru import logger
+
+from las_trx.config import TrxExecutor
+from las_trx.throttle import lower_priority
+
+# Thread pool sizes read by OpenMP/BLAS (NumPy), numexpr and rayon (lazrs) when they first initialize.
+# Process workers set them in their initializer, before the task functions import these libraries.
+THREAD_LIMIT_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+    "RAYON_NUM_THREADS",
+)
+
+
+@dataclass(frozen=True)
+class WorkerLayout:
+    """How the available CPUs are split between pool workers."""
+
+    num_workers: int
+    threads_per_worker: int
+    cpu_sets: tuple[tuple[int, ...], ...] | None = None
+
+    def describe(self) -> str:
+        """Human readable summary of the layout for logging."""
+        text = f"{self.num_workers} worker(s) x {self.threads_per_worker} thread(s)"
+        if self.cpu_sets:
+            text += ", pinned to CPUs " + " ".join(f"[{','.join(map(str, cpus))}]" for cpus in self.cpu_sets)
+        return text
+
+
+class ThreadCounter:
+    """In-process stand-in for a ``multiprocessing.Manager().Value`` progress counter."""
+
+    def __init__(self, value: float = 0) -> None:
+        self.value = value
+
+
+def is_free_threaded() -> bool:
+    """Check if the interpreter is running with the GIL disabled (e.g. CPython 3.13t).
+
+    Returns:
+        True if the GIL is disabled, False otherwise
+    """
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def resolve_executor_backend(backend: TrxExecutor) -> TrxExecutor:
+    """Resolve the AUTO backend to a concrete executor backend.
+
+    Threads are only picked automatically on free-threaded builds. With the GIL enabled, the pure
+    Python parts of each chunk serialize the workers, so processes remain the better default.
+
+    Args:
+        backend: Requested executor backend
+
+    Returns:
+        Concrete executor backend, either PROCESS or THREAD
+    """
+    if backend != TrxExecutor.AUTO:
+        return backend
+
+    if is_free_threaded():
+        logger.debug("Free-threaded interpreter detected, using thread executor")
+        return TrxExecutor.THREAD
+    return TrxExecutor.PROCESS
+
+
+def create_executor(
+    backend: TrxExecutor,
+    max_workers: int,
+    max_tasks_per_child: int | None = None,
+    layout: WorkerLayout | None = None,
+    low_priority: bool = False,
+) -> futures.Executor:
+    """Create an executor for the given concrete backend.
+
+    Args:
+        backend: Concrete executor backend
+        max_workers: Maximum number of workers in the pool
+        max_tasks_per_child: Recycle worker processes after this many tasks (Python 3.11+)
+        layout: Optional worker layout used to pin workers to CPUs and limit the threads of worker processes
+        low_priority: Lower the CPU and I/O scheduling priority of the workers
+
+    Returns:
+        A thread or process pool executor
+    """
+    cpu_sets = layout.cpu_sets if layout is not None else None
+    threads = layout.threads_per_worker if layout is not None else None
+
+    if backend == TrxExecutor.THREAD:
+        if max_tasks_per_child is not None:
+            logger.debug("max_tasks_per_child has no effect on the thread executor")
+        return futures.ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="las-trx",
+            initializer=_initialize_worker,
+            initargs=(cpu_sets, multiprocessing.Value("i", 0), low_priority),
+        )
+    elif backend == TrxExecutor.PROCESS:
+        if max_tasks_per_child is not None and sys.version_info < (3, 11):
+            logger.warning("max_tasks_per_child requires Python 3.11 or later, workers will not be recycled")
+            max_tasks_per_child = None
+
+        # Forked workers would inherit thread pools the parent already initialized, so the thread limits
+        # could not apply, and recycling workers is not supported with fork either
+        mp_context = multiprocessing.get_context("spawn")
+        kwargs = {} if max_tasks_per_child is None else {"max_tasks_per_child": max_tasks_per_child}
+        return futures.ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=mp_context,
+            initializer=_initialize_worker,
+            initargs=(cpu_sets, mp_context.Value("i", 0), low_priority, threads),
+            **kwargs,
+        )
+    else:
+        raise ValueError(f"Unresolved executor backend {backend}")
+
+
+def create_shared_value(manager: SyncManager | None, typecode: str, value: float) -> multiprocessing.Value:
+    """Create a value that workers can update, using the progress tracker's manager if there is one.
+
+    Args:
+        manager: Manager returned by create_progress_tracker, or None for thread workers
+        typecode: Array module typecode of the value, e.g. "i" or "d"
+        value: Initial value
+
+    Returns:
+        A manager Value proxy, or a ThreadCounter for thread workers
+    """
+    if manager is None:
+        return ThreadCounter(value)
+    return manager.Value(typecode, value)
+
+
+def create_progress_tracker(
+    backend: TrxExecutor,
+) -> tuple[SyncManager | None, multiprocessing.RLock, multiprocessing.Value]:
+    """Create progress tracking objects that can be shared with workers of the given backend.
+
+    Thread workers share the parent's memory, so they skip the Manager process and its IPC.
+
+    Args:
+        backend: Concrete executor backend
+
+    Returns:
+        Tuple of (manager_or_none, lock, counter)
+    """
+    if backend == TrxExecutor.THREAD:
+        return None, threading.RLock(), ThreadCounter()
+
+    manager = multiprocessing.Manager()
+    lock = manager.RLock()
+    current_iter = manager.Value("i", 0)
+    return manager, lock, current_iter
+
+
+def available_cpus() -> list[int]:
+    """Get the CPUs this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def plan_worker_layout(num_workers: int, threads_per_worker: int | None = None, pin: bool = False) -> WorkerLayout:
+    """Assign each worker an explicit thread budget and, optionally, a set of CPUs.
+
+    Args:
+        num_workers: Number of pool workers
+        threads_per_worker: Threads each worker may use, or None to split the available CPUs evenly
+        pin: Pin each worker to its own CPUs (Linux only)
+
+    Returns:
+        The planned worker layout
+    """
+    cpus = available_cpus()
+    if threads_per_worker is None:
+        threads_per_worker = max(1, len(cpus) // num_workers)
+
+    cpu_sets = None
+    if pin:
+        if not hasattr(os, "sched_setaffinity"):
+            logger.warning("CPU pinning is only supported on Linux, workers will not be pinned")
+        elif num_workers * threads_per_worker > len(cpus):
+            logger.warning(
+                f"Cannot pin {num_workers} worker(s) x {threads_per_worker} thread(s) to {len(cpus)} CPU(s), "
+                "workers will not be pinned"
+            )
+        else:
+            cpu_sets = tuple(
+                tuple(cpus[i * threads_per_worker : (i + 1) * threads_per_worker]) for i in range(num_workers)
+            )
+
+    return WorkerLayout(num_workers=num_workers, threads_per_worker=threads_per_worker, cpu_sets=cpu_sets)
+
+
+def _initialize_worker(
+    cpu_sets: tuple[tuple[int, ...], ...] | None,
+    slot_counter: multiprocessing.Value,
+    low_priority: bool = False,
+    threads: int | None = None,
+) -> None:
+    """Pool initializer that sets up each new worker.
+
+    The worker's priority is lowered, its thread pools are limited and it is pinned to the next CPU
+    set. Thread limits are only passed to worker processes, as thread workers share the environment
+    of the parent.
+    """
+    if threads is not None:
+        os.environ.update(dict.fromkeys(THREAD_LIMIT_ENV_VARS, str(threads)))
+    if low_priority:
+        lower_priority()
+    if not cpu_sets:
+        return
+
+    with slot_counter.get_lock():
+        slot = slot_counter.value % len(cpu_sets)
+        slot_counter.value += 1
+
+    # On Linux, pid 0 targets the calling thread, so this also works for thread workers
+    os.sched_setaffinity(0, cpu_sets[slot])
+    logger.debug(f"Worker {os.getpid()} pinned to CPUs {cpu_sets[slot]}")
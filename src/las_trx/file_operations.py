@@ -7,6 +7,7 @@ from loguru import logger
 from pydantic import ValidationError
 
 from las_trx.config import TransformConfig
+from las_trx.constants import CopcConstants, TabularConstants
 
 
 class FileOperationError(Exception):
@@ -114,8 +115,9 @@ def validate_file_paths(input_files: list[Path], output_files: list[Path]) -> No
                 "Aborting because this would overwrite that input file."
             )
 
-    # Check for duplicate output files
-    if len(output_files) != len(set(output_files)):
+    # Check for duplicate output files; the tiles of tiled outputs are named from a shared pattern
+    named_outputs = [f for f in output_files if not is_tile_pattern(f)]
+    if len(named_outputs) != len(set(named_outputs)):
         raise FileOperationError(
             "Duplicate output file name detected. "
             "Use a format string for the output path to output a file based on the "
@@ -124,6 +126,92 @@ def validate_file_paths(input_files: list[Path], output_files: list[Path]) -> No
         )
 
 
+def discover_files(
+    input_pattern: str, output_pattern: str, config: TransformConfig | None = None
+) -> tuple[list[Path], list[Path]]:
+    """Find the input files matching a pattern and name their outputs.
+
+    Args:
+        input_pattern: Input file pattern (supports wildcards)
+        output_pattern: Output file pattern (supports {} formatting with the input stem, or {x} and {y}
+            with the tile corner for tiled outputs)
+        config: Optional config whose additional targets are checked for conflicts too
+
+    Returns:
+        Tuple of (input_files, output_files)
+
+    Raises:
+        FileOperationError: If the output paths conflict with inputs or each other
+    """
+    input_path = Path(input_pattern)
+    input_files = [f for f in input_path.parent.glob(input_path.name) if f.is_file()]
+    output_files = [output_path(output_pattern, f, config) for f in input_files]
+    all_outputs = list(output_files)
+    if config is not None:
+        all_outputs += [f for input_file in input_files for f in target_output_files(config, input_file)]
+        if config.merge:
+            all_outputs = list(dict.fromkeys(all_outputs))
+    validate_file_paths(input_files, all_outputs)
+    return input_files, output_files
+
+
+def target_output_files(config: TransformConfig, input_file: Path) -> list[Path]:
+    """Name the outputs of an input file for each additional target of a config.
+
+    Args:
+        config: Config with the additional targets
+        input_file: Input file path
+
+    Returns:
+        One output path per target, in the order of config.targets
+    """
+    return [output_path(target.output, input_file, config) for target in config.targets]
+
+
+def output_path(output_pattern: str, input_file: Path, config: TransformConfig | None = None) -> Path:
+    """Name the output of an input file from an output pattern.
+
+    Tiled outputs keep the pattern, as their tiles are only named once their points are known, and
+    merged outputs take the pattern as the path of the output of every input.
+
+    Args:
+        output_pattern: Output file pattern
+        input_file: Input file path
+        config: Optional config, whose tiling or merging selects how the pattern is read
+
+    Returns:
+        Output path, or the tile pattern of tiled outputs
+
+    Raises:
+        FileOperationError: If a tiled output pattern does not name tiles
+    """
+    if config is not None and config.merge:
+        return ensure_output_extension(Path(output_pattern))
+    if config is None or config.tiling is None:
+        return ensure_output_extension(
+            Path(output_pattern.format(input_file.stem)), default_output_extension(input_file)
+        )
+    if not is_tile_pattern(Path(output_pattern)):
+        raise FileOperationError(
+            f"Tiled output pattern {output_pattern!r} must contain {{x}} and {{y}}, "
+            r"the lower-left corner of each tile. e.g. 'C:\some\path\{x}_{y}.laz'"
+        )
+    return ensure_output_extension(Path(output_pattern))
+
+
+def is_tile_pattern(output_file: Path) -> bool:
+    """Check whether an output path is the pattern of tiled outputs."""
+    return "{x" in str(output_file) and "{y" in str(output_file)
+
+
+def default_output_extension(input_file: Path) -> str:
+    """Coordinate tables are written in their own format, and LAS data as LAZ by default."""
+    suffix = input_file.suffix.lower()
+    if suffix in TabularConstants.TEXT_SUFFIXES + TabularConstants.ARRAY_SUFFIXES:
+        return suffix
+    return ".laz"
+
+
 def ensure_output_extension(output_file: Path, default_extension: str = ".laz") -> Path:
     """Ensure output file has proper extension.
 
@@ -136,4 +224,13 @@ def ensure_output_extension(output_file: Path, default_extension: str = ".laz")
     """
     if not output_file.suffix:
         return output_file.with_suffix(default_extension)
+    if output_file.suffix.lower() == ".copc":
+        return output_file.with_suffix(CopcConstants.SUFFIX)
     return output_file
+
+
+def output_suffix(output_file: Path) -> str:
+    """Get the suffix that selects the format of an output, including the .copc of COPC outputs."""
+    if output_file.name.lower().endswith(CopcConstants.SUFFIX):
+        return output_file.name[-len(CopcConstants.SUFFIX) :]
+    return output_file.suffix
@@ -0,0 +1,160 @@
+"""Filters keeping only some of the points of an input.
+
+Filters are evaluated per chunk as vectorized masks, and a point is kept if it passes all of them:
+
+* ``bbox``: min x, min y, max x and max y of a box, bounds included
+* ``polygon``: vertices of a polygon, by the even-odd rule
+* ``classifications``: classification codes to keep
+* ``return_numbers``: return numbers to keep
+* ``gps_time``: first and last GPS time to keep, in the time format of the input
+
+The box and polygon are in the origin frame of the input or in the destination frame of the main
+output, as ``frame`` selects. Attribute filters and spatial filters in the origin frame are
+evaluated before points are transformed, so dropped points are never transformed. Spatial filters
+in the destination frame are evaluated on the coordinates of the main output, and apply to all
+outputs alike.
+
+If a spatial filter is in the origin frame and the input has a LAX index next to it, only the
+intervals of points in the index cells overlapping the filter are read, so LAZ chunks of points
+outside the filter are never decompressed.
+"""
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import laspy
+import numpy as np
+from laspy import LasHeader
+from loguru import logger
+
+from las_trx.config import FilterConfig, TrxFilterFrame
+from las_trx.lax import lax_path, query_intervals
+
+
+def uses_spatial_filter(filters: FilterConfig | None, frame: TrxFilterFrame) -> bool:
+    """Check whether filters have a box or polygon in a frame."""
+    return filters is not None and filters.frame == frame and (filters.bbox is not None or filters.polygon is not None)
+
+
+def check_filters(filters: FilterConfig, header: LasHeader) -> None:
+    """Check that the points of an input have the dimensions the filters need.
+
+    Raises:
+        ValueError: If filtering by GPS time a point format without GPS time
+    """
+    if filters.gps_time is not None and "gps_time" not in header.point_format.dimension_names:
+        raise ValueError(f"Point format {header.point_format.id} has no GPS time to filter by")
+
+
+def filter_bounds(filters: FilterConfig) -> tuple[np.ndarray, np.ndarray]:
+    """Get the lower and upper X and Y bounds of the box and polygon of the filters."""
+    mins = np.full(2, -np.inf)
+    maxs = np.full(2, np.inf)
+    if filters.bbox is not None:
+        mins = np.maximum(mins, filters.bbox[:2])
+        maxs = np.minimum(maxs, filters.bbox[2:])
+    if filters.polygon is not None:
+        vertices = np.asarray(filters.polygon, dtype=np.float64)
+        mins = np.maximum(mins, vertices.min(axis=0))
+        maxs = np.minimum(maxs, vertices.max(axis=0))
+    return mins, maxs
+
+
+def polygon_mask(xy: np.ndarray, polygon: list[tuple[float, float]]) -> np.ndarray:
+    """Get the mask of the points inside a polygon, by the even-odd rule."""
+    x = xy[:, 0]
+    y = xy[:, 1]
+    vertices = np.asarray(polygon, dtype=np.float64)
+    inside = np.zeros(len(xy), dtype=bool)
+    for (x1, y1), (x2, y2) in zip(vertices, np.roll(vertices, -1, axis=0)):
+        # Edges crossed by a ray from each point towards +x
+        crosses = (y1 > y) != (y2 > y)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            crossing_x = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
+        inside ^= crosses & (x < crossing_x)
+    return inside
+
+
+def spatial_mask(filters: FilterConfig, xy: np.ndarray) -> np.ndarray:
+    """Get the mask of the points inside the box and polygon of the filters."""
+    mins, maxs = filter_bounds(filters)
+    mask = np.all((xy[:, :2] >= mins) & (xy[:, :2] <= maxs), axis=1)
+    if filters.polygon is not None and mask.any():
+        candidates = np.flatnonzero(mask)
+        mask[candidates] = polygon_mask(xy[candidates], filters.polygon)
+    return mask
+
+
+def source_mask(filters: FilterConfig, points: laspy.ScaleAwarePointRecord) -> np.ndarray:
+    """Get the mask of the points passing the filters evaluated before transformation."""
+    mask = np.ones(len(points), dtype=bool)
+    if filters.classifications is not None:
+        mask &= np.isin(np.asarray(points.classification), filters.classifications)
+    if filters.return_numbers is not None:
+        mask &= np.isin(np.asarray(points.return_number), filters.return_numbers)
+    if filters.gps_time is not None:
+        gps_time = np.asarray(points.gps_time)
+        mask &= (gps_time >= filters.gps_time[0]) & (gps_time <= filters.gps_time[1])
+    if uses_spatial_filter(filters, TrxFilterFrame.ORIGIN) and mask.any():
+        xy = np.column_stack((points.x, points.y))
+        mask[mask] = spatial_mask(filters, xy[mask])
+    return mask
+
+
+def indexed_intervals(filters: FilterConfig, input_file: Path, point_count: int) -> list[tuple[int, int]] | None:
+    """Get the intervals of points to read from the LAX index of an input, if the filters and index allow.
+
+    Args:
+        filters: Filters of the transformation
+        input_file: Input file path
+        point_count: Number of points of the input
+
+    Returns:
+        Sorted intervals of first and last point index, or None to read every point
+    """
+    index_file = lax_path(input_file)
+    if not uses_spatial_filter(filters, TrxFilterFrame.ORIGIN) or not index_file.exists():
+        return None
+    try:
+        intervals = query_intervals(index_file, *filter_bounds(filters))
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring spatial index {index_file}: {e}")
+        return None
+    if intervals and intervals[-1][1] >= point_count:
+        logger.warning(f"Ignoring spatial index {index_file}, which indexes more points than {input_file.name} has")
+        return None
+
+    selected = sum(end - start + 1 for start, end in intervals)
+    logger.debug(f"{input_file.name}: spatial index selects {selected} of {point_count} points")
+    return intervals
+
+
+def read_chunks(
+    reader: laspy.LasReader, chunk_size: int, intervals: list[tuple[int, int]] | None = None
+) -> Iterator[tuple[laspy.ScaleAwarePointRecord, int]]:
+    """Read the points of an input in chunks, only from some intervals if given.
+
+    Args:
+        reader: Reader of the input
+        chunk_size: Maximum number of points in each chunk
+        intervals: Sorted intervals of first and last point index to read, or None to read every point
+
+    Yields:
+        Tuples of (points, index of the point following the chunk)
+    """
+    if intervals is None:
+        position = 0
+        for points in reader.chunk_iterator(chunk_size):
+            position += len(points)
+            yield points, position
+        return
+
+    for start, end in intervals:
+        reader.seek(start)
+        position = start
+        while position <= end:
+            points = reader.read_points(min(chunk_size, end + 1 - position))
+            if not len(points):
+                break
+            position += len(points)
+            yield points, position
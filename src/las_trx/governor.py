@@ -0,0 +1,153 @@
+"""Memory accounting for the worker pool."""
+
+import ctypes
+import sys
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+from las_trx.constants import MemoryConstants
+
+if TYPE_CHECKING:
+    from laspy import LasHeader
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def estimate_task_memory(header: "LasHeader", file_size: int, chunk_size: int) -> int:
+    """Estimate the peak memory needed to transform one file, excluding the worker's baseline.
+
+    Args:
+        header: Header of the input file
+        file_size: Size of the input file in bytes, used to size the EVLRs
+        chunk_size: Number of points processed per chunk
+
+    Returns:
+        Estimated peak memory in bytes
+    """
+    record_length = header.point_format.size
+    chunk_points = min(chunk_size, header.point_count)
+
+    # Read chunk, rescaled copy and writer buffer, plus float arrays and per-point tuples from the transformer
+    chunk_bytes = chunk_points * (3 * record_length + MemoryConstants.TRANSFORM_BYTES_PER_POINT)
+
+    # LAZ (de)compressors buffer a full LAZ chunk on each side
+    laz_bytes = 2 * MemoryConstants.LAZ_CHUNK_SIZE * record_length
+
+    # The input header, its deepcopy and the writer's copy all hold every (E)VLR
+    evlr_bytes = file_size - header.start_of_first_evlr if header.number_of_evlrs else 0
+    header_bytes = 3 * (header.offset_to_point_data + evlr_bytes)
+
+    return chunk_bytes + laz_bytes + header_bytes
+
+
+def peak_rss_bytes() -> int | None:
+    """Get the peak resident set size of the current process.
+
+    Returns:
+        Peak RSS in bytes, or None if the platform does not report it
+    """
+    if sys.platform == "win32":
+        return _windows_peak_working_set()
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _windows_peak_working_set() -> int | None:
+    """Get the peak working set of the current process on Windows."""
+    from ctypes import wintypes
+
+    class ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = (
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        )
+
+    counters = ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(counters)
+    kernel32 = ctypes.windll.kernel32
+    kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+    if not ctypes.windll.psapi.GetProcessMemoryInfo(kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+        return None
+    return counters.PeakWorkingSetSize
+
+
+class MemoryGovernor:
+    """Admits tasks only while the projected memory use of the pool stays under a budget."""
+
+    def __init__(self, budget_mb: int | None, worker_overhead: int = MemoryConstants.WORKER_OVERHEAD_BYTES) -> None:
+        """Initialize the governor.
+
+        Args:
+            budget_mb: Total RAM budget in megabytes, or None for no limit
+            worker_overhead: Baseline memory of an idle worker in bytes
+        """
+        self.budget = budget_mb * 1024**2 if budget_mb is not None else None
+        self.worker_overhead = worker_overhead
+        self.in_flight = 0
+        self.in_flight_bytes = 0
+
+    def max_workers(self, num_workers: int, smallest_task: int) -> int:
+        """Cap a worker count to what fits in the budget when each worker runs the smallest task.
+
+        Args:
+            num_workers: Requested number of workers
+            smallest_task: Smallest estimated task memory in bytes
+
+        Returns:
+            Number of workers that fits in the budget, at least 1
+        """
+        if self.budget is None:
+            return num_workers
+
+        fitting = max(1, self.budget // (self.worker_overhead + smallest_task))
+        if fitting < num_workers:
+            logger.warning(f"Memory budget of {self.budget / 1024**2:.0f} MB limits the pool to {fitting} worker(s)")
+        return min(num_workers, fitting)
+
+    def can_admit(self, task_bytes: int) -> bool:
+        """Check if a task fits in the budget alongside the tasks already in flight.
+
+        A task is always admitted when nothing else is running so that oversized files still make progress.
+
+        Args:
+            task_bytes: Estimated memory of the task in bytes
+
+        Returns:
+            True if the task can be started now
+        """
+        if self.budget is None or self.in_flight == 0:
+            return True
+
+        projected = (self.in_flight + 1) * self.worker_overhead + self.in_flight_bytes + task_bytes
+        return projected <= self.budget
+
+    def admit(self, task_bytes: int) -> None:
+        """Record a task as started."""
+        if self.budget is not None and self.in_flight == 0 and self.worker_overhead + task_bytes > self.budget:
+            logger.warning(
+                f"Task needs an estimated {task_bytes / 1024**2:.0f} MB, "
+                f"which exceeds the memory budget of {self.budget / 1024**2:.0f} MB. Running it alone."
+            )
+        self.in_flight += 1
+        self.in_flight_bytes += task_bytes
+
+    def release(self, task_bytes: int) -> None:
+        """Record a task as finished."""
+        self.in_flight -= 1
+        self.in_flight_bytes -= task_bytes
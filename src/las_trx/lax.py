@@ -0,0 +1,261 @@
+"""LAX spatial index sidecars, in the format written by LAStools' lasindex.
+
+A .lax file next to a LAS/LAZ file maps the cells of a quadtree over the file's XY bounds to the
+intervals of point indices that fall in each cell, so readers built on LASlib, such as LAStools
+and lidR, seek straight to the points of a bounding box. The layout is:
+
+* ``LASX`` signature and version 0
+* ``LASS`` spatial signature with type 0, then ``LASQ`` with version 0, the number of levels, a
+  level index and implicit levels of 0, and the F32 min x, max x, min y and max y of the tree
+* ``LASV`` signature with version 0, the number of cells and the interval threshold, then for each
+  cell its I32 index, number of intervals, number of points and the U32 first and last point index
+  of each interval
+
+All values are little endian. Cells are indexed by their position in a full quadtree, counting
+from the root, and only leaf cells are written; lasindex may also merge sparse cells into their
+parents, which readers handle the same way.
+
+Points are indexed as they are written, in the order they are written. The bounds of the tree
+are set up front from the transformed header bounds plus a margin; if any point falls outside
+them the index is skipped rather than written with points that queries would miss.
+
+Indexes next to inputs, whether written by las-trx or lasindex, are read back to find the points
+of a spatial filter without decompressing the rest of the file.
+"""
+
+import math
+import struct
+from pathlib import Path
+from types import TracebackType
+
+import numpy as np
+from loguru import logger
+
+from las_trx.constants import LaxConstants
+
+
+def lax_path(output_file: Path) -> Path:
+    """Get the path of the spatial index sidecar of a LAS/LAZ output."""
+    return output_file.with_suffix(LaxConstants.SUFFIX)
+
+
+def quadtree_bounds(mins: np.ndarray, maxs: np.ndarray) -> tuple[int, np.ndarray]:
+    """Set up a quadtree over XY bounds the way lasindex does.
+
+    The bounds are snapped outwards to whole cells, then grown on both sides to a power of two
+    cells across.
+
+    Args:
+        mins: Lower X and Y bounds of the points
+        maxs: Upper X and Y bounds of the points
+
+    Returns:
+        Tuple of (number of levels, F32 array of min x, max x, min y and max y of the tree)
+    """
+    extent = max(float(maxs[0] - mins[0]), float(maxs[1] - mins[1]))
+    cell_size = 10.0 ** math.ceil(math.log10(extent / LaxConstants.MAX_CELLS_ACROSS)) if extent > 0 else 1.0
+
+    bounds = []
+    for low, high in ((float(mins[0]), float(maxs[0])), (float(mins[1]), float(maxs[1]))):
+        low = cell_size * (int(low / cell_size) if low >= 0 else int(low / cell_size) - 1)
+        high = cell_size * (int(high / cell_size) + 1 if high >= 0 else int(high / cell_size))
+        bounds.append([low, high, int((high - low) / cell_size + 0.5)])
+
+    levels = (max(bounds[0][2], bounds[1][2]) - 1).bit_length()
+    for axis in bounds:
+        padding = (1 << levels) - axis[2]
+        axis[0] -= (padding - padding // 2) * cell_size
+        axis[1] += (padding // 2) * cell_size
+    return levels, np.array([bounds[0][0], bounds[0][1], bounds[1][0], bounds[1][1]], dtype=np.float32)
+
+
+def quadtree_cells(x: np.ndarray, y: np.ndarray, levels: int, bounds: np.ndarray) -> np.ndarray:
+    """Get the leaf cell index of each point, halving cells in F32 as LAStools does."""
+    min_x = np.full(len(x), bounds[0], dtype=np.float32)
+    max_x = np.full(len(x), bounds[1], dtype=np.float32)
+    min_y = np.full(len(x), bounds[2], dtype=np.float32)
+    max_y = np.full(len(x), bounds[3], dtype=np.float32)
+    cells = np.zeros(len(x), dtype=np.int64)
+
+    for _ in range(levels):
+        mid_x = (min_x + max_x) / np.float32(2)
+        mid_y = (min_y + max_y) / np.float32(2)
+        right = x >= mid_x
+        top = y >= mid_y
+        cells = (cells << 2) | right | (top.astype(np.int64) << 1)
+        min_x = np.where(right, mid_x, min_x)
+        max_x = np.where(right, max_x, mid_x)
+        min_y = np.where(top, mid_y, min_y)
+        max_y = np.where(top, max_y, mid_y)
+
+    # Leaves are numbered after the cells of all coarser levels
+    return cells + (4**levels - 1) // 3
+
+
+class LaxIndex:
+    """Builds the spatial index of an output as its points are written, and writes it on close."""
+
+    def __init__(self, path: Path, mins: np.ndarray, maxs: np.ndarray) -> None:
+        """Initialize the index.
+
+        Args:
+            path: Path of the .lax file
+            mins: Estimated lower X and Y bounds of the points
+            maxs: Estimated upper X and Y bounds of the points
+        """
+        margin = LaxConstants.BOUNDS_MARGIN * (np.asarray(maxs[:2]) - np.asarray(mins[:2]))
+        self.path = path
+        self.levels, self.bounds = quadtree_bounds(np.asarray(mins[:2]) - margin, np.asarray(maxs[:2]) + margin)
+        self._intervals: dict[int, list[list[int]]] = {}
+        self._counts: dict[int, int] = {}
+        self._num_points = 0
+        self._outside = 0
+
+    def __enter__(self) -> "LaxIndex":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            self.write()
+
+    def add(self, x: np.ndarray, y: np.ndarray) -> None:
+        """Add the next points written to the file.
+
+        Args:
+            x: Scaled X coordinates of the points, as written
+            y: Scaled Y coordinates of the points, as written
+        """
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        self._outside += int(
+            np.count_nonzero((x < self.bounds[0]) | (x > self.bounds[1]) | (y < self.bounds[2]) | (y > self.bounds[3]))
+        )
+
+        # Group the points of each cell, then split them where consecutive points are too far apart
+        cells = quadtree_cells(x, y, self.levels, self.bounds)
+        order = np.argsort(cells, kind="stable")
+        cells = cells[order]
+        indices = order + self._num_points
+        breaks = np.flatnonzero((cells[1:] != cells[:-1]) | (np.diff(indices) > LaxConstants.INTERVAL_THRESHOLD))
+        starts = np.r_[0, breaks + 1] if len(cells) else np.empty(0, dtype=np.int64)
+        ends = np.r_[breaks, len(cells) - 1] if len(cells) else np.empty(0, dtype=np.int64)
+
+        for cell, start, end in zip(cells[starts].tolist(), indices[starts].tolist(), indices[ends].tolist()):
+            intervals = self._intervals.setdefault(cell, [])
+            if intervals and start - intervals[-1][1] <= LaxConstants.INTERVAL_THRESHOLD:
+                intervals[-1][1] = end
+            else:
+                intervals.append([start, end])
+
+        unique, counts = np.unique(cells, return_counts=True)
+        for cell, count in zip(unique.tolist(), counts.tolist()):
+            self._counts[cell] = self._counts.get(cell, 0) + count
+        self._num_points += len(x)
+
+    def write(self) -> None:
+        """Write the index, unless it cannot cover every point."""
+        if self._outside:
+            logger.warning(f"Not writing {self.path}: {self._outside} point(s) fall outside the index bounds")
+            return
+        if self._num_points > np.iinfo(np.uint32).max:
+            logger.warning(f"Not writing {self.path}: LAX indexes address at most 2^32 points")
+            return
+
+        parts = [
+            b"LASX",
+            struct.pack("<I", 0),
+            b"LASS",
+            struct.pack("<I", 0),
+            b"LASQ",
+            struct.pack("<IIII", 0, self.levels, 0, 0),
+            self.bounds.astype("<f4").tobytes(),
+            b"LASV",
+            struct.pack("<IIi", 0, len(self._intervals), LaxConstants.INTERVAL_THRESHOLD),
+        ]
+        for cell in sorted(self._intervals):
+            intervals = self._intervals[cell]
+            parts.extend((
+                struct.pack("<iII", cell, len(intervals), self._counts[cell]),
+                np.array(intervals, dtype="<u4").tobytes(),
+            ))
+        self.path.write_bytes(b"".join(parts))
+        logger.debug(f"Wrote spatial index {self.path} with {len(self._intervals)} cells")
+
+
+def read_lax(path: Path) -> tuple[int, np.ndarray, dict[int, list[tuple[int, int]]]]:
+    """Read a .lax file.
+
+    Returns:
+        Tuple of (number of levels, F32 array of min x, max x, min y and max y of the tree, and the
+        first and last point index of each interval of each cell)
+
+    Raises:
+        ValueError: If the file is not a quadtree LAX index
+    """
+    data = path.read_bytes()
+    if data[:4] != b"LASX" or data[8:12] != b"LASS" or data[16:20] != b"LASQ" or data[52:56] != b"LASV":
+        raise ValueError(f"{path} is not a quadtree LAX index")
+    _, levels, _, _ = struct.unpack_from("<IIII", data, 20)
+    bounds = np.frombuffer(data, dtype="<f4", count=4, offset=36).copy()
+    _, num_cells, _ = struct.unpack_from("<IIi", data, 56)
+
+    offset = 68
+    cells = {}
+    for _ in range(num_cells):
+        cell, num_intervals, _ = struct.unpack_from("<iII", data, offset)
+        intervals = np.frombuffer(data, dtype="<u4", count=2 * num_intervals, offset=offset + 12).reshape(-1, 2)
+        cells[cell] = [(int(start), int(end)) for start, end in intervals]
+        offset += 12 + 8 * num_intervals
+    return levels, bounds, cells
+
+
+def cell_bounds(cell: int, bounds: np.ndarray) -> np.ndarray:
+    """Get the min x, max x, min y and max y of a quadtree cell, at whichever level it is."""
+    level = 0
+    while cell >= (4 ** (level + 1) - 1) // 3:
+        level += 1
+    position = cell - (4**level - 1) // 3
+
+    min_x, max_x, min_y, max_y = (float(v) for v in bounds)
+    for shift in range(2 * (level - 1), -1, -2):
+        quadrant = (position >> shift) & 3
+        mid_x = (min_x + max_x) / 2
+        mid_y = (min_y + max_y) / 2
+        min_x, max_x = (mid_x, max_x) if quadrant & 1 else (min_x, mid_x)
+        min_y, max_y = (mid_y, max_y) if quadrant & 2 else (min_y, mid_y)
+    return np.array([min_x, max_x, min_y, max_y])
+
+
+def query_intervals(path: Path, mins: np.ndarray, maxs: np.ndarray) -> list[tuple[int, int]]:
+    """Get the intervals of point indices of the cells of a .lax file that overlap a bounding box.
+
+    Args:
+        path: Path of the .lax file
+        mins: Lower X and Y bounds of the box
+        maxs: Upper X and Y bounds of the box
+
+    Returns:
+        Sorted, non-overlapping intervals of first and last point index, covering every point in the box
+
+    Raises:
+        ValueError: If the file is not a quadtree LAX index
+    """
+    _, bounds, cells = read_lax(path)
+    intervals = []
+    for cell, cell_intervals in cells.items():
+        min_x, max_x, min_y, max_y = cell_bounds(cell, bounds)
+        if min_x <= maxs[0] and max_x >= mins[0] and min_y <= maxs[1] and max_y >= mins[1]:
+            intervals.extend(cell_intervals)
+
+    merged: list[tuple[int, int]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
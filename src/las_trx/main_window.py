@@ -20,14 +20,14 @@ from PyQt6.QtWidgets import (
 )
 
 from las_trx import __version__
-from las_trx.config import TrxReference, TrxVd
+from las_trx.config import TransformConfig, TrxReference, TrxVd
 from las_trx.config_builder import ConfigurationBuilder
 from las_trx.constants import UIConstants
 from las_trx.controllers import ConfigurationController, FileController
 from las_trx.ui_interface import UIWidgetAdapter
 from las_trx.utils import get_upgrade_version, resource_path
 from las_trx.widgets import WidgetFactory
-from las_trx.worker import TransformWorker
+from las_trx.worker import PreviewWorker, TransformWorker
 
 
 class MainWindow(QMainWindow):
@@ -57,8 +57,9 @@ class MainWindow(QMainWindow):
         # Sync grid files
         sync_missing_grid_files()
 
-        # Current worker thread
+        # Current worker threads
         self.current_worker: TransformWorker | None = None
+        self.preview_worker: PreviewWorker | None = None
 
     def _setup_window(self) -> None:
         """Setup main window properties."""
@@ -179,6 +180,7 @@ class MainWindow(QMainWindow):
             )
         )
         self.cw.dateEdit_input_epoch.dateChanged.connect(self._maybe_update_output_epoch)
+        self.cw.spinBox_io_limit.valueChanged.connect(self._update_io_limit)
 
         # Coordinate type changes
         self.cw.comboBox_input_coordinates.currentTextChanged.connect(
@@ -191,6 +193,7 @@ class MainWindow(QMainWindow):
         # Help and conversion
         self.cw.toolButton_help.clicked.connect(self.help_msg_box.exec)
         self.cw.pushButton_convert.clicked.connect(self._start_conversion)
+        self.cw.pushButton_preview.clicked.connect(self._start_preview)
 
     def _check_for_upgrade(self) -> None:
         """Check for available upgrades."""
@@ -233,6 +236,11 @@ class MainWindow(QMainWindow):
         if not self.ui_adapter.is_epoch_transformation_enabled():
             self.ui_adapter.set_output_epoch(new_date)
 
+    def _update_io_limit(self, _value: int) -> None:
+        """Apply a new I/O limit to the running conversion, if any."""
+        if self.current_worker and self.current_worker.isRunning():
+            self.current_worker.set_io_limit(self.ui_adapter.get_io_limit())
+
     def _save_config(self) -> None:
         """Save current configuration."""
         try:
@@ -251,21 +259,62 @@ class MainWindow(QMainWindow):
         """Export logs to file."""
         self.file_controller.export_logs()
 
+    def _build_run(self) -> tuple[TransformConfig, str, str] | None:
+        """Build and validate the configuration and file patterns of a run, shared by conversion and preview.
+
+        Returns:
+            Tuple of (config, input pattern, output pattern), or None if the configuration has issues
+        """
+        # Build configuration
+        config = self.config_builder.build_transform_config()
+
+        # Validate configuration
+        issues = self.config_builder.validate_configuration(config)
+        if issues:
+            self._show_error_message("Configuration issues:\\n" + "\\n".join(issues))
+            return None
+
+        # Get file patterns
+        return config, self.ui_adapter.get_input_file_path(), self.ui_adapter.get_output_file_path()
+
+    def _start_preview(self) -> None:
+        """Start a preview of the transformation on a sample of each input."""
+        try:
+            run = self._build_run()
+            if run is None:
+                return
+            config, input_pattern, output_pattern = run
+
+            self.preview_worker = PreviewWorker(
+                config=config, input_pattern=input_pattern, output_pattern=output_pattern, parent=self
+            )
+            self.preview_worker.reports.connect(self._on_preview_reports)
+            self.preview_worker.error.connect(lambda e: self._show_error_message(f"Preview failed: {e}"))
+            self.preview_worker.started.connect(lambda: self.ui_adapter.set_preview_button_enabled(False))
+            self.preview_worker.finished.connect(lambda: self.ui_adapter.set_preview_button_enabled(True))
+            self.preview_worker.start()
+
+        except Exception as e:
+            self._show_error_message(f"Failed to start preview: {e}")
+
+    def _on_preview_reports(self, reports: list) -> None:
+        """Show the preview reports."""
+        if not reports:
+            self._show_error_message("No LAS input to preview")
+            return
+        failed = sum(report.failed_count for report in reports)
+        summary = f"{failed} sampled point(s) failed to transform" if failed else "All sampled points transformed"
+        self.success_msg_box.setWindowTitle("Preview")
+        self._show_success_message(summary + "\n\n" + "\n".join(report.describe() for report in reports))
+        self.success_msg_box.setWindowTitle("Success")
+
     def _start_conversion(self) -> None:
         """Start coordinate transformation."""
         try:
-            # Build configuration
-            config = self.config_builder.build_transform_config()
-
-            # Validate configuration
-            issues = self.config_builder.validate_configuration(config)
-            if issues:
-                self._show_error_message("Configuration issues:\\n" + "\\n".join(issues))
+            run = self._build_run()
+            if run is None:
                 return
-
-            # Get file patterns
-            input_pattern = self.ui_adapter.get_input_file_path()
-            output_pattern = self.ui_adapter.get_output_file_path()
+            config, input_pattern, output_pattern = run
 
             # Stop any existing worker
             if self.current_worker and self.current_worker.isRunning():
@@ -329,6 +378,9 @@ class MainWindow(QMainWindow):
         if self.current_worker and self.current_worker.isRunning():
             self.current_worker.stop_transformation()
             self.current_worker.wait(5000)  # Wait up to 5 seconds
+        if self.preview_worker and self.preview_worker.isRunning():
+            self.preview_worker.stop_preview()
+            self.preview_worker.wait(5000)
 
         super().closeEvent(event)
 
@@ -0,0 +1,180 @@
+"""Manifests giving each input file its own origin and destination overrides.
+
+A manifest is a CSV file with a header row, or a JSON lines file. Each row names an input file,
+optionally its output file, and any reference fields that differ from the run config. In CSV,
+overrides are columns prefixed with ``origin_`` or ``destination_``::
+
+    input,output,origin_epoch,origin_coord_type
+    flight_1.laz,,2019-06-01,UTM9
+    flight_2.laz,out/flight_2.laz,2021-08-15,
+
+and in JSON lines they are nested objects::
+
+    {"input": "flight_1.laz", "origin": {"epoch": "2019-06-01", "coord_type": "UTM9"}}
+
+Relative paths are relative to the manifest. Inputs without an output are named with the output
+pattern of the run. Other columns are ignored, and copied to the results manifest written after
+the run, which adds the output, status and error of each file.
+"""
+
+import csv
+import json
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+
+from pydantic import BaseModel, ValidationError
+
+from las_trx.config import ReferenceConfig, TransformConfig, TrxCoordType, TrxReference, TrxVd
+from las_trx.constants import ManifestConstants
+from las_trx.file_operations import FileOperationError, output_path
+
+
+class ManifestError(FileOperationError):
+    """Exception for manifests that cannot be read."""
+
+    pass
+
+
+class ReferenceOverrides(BaseModel):
+    """Reference fields of a manifest row that replace those of the run config."""
+
+    ref_frame: TrxReference | None = None
+    epoch: date | None = None
+    vd: TrxVd | None = None
+    coord_type: TrxCoordType | None = None
+
+    def apply(self, reference: ReferenceConfig) -> ReferenceConfig:
+        """Get the reference with these overrides applied."""
+        return reference.model_copy(update=self.model_dump(exclude_none=True))
+
+
+class ManifestEntry(BaseModel):
+    """One input file of a manifest."""
+
+    input: Path
+    output: Path | None = None
+    origin: ReferenceOverrides = ReferenceOverrides()
+    destination: ReferenceOverrides = ReferenceOverrides()
+
+    def apply(self, config: TransformConfig) -> TransformConfig:
+        """Get the config of this file, with its overrides applied."""
+        return config.model_copy(
+            update={
+                "origin": self.origin.apply(config.origin),
+                "destination": self.destination.apply(config.destination),
+            }
+        )
+
+
+@dataclass
+class Manifest:
+    """Entries of a manifest, and the rows they were read from."""
+
+    path: Path
+    entries: list[ManifestEntry]
+    rows: list[dict]
+
+    @classmethod
+    def read(cls, path: Path) -> "Manifest":
+        """Read a CSV or JSON lines manifest.
+
+        Raises:
+            ManifestError: If the manifest cannot be read or a row is invalid
+        """
+        try:
+            with path.open(newline="") as f:
+                if path.suffix.lower() == ".csv":
+                    rows = [{k: v for k, v in row.items() if k is not None} for row in csv.DictReader(f)]
+                else:
+                    rows = [json.loads(line) for line in f if line.strip()]
+        except (OSError, ValueError) as e:
+            raise ManifestError(f"Failed to read manifest {path}: {e}") from e
+
+        entries = []
+        for n, row in enumerate(rows, start=1):
+            try:
+                entry = ManifestEntry.model_validate(_nest_overrides(row) if path.suffix.lower() == ".csv" else row)
+            except ValidationError as e:
+                raise ManifestError(f"Invalid row {n} in manifest {path}: {e}") from e
+
+            # Paths are relative to the manifest
+            entry.input = path.parent / entry.input
+            if entry.output is not None:
+                entry.output = path.parent / entry.output
+            entries.append(entry)
+        return cls(path, entries, rows)
+
+    def files(self, output_pattern: str, config: TransformConfig | None = None) -> tuple[list[Path], list[Path]]:
+        """Get the input and output files of the manifest.
+
+        Args:
+            output_pattern: Output file pattern for rows without an output
+            config: Optional config of the run, whose tiling or merging selects how the pattern is read
+
+        Raises:
+            ManifestError: If any input file does not exist or is listed twice, or a tiled or merged run names outputs
+        """
+        missing = [str(entry.input) for entry in self.entries if not entry.input.is_file()]
+        if missing:
+            raise ManifestError(
+                f"{len(missing)} input file(s) in manifest {self.path} not found:\n" + "\n".join(missing)
+            )
+
+        input_files = [entry.input for entry in self.entries]
+        if len(input_files) != len(set(input_files)):
+            raise ManifestError(f"Manifest {self.path} lists the same input file more than once")
+        if config is not None and config.merges_inputs() and any(entry.output for entry in self.entries):
+            raise ManifestError(f"Manifest {self.path} names outputs, but tiled and merged runs name them by pattern")
+        output_files = [entry.output or output_path(output_pattern, entry.input, config) for entry in self.entries]
+        return input_files, output_files
+
+    @property
+    def results_path(self) -> Path:
+        """Path of the results manifest, next to the manifest."""
+        return self.path.with_name(f"{self.path.stem}{ManifestConstants.RESULTS_SUFFIX}{self.path.suffix}")
+
+    def write_results(self, output_files: list[Path], errors: dict[Path, str | None]) -> Path:
+        """Write the results manifest, a copy of the manifest with the outcome of each file.
+
+        Args:
+            output_files: Output file of each entry
+            errors: Error message, or None on success, of each input file that ran; others were skipped
+
+        Returns:
+            Path of the results manifest
+        """
+        results = []
+        for entry, row, output_file in zip(self.entries, self.rows, output_files, strict=True):
+            if entry.input not in errors:
+                status, error = ManifestConstants.STATUS_SKIPPED, None
+            elif errors[entry.input] is None:
+                status, error = ManifestConstants.STATUS_DONE, None
+            else:
+                status, error = ManifestConstants.STATUS_FAILED, errors[entry.input]
+            results.append({**row, "output": str(output_file), "status": status, "error": error})
+
+        path = self.results_path
+        with path.open("w", newline="") as f:
+            if self.path.suffix.lower() == ".csv":
+                fieldnames = list(dict.fromkeys([*results[0], "output", "status", "error"])) if results else []
+                writer = csv.DictWriter(f, fieldnames=fieldnames)
+                writer.writeheader()
+                writer.writerows(results)
+            else:
+                f.writelines(json.dumps(result) + "\n" for result in results)
+        return path
+
+
+def _nest_overrides(row: dict[str, str]) -> dict:
+    """Turn the prefixed override columns of a CSV row into nested objects, dropping empty cells."""
+    nested = {"origin": {}, "destination": {}}
+    for key, value in row.items():
+        if not value:
+            continue
+        prefix, _, field = key.partition("_")
+        if prefix in nested and field:
+            nested[prefix][field] = value
+        else:
+            nested[key] = value
+    return nested
@@ -0,0 +1,241 @@
+"""Inputs merged into a single transformed output.
+
+With merging configured, every input of a batch is transformed into one output file. Before any
+input is transformed, the headers of the inputs are reconciled into the header of the output:
+
+* the point format is the smallest that holds the dimensions of every input, with legacy formats
+  0 to 5 taken as their LAS 1.4 counterparts if any input uses formats 6 to 10
+* extra bytes dimensions are the union of those of the inputs, which must agree on the type of the
+  dimensions they share
+* offsets come from the transformed bounds of all inputs, so that one scale and offset hold every
+  point
+
+Workers transform their inputs in parallel, each into an uncompressed fragment of the output that
+is already in the merged point format, scales and offsets. Once every input is transformed, the
+fragments are written into the output one after the other, in input order, so inputs are only
+decompressed once. LAZ outputs are compressed with the parallel lazrs backend when it is installed.
+
+The fragments of tiled outputs are merged into their tiles the same way.
+"""
+
+import contextlib
+import copy
+import hashlib
+from pathlib import Path
+from types import TracebackType
+
+import laspy
+import numpy as np
+from laspy import LasHeader
+from laspy.header import Version
+from loguru import logger
+
+from las_trx.config import TransformConfig
+from las_trx.constants import MergeConstants
+from las_trx.copc import CopcWriter, is_copc
+from las_trx.lax import LaxIndex, lax_path
+
+# LAS 1.4 point formats holding the dimensions of each legacy format
+_LAS14_POINT_FORMATS = {0: 6, 1: 6, 2: 7, 3: 7, 4: 9, 5: 10}
+
+
+def fragment_id(input_file: Path) -> str:
+    """Get the identifier naming the fragments of an input, the same whichever worker writes them."""
+    return hashlib.sha256(str(input_file.resolve()).encode()).hexdigest()[: MergeConstants.ID_LENGTH]
+
+
+def fragment_path(output_file: Path, input_id: str) -> Path:
+    """Get the path of the fragment of an output written from one input, hidden next to the output."""
+    return output_file.with_name(f".{output_file.name}.{input_id}{MergeConstants.FRAGMENT_SUFFIX}")
+
+
+def discard_merge(output_file: Path, fragments: list[Path]) -> None:
+    """Remove the fragments of a merge that failed, and the partial output and spatial index it left."""
+    for path in [*fragments, output_file, lax_path(output_file)]:
+        path.unlink(missing_ok=True)
+
+
+def merged_point_format(point_formats: list[laspy.PointFormat]) -> laspy.PointFormat:
+    """Get the smallest point format holding the dimensions of all point formats, with their extra bytes.
+
+    Raises:
+        ValueError: If point formats have extra bytes dimensions of the same name but of different types
+    """
+    ids = {point_format.id for point_format in point_formats}
+    las14 = any(point_format_id >= 6 for point_format_id in ids)
+    if las14:
+        ids = {_LAS14_POINT_FORMATS.get(point_format_id, point_format_id) for point_format_id in ids}
+
+    names = set().union(*(laspy.PointFormat(point_format_id).dimension_names for point_format_id in ids))
+    candidates = range(6, 11) if las14 else range(6)
+    merged = laspy.PointFormat(next(i for i in candidates if names <= set(laspy.PointFormat(i).dimension_names)))
+
+    extra_dimensions = {}
+    types = {}
+    for point_format in point_formats:
+        for dimension in point_format.extra_dimensions:
+            dimension_type = (dimension.kind, dimension.num_bits, dimension.num_elements)
+            if types.setdefault(dimension.name, dimension_type) != dimension_type:
+                raise ValueError(f"Extra bytes dimension {dimension.name!r} has different types in the inputs")
+            extra_dimensions.setdefault(dimension.name, dimension)
+    merged.dimensions.extend(extra_dimensions.values())
+    return merged
+
+
+def merged_header(base: LasHeader, headers: list[LasHeader], offsets: np.ndarray) -> LasHeader:
+    """Get the header of an output merged from several inputs.
+
+    Args:
+        base: Output header of the first input, with the CRS VLRs and scales of the output
+        headers: Headers of all inputs
+        offsets: Offsets holding the transformed points of all inputs
+
+    Returns:
+        Header with the merged point format, extra bytes and offsets
+
+    Raises:
+        ValueError: If the inputs have extra bytes dimensions of the same name but of different types
+    """
+    point_format = merged_point_format([header.point_format for header in headers])
+    header = copy.deepcopy(base)
+    if not same_point_format(point_format, header.point_format):
+        if point_format.id >= 6:
+            version = Version(1, 4)
+        else:
+            version = max((h.version for h in headers), key=lambda v: (v.major, v.minor))
+        header.set_version_and_point_format(version, point_format)
+    header.offsets = offsets
+    return header
+
+
+def same_point_format(a: laspy.PointFormat, b: laspy.PointFormat) -> bool:
+    """Check whether point formats have the same records, including their extra bytes."""
+    return a.id == b.id and a.dtype() == b.dtype()
+
+
+def match_header(points: laspy.ScaleAwarePointRecord, header: LasHeader) -> laspy.ScaleAwarePointRecord:
+    """Convert points to the point format, scales and offsets of a header, if they differ."""
+    if (
+        same_point_format(points.point_format, header.point_format)
+        and np.array_equal(points.scales, header.scales)
+        and np.array_equal(points.offsets, header.offsets)
+    ):
+        return points
+
+    converted = laspy.ScaleAwarePointRecord.zeros(len(points), header=header)
+    converted.copy_fields_from(points)
+    converted.x = points.x
+    converted.y = points.y
+    converted.z = points.z
+
+    # Legacy formats give the scan angle in whole degrees, LAS 1.4 formats in fixed steps
+    names = points.point_format.dimension_names
+    if "scan_angle_rank" in names and "scan_angle" in header.point_format.dimension_names:
+        converted["scan_angle"] = np.round(np.asarray(points["scan_angle_rank"]) / MergeConstants.SCAN_ANGLE_STEP)
+    return converted
+
+
+def laz_write_backend(threads: int) -> laspy.LazBackend:
+    """Pick a LAZ compression backend, compressing chunks in parallel if given more than one thread."""
+    if threads > 1 and laspy.LazBackend.LazrsParallel.is_available():
+        return laspy.LazBackend.LazrsParallel
+    return laspy.LazBackend.Laszip
+
+
+class FragmentWriter:
+    """Writes the points of one input to its fragment of a merged output, in the merged point format."""
+
+    def __init__(self, path: Path, header: LasHeader) -> None:
+        """Initialize the writer.
+
+        Args:
+            path: Fragment path
+            header: Header of the merged output
+        """
+        self.path = path
+        self.header = header
+        self._writer = laspy.open(str(path), mode="w", header=copy.deepcopy(header))
+
+    def __enter__(self) -> "FragmentWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self._writer.close()
+        if exc_type is not None:
+            self.path.unlink(missing_ok=True)
+
+    def write_points(self, points: laspy.ScaleAwarePointRecord) -> None:
+        """Write transformed points, converting them to the merged point format."""
+        self._writer.write_points(match_header(points, self.header))
+
+
+def merge_fragments(
+    config: TransformConfig,
+    output_file: Path,
+    fragments: list[Path],
+    bounds: tuple[np.ndarray, np.ndarray] | None = None,
+    threads: int = 1,
+) -> int:
+    """Write fragments one after the other into an output, and remove them.
+
+    The point format of the output holds the dimensions of every fragment, as for merged outputs,
+    and the first fragment gives its scales and offsets; points of fragments that differ are
+    converted to them.
+
+    Args:
+        config: Transformation configuration of the output
+        output_file: Output path, written as COPC for that suffix and as LAS otherwise
+        fragments: Fragment files, in the order their points are written, whatever their point formats
+        bounds: Lower and upper X and Y bounds of the points, needed for a LAX index; taken from the
+            fragment headers if not given
+        threads: Threads used to compress the output
+
+    Returns:
+        Number of points written
+
+    Raises:
+        ValueError: If fragments have extra bytes dimensions of the same name but of different types
+    """
+    headers = []
+    for fragment in fragments:
+        with laspy.open(str(fragment)) as in_las:
+            headers.append(in_las.header)
+    header = merged_header(headers[0], headers, headers[0].offsets)
+    if bounds is None:
+        bounds = (np.min([h.mins for h in headers], axis=0), np.max([h.maxs for h in headers], axis=0))
+
+    point_count = 0
+    with contextlib.ExitStack() as stack:
+        if is_copc(output_file):
+            write = stack.enter_context(CopcWriter(output_file, header, threads)).write_points
+        else:
+            index = None
+            if config.lax_index:
+                index = stack.enter_context(LaxIndex(lax_path(output_file), *bounds))
+            laz_backend = laz_write_backend(threads) if output_file.suffix == ".laz" else None
+            out_las = stack.enter_context(
+                laspy.open(str(output_file), mode="w", header=header, laz_backend=laz_backend)
+            )
+
+            def write(points: laspy.ScaleAwarePointRecord) -> None:
+                out_las.write_points(points)
+                if index is not None:
+                    index.add(points.x, points.y)
+
+        for fragment, fragment_header in zip(fragments, headers, strict=True):
+            if not same_point_format(fragment_header.point_format, header.point_format):
+                logger.debug(f"Converting {fragment.name} to point format {header.point_format.id}")
+            with laspy.open(str(fragment)) as in_las:
+                for points in in_las.chunk_iterator(MergeConstants.READ_POINTS):
+                    write(match_header(points, header))
+                    point_count += len(points)
+
+    for fragment in fragments:
+        fragment.unlink()
+    logger.debug(f"Merged {len(fragments)} fragment(s) into {output_file}: {point_count} points")
+    return point_count
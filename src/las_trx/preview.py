@@ -0,0 +1,123 @@
+"""Previews of a run, transforming a sample of each input before committing to the whole batch.
+
+A preview transforms a stratified random sample of the chunks of each input with the same
+per-file configs, filters and transformers as the run, so that a wrong epoch or vertical datum
+shows up in seconds rather than after the run. Each input is split into equal strata of chunks,
+and one chunk is drawn from each, so the sample covers the whole file whichever order its points
+are in. The report of each input gives:
+
+* the bounds of the transformed points
+* percentiles of the Z shift, the transformed minus the original Z
+* the number of points transformed to NaN, and to infinity, which PROJ returns for points
+  outside the extent of a grid
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from las_trx.constants import PreviewConstants
+
+
+@dataclass(frozen=True)
+class PreviewReport:
+    """Outcome of transforming a sample of one input."""
+
+    input_file: Path
+    point_count: int
+    sampled_points: int
+    kept_points: int
+    mins: np.ndarray | None
+    maxs: np.ndarray | None
+    z_shift: dict[int, float]
+    nan_count: int
+    out_of_grid_count: int
+
+    @property
+    def failed_count(self) -> int:
+        """Get the number of sampled points that did not transform to finite coordinates."""
+        return self.nan_count + self.out_of_grid_count
+
+    def describe(self) -> str:
+        """Format the report for people, one line per statistic."""
+        lines = [f"{self.input_file.name}: sampled {self.sampled_points} of {self.point_count} points"]
+        if self.kept_points != self.sampled_points:
+            lines[0] += f", {self.kept_points} kept by the filters"
+        if self.mins is not None:
+            lines.append(
+                "  bounds: "
+                + ", ".join(f"{axis} {low:.3f} to {high:.3f}" for axis, low, high in zip("xyz", self.mins, self.maxs))
+            )
+        if self.z_shift:
+            lines.append("  Z shift: " + ", ".join(f"p{p} {shift:+.3f}" for p, shift in self.z_shift.items()))
+        lines.append(f"  NaN: {self.nan_count}, out of grid: {self.out_of_grid_count}")
+        return "\n".join(lines)
+
+
+def sample_chunks(point_count: int, chunk_size: int, samples: int, rng: np.random.Generator) -> list[tuple[int, int]]:
+    """Draw one chunk at random from each of equal strata of the chunks of an input.
+
+    Args:
+        point_count: Number of points of the input
+        chunk_size: Number of points in each chunk
+        samples: Number of strata, and of chunks drawn; every chunk is drawn if the input has fewer
+        rng: Random generator drawing the chunks
+
+    Returns:
+        Sorted intervals of the first and last point index of the drawn chunks
+    """
+    num_chunks = -(-point_count // chunk_size)
+    if num_chunks <= samples:
+        chunks = np.arange(num_chunks)
+    else:
+        edges = np.linspace(0, num_chunks, samples + 1).astype(np.int64)
+        chunks = rng.integers(edges[:-1], edges[1:])
+    return [(int(i) * chunk_size, min((int(i) + 1) * chunk_size, point_count) - 1) for i in chunks]
+
+
+def preview_report(
+    input_file: Path,
+    point_count: int,
+    sampled_points: int,
+    coords: list[np.ndarray],
+    transformed: list[np.ndarray],
+) -> PreviewReport:
+    """Summarize the transformed sample of an input.
+
+    Args:
+        input_file: Input file path
+        point_count: Number of points of the input
+        sampled_points: Number of points read from the sampled chunks, before filtering
+        coords: Arrays of shape (N, 3) of the original coordinates of the points kept by the filters
+        transformed: Arrays of shape (N, 3) of their transformed coordinates
+
+    Returns:
+        Report of the sample
+    """
+    coords = np.concatenate(coords) if coords else np.empty((0, 3))
+    transformed = np.concatenate(transformed) if transformed else np.empty((0, 3))
+
+    nan = np.isnan(transformed).any(axis=1)
+    finite = np.isfinite(transformed).all(axis=1)
+    mins = maxs = None
+    z_shift = {}
+    if finite.any():
+        mins = transformed[finite].min(axis=0)
+        maxs = transformed[finite].max(axis=0)
+        shifts = transformed[finite, 2] - coords[finite, 2]
+        z_shift = dict(
+            zip(PreviewConstants.Z_SHIFT_PERCENTILES, np.percentile(shifts, PreviewConstants.Z_SHIFT_PERCENTILES))
+        )
+
+    return PreviewReport(
+        input_file=input_file,
+        point_count=point_count,
+        sampled_points=sampled_points,
+        kept_points=len(transformed),
+        mins=mins,
+        maxs=maxs,
+        z_shift={p: float(shift) for p, shift in z_shift.items()},
+        nan_count=int(np.count_nonzero(nan)),
+        out_of_grid_count=int(np.count_nonzero(~nan & ~finite)),
+    )
@@ -0,0 +1,259 @@
+"""Output sorted along a space-filling curve.
+
+Points are keyed by the cell they fall in on a grid of 2**CURVE_BITS cells per axis over the
+transformed XY bounds of a file, with cells numbered along a Morton (Z-order) or Hilbert curve.
+Neighbouring points then share LAZ chunks, which compress better and let bounding-box queries skip
+most of the file. Points in the same cell keep their input order. Only LAS inputs are sorted;
+coordinate tables keep the order of their rows.
+
+Files of up to ``SortConstants.RUN_POINTS`` points are sorted in memory. Larger files are sorted in
+runs of that many points, spilled to temporary .npy files and merged back a block at a time, so
+memory stays bounded by the run size whatever the size of the file.
+"""
+
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+from types import TracebackType
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from las_trx.config import TransformConfig, TrxSortOrder
+from las_trx.constants import SortConstants
+from las_trx.tiling import tile_root
+
+if TYPE_CHECKING:
+    from laspy import LasHeader
+
+
+def uses_spatial_sort(config: TransformConfig) -> bool:
+    """Check whether a config reorders points along a space-filling curve."""
+    return config.sort_order != TrxSortOrder.NONE
+
+
+def estimate_sort_memory(header: "LasHeader", num_outputs: int) -> int:
+    """Estimate the memory used to sort the points of one file for all of its outputs."""
+    run_points = min(header.point_count, SortConstants.RUN_POINTS)
+    # Buffered records of each output and their keys, and the reordered copy made when a run is sorted
+    return 2 * run_points * (num_outputs * header.point_format.size + SortConstants.KEY_BYTES)
+
+
+def estimate_sort_spill(point_count: int, row_bytes: int) -> int:
+    """Estimate the size of the runs spilled to disk while sorting the points of one file.
+
+    Args:
+        point_count: Number of points sorted
+        row_bytes: Bytes of the columns given with each point
+
+    Returns:
+        Bytes of all runs, which are kept until the file is written
+    """
+    if point_count < SortConstants.RUN_POINTS:
+        return 0
+    return point_count * (row_bytes + SortConstants.KEY_BYTES)
+
+
+def sort_scratch_dir(config: TransformConfig, output_file: Path) -> Path:
+    """Get the directory in which the runs of an output are spilled, next to the output or its tiles."""
+    return output_file.parent if config.tiling is None else tile_root(output_file)
+
+
+def curve_keys(
+    order: TrxSortOrder,
+    xy: np.ndarray,
+    mins: np.ndarray,
+    maxs: np.ndarray,
+    bits: int = SortConstants.CURVE_BITS,
+) -> np.ndarray:
+    """Get the position of each point along a space-filling curve.
+
+    Args:
+        order: Curve to follow
+        xy: Array of shape (N, 2) with the X and Y coordinates of the points
+        mins: Lower X and Y bounds of the grid
+        maxs: Upper X and Y bounds of the grid; points outside the bounds fall in the edge cells
+        bits: Grid cells per axis, as a power of two
+
+    Returns:
+        Array of N unsigned integers below 4**bits
+    """
+    mins = np.asarray(mins[:2], dtype=np.float64)
+    span = np.asarray(maxs[:2], dtype=np.float64) - mins
+    span[span <= 0] = 1.0
+
+    side = (1 << bits) - 1
+    cells = np.clip(np.rint((np.asarray(xy, dtype=np.float64) - mins) / span * side), 0, side).astype(np.uint64)
+    if order == TrxSortOrder.HILBERT:
+        return _hilbert_keys(cells[:, 0], cells[:, 1], bits)
+    return _spread_bits(cells[:, 0]) | (_spread_bits(cells[:, 1]) << np.uint64(1))
+
+
+def _spread_bits(values: np.ndarray) -> np.ndarray:
+    """Insert a zero bit above each bit of 16-bit values, for Morton interleaving."""
+    values = values & np.uint64(0xFFFF)
+    values = (values | (values << np.uint64(8))) & np.uint64(0x00FF00FF)
+    values = (values | (values << np.uint64(4))) & np.uint64(0x0F0F0F0F)
+    values = (values | (values << np.uint64(2))) & np.uint64(0x33333333)
+    return (values | (values << np.uint64(1))) & np.uint64(0x55555555)
+
+
+def _hilbert_keys(x: np.ndarray, y: np.ndarray, bits: int) -> np.ndarray:
+    """Map grid cells to their distance along a Hilbert curve, one bit of each axis at a time."""
+    x = x.astype(np.int32)
+    y = y.astype(np.int32)
+    keys = np.zeros(len(x), dtype=np.uint64)
+    last = np.int32((1 << bits) - 1)
+
+    for level in range(bits - 1, -1, -1):
+        s = np.int32(1 << level)
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        keys += np.uint64(s * s) * ((3 * rx.astype(np.uint64)) ^ ry.astype(np.uint64))
+
+        # Rotate the quadrant so that the curve enters and leaves it at the right corners
+        flip = rx & ~ry
+        x = np.where(flip, last - x, x)
+        y = np.where(flip, last - y, y)
+        swap = ~ry
+        x, y = np.where(swap, y, x), np.where(swap, x, y)
+    return keys
+
+
+class PointSorter:
+    """Collects the columns of a file's points and gives them back in curve order.
+
+    Columns are arrays with one row per point, such as point records or coordinates, and are
+    reordered together. Runs that do not fit in memory are written to a temporary directory,
+    removed when the sorter is closed.
+    """
+
+    def __init__(
+        self,
+        order: TrxSortOrder,
+        mins: np.ndarray,
+        maxs: np.ndarray,
+        scratch_dir: Path,
+        run_points: int = SortConstants.RUN_POINTS,
+    ) -> None:
+        """Initialize the sorter.
+
+        Args:
+            order: Curve to follow
+            mins: Lower X and Y bounds of the points
+            maxs: Upper X and Y bounds of the points
+            scratch_dir: Directory in which runs are spilled
+            run_points: Points sorted in memory at a time
+        """
+        self.order = order
+        self.mins = mins
+        self.maxs = maxs
+        self.scratch_dir = scratch_dir
+        self.run_points = run_points
+        self._keys: list[np.ndarray] = []
+        self._columns: list[list[np.ndarray]] = []
+        self._buffered = 0
+        self._seen = 0
+        self._runs: list[list[Path]] = []
+        self._tmp: tempfile.TemporaryDirectory | None = None
+
+    def __enter__(self) -> "PointSorter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        if self._tmp is not None:
+            self._tmp.cleanup()
+
+    def add(self, xy: np.ndarray, columns: list[np.ndarray]) -> None:
+        """Add a chunk of points.
+
+        Args:
+            xy: Array of shape (N, 2) with the coordinates the points are sorted by
+            columns: Arrays with one row per point, given back in the same order
+        """
+        # The input position breaks ties, so the order is the same whether or not runs were spilled
+        positions = np.arange(self._seen, self._seen + len(xy), dtype=np.uint64)
+        self._keys.append((curve_keys(self.order, xy, self.mins, self.maxs) << np.uint64(32)) | positions)
+        self._columns.append(columns)
+        self._buffered += len(xy)
+        self._seen += len(xy)
+        if self._buffered >= self.run_points:
+            self._spill()
+
+    def sorted_chunks(self, chunk_size: int) -> Iterator[list[np.ndarray]]:
+        """Get the columns of all points added, in curve order.
+
+        Args:
+            chunk_size: Number of points in each chunk
+
+        Yields:
+            Columns of each chunk, in the order they were added
+        """
+        if not self._runs:
+            keys, columns = self._take_buffer()
+            order = np.argsort(keys)
+            for start in range(0, len(order), chunk_size):
+                indices = order[start : start + chunk_size]
+                yield [column[indices] for column in columns]
+            return
+
+        if self._buffered:
+            self._spill()
+        yield from self._merge_runs(chunk_size)
+
+    def _take_buffer(self) -> tuple[np.ndarray, list[np.ndarray]]:
+        keys = np.concatenate(self._keys) if self._keys else np.empty(0, dtype=np.uint64)
+        columns = [np.concatenate(parts) for parts in zip(*self._columns)]
+        self._keys, self._columns, self._buffered = [], [], 0
+        return keys, columns
+
+    def _spill(self) -> None:
+        """Sort the buffered points and write them to disk as a run."""
+        if self._tmp is None:
+            self._tmp = tempfile.TemporaryDirectory(dir=self.scratch_dir, prefix=".las-trx-sort-")
+        keys, columns = self._take_buffer()
+        order = np.argsort(keys)
+
+        run = len(self._runs)
+        paths = [Path(self._tmp.name) / f"run{run}_keys.npy"]
+        np.save(paths[0], keys[order])
+        for i, column in enumerate(columns):
+            paths.append(Path(self._tmp.name) / f"run{run}_column{i}.npy")
+            np.save(paths[-1], column[order])
+        self._runs.append(paths)
+
+    def _merge_runs(self, chunk_size: int) -> Iterator[list[np.ndarray]]:
+        """Merge the sorted runs, reading a block of each at a time."""
+        runs = [[np.load(path, mmap_mode="r") for path in paths] for paths in self._runs]
+        block = max(chunk_size, self.run_points // len(runs))
+        positions = [0] * len(runs)
+        buffers: list[list[np.ndarray] | None] = [None] * len(runs)
+
+        while True:
+            for i, run in enumerate(runs):
+                if buffers[i] is None and positions[i] < len(run[0]):
+                    buffers[i] = [np.asarray(array[positions[i] : positions[i] + block]) for array in run]
+                    positions[i] += block
+            active = [i for i, buffer in enumerate(buffers) if buffer is not None]
+            if not active:
+                return
+
+            # Points up to the smallest last key of the blocks are known to precede all unread points
+            threshold = min(buffers[i][0][-1] for i in active)
+            parts = []
+            for i in active:
+                count = int(np.searchsorted(buffers[i][0], threshold, side="right"))
+                parts.append([array[:count] for array in buffers[i]])
+                remaining = [array[count:] for array in buffers[i]]
+                buffers[i] = remaining if len(remaining[0]) else None
+
+            keys, *columns = (np.concatenate(arrays) for arrays in zip(*parts))
+            order = np.argsort(keys)
+            for start in range(0, len(order), chunk_size):
+                indices = order[start : start + chunk_size]
+                yield [column[indices] for column in columns]
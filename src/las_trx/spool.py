@@ -0,0 +1,426 @@
+"""File-based work queue that lets worker processes on several nodes share one batch.
+
+The spool is a directory on a filesystem shared by all nodes::
+
+    configs/<config_hash>.json  Transform configs referenced by jobs
+    pending/<job_id>.json       Jobs waiting for a worker
+    claimed/<job_id>.json       Jobs leased by a worker, kept alive by touching the file
+    done/<job_id>.json          Finished jobs, with the worker that ran them
+    failed/<job_id>.json        Failed jobs, with the error
+    workers/<worker_id>         Last heartbeat of each worker
+
+Jobs are claimed by renaming them from ``pending`` to ``claimed``, which only one worker can win.
+Workers touch their claimed jobs while they run. A job whose file has not been touched for longer
+than the lease is moved back to ``pending`` by any worker, so jobs of a crashed node are picked up
+again. Jobs run at least once: outputs are written under a temporary name and renamed into place,
+so a job that runs twice never leaves a partial output behind.
+"""
+
+import contextlib
+import hashlib
+import multiprocessing
+import os
+import socket
+import threading
+import time
+import zlib
+from collections import deque
+from concurrent import futures
+from pathlib import Path
+from types import TracebackType
+
+from loguru import logger
+from pydantic import BaseModel
+
+from las_trx.columnar import is_columnar, parquet_copy_path
+from las_trx.config import TransformConfig, TrxExecutor
+from las_trx.constants import SpoolConstants
+from las_trx.executor import create_executor, create_progress_tracker, resolve_executor_backend
+from las_trx.file_operations import discover_files, output_suffix, target_output_files
+from las_trx.lax import lax_path
+from las_trx.transformation import transform_file
+
+SPOOL_STATES = ("pending", "claimed", "done", "failed")
+
+
+class SpoolError(Exception):
+    """Exception for spool operations."""
+
+    pass
+
+
+class SpoolJob(BaseModel):
+    """Descriptor of a single file transformation in the spool."""
+
+    job_id: str
+    input_file: Path
+    output_file: Path
+    config_hash: str
+    worker: str | None = None
+    error: str | None = None
+
+
+def config_hash(config: TransformConfig) -> str:
+    """Get a short content hash identifying a transform config."""
+    return hashlib.sha256(config.model_dump_json().encode()).hexdigest()[: SpoolConstants.HASH_LENGTH]
+
+
+def default_worker_id() -> str:
+    """Get an identifier for this worker process that is unique across nodes."""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    """Write a file under a temporary name and rename it into place."""
+    tmp = path.with_name(f".{path.name}.{default_worker_id()}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    tmp.replace(path)
+
+
+class FileSpool:
+    """Shared directory of transformation jobs."""
+
+    def __init__(self, root: Path) -> None:
+        """Open a spool, creating its directories if needed.
+
+        Args:
+            root: Spool directory on a filesystem shared by all workers
+        """
+        self.root = root
+        for name in (*SPOOL_STATES, "configs", "workers"):
+            (root / name).mkdir(parents=True, exist_ok=True)
+        self._configs: dict[str, TransformConfig] = {}
+        self._candidates: deque[Path] = deque()
+
+    def _path(self, state: str, job_id: str) -> Path:
+        return self.root / state / f"{job_id}.json"
+
+    def submit(self, config: TransformConfig, input_pattern: str, output_pattern: str) -> int:
+        """Plan a batch into the spool.
+
+        Jobs are identified by their input, output and config, so submitting the same batch again
+        only adds the jobs that are not in the spool yet.
+
+        Args:
+            config: Transformation configuration for the batch
+            input_pattern: Input file pattern (supports wildcards)
+            output_pattern: Output file pattern (supports {} formatting)
+
+        Returns:
+            Number of jobs added
+
+        Raises:
+            SpoolError: If the config writes tiled or merged outputs, which are written after a whole batch, or
+                detects the origin of each file, which is resolved for a whole batch
+        """
+        if config.merges_inputs():
+            raise SpoolError("Tiled and merged outputs cannot be spooled, as they are written after a whole batch")
+        if config.detect_origin:
+            raise SpoolError("Origins cannot be detected in spooled batches, set the origin in the config")
+        input_files, output_files = discover_files(input_pattern, output_pattern, config)
+        digest = config_hash(config)
+        config_path = self.root / "configs" / f"{digest}.json"
+        if not config_path.exists():
+            _write_atomic(config_path, config.model_dump_json(indent=2))
+
+        added = 0
+        for input_file, output_file in zip(input_files, output_files):
+            key = f"{input_file.resolve()}\0{output_file.resolve()}\0{digest}"
+            job_id = hashlib.sha256(key.encode()).hexdigest()[: SpoolConstants.HASH_LENGTH]
+            if any(self._path(state, job_id).exists() for state in SPOOL_STATES):
+                continue
+
+            job = SpoolJob(
+                job_id=job_id, input_file=input_file.resolve(), output_file=output_file.resolve(), config_hash=digest
+            )
+            _write_atomic(self._path("pending", job_id), job.model_dump_json())
+            added += 1
+
+        logger.info(f"Submitted {added} new job(s) to {self.root} ({len(input_files) - added} already spooled)")
+        return added
+
+    def load_config(self, digest: str) -> TransformConfig:
+        """Load a config referenced by a job, caching it for later jobs."""
+        if digest not in self._configs:
+            path = self.root / "configs" / f"{digest}.json"
+            try:
+                self._configs[digest] = TransformConfig.model_validate_json(path.read_text(encoding="utf-8"))
+            except OSError as e:
+                raise SpoolError(f"Config {digest} is missing from the spool: {e}") from e
+        return self._configs[digest]
+
+    def claim(self, worker_id: str) -> SpoolJob | None:
+        """Atomically lease the next pending job.
+
+        Args:
+            worker_id: Identifier of the claiming worker
+
+        Returns:
+            The claimed job, or None if no job is pending
+        """
+        if not self._candidates:
+            pending = sorted((self.root / "pending").glob("*.json"))
+            # Start each worker at a different place in the queue to avoid racing for the same jobs
+            if pending:
+                offset = zlib.crc32(worker_id.encode()) % len(pending)
+                self._candidates.extend(pending[offset:] + pending[:offset])
+
+        while self._candidates:
+            pending_path = self._candidates.popleft()
+            claimed_path = self.root / "claimed" / pending_path.name
+            try:
+                # Start the lease before the rename, which keeps the modification time from when the job
+                # was submitted, so that other workers never see the claimed job with an expired lease
+                os.utime(pending_path)
+                pending_path.rename(claimed_path)
+                job = SpoolJob.model_validate_json(claimed_path.read_text(encoding="utf-8"))
+            except FileNotFoundError:
+                continue  # Claimed by another worker
+            logger.debug(f"{worker_id} claimed job {job.job_id} ({job.input_file})")
+            return job
+
+        return None
+
+    def heartbeat(self, worker_id: str, job_ids: list[str]) -> float:
+        """Renew the leases of running jobs and record the worker as alive.
+
+        Args:
+            worker_id: Identifier of the worker
+            job_ids: Jobs currently run by the worker
+
+        Returns:
+            Current time according to the shared filesystem
+        """
+        for job_id in job_ids:
+            try:
+                os.utime(self._path("claimed", job_id))
+            except FileNotFoundError:
+                logger.warning(f"Lease on job {job_id} was lost, it may run twice")
+        return self.shared_time(worker_id)
+
+    def shared_time(self, worker_id: str) -> float:
+        """Get the current time as seen by the shared filesystem.
+
+        Lease ages are measured against this rather than the local clock, so that clock skew
+        between nodes cannot expire leases early.
+        """
+        marker = self.root / "workers" / worker_id
+        marker.touch()
+        return marker.stat().st_mtime
+
+    def requeue_expired(self, worker_id: str, lease: float) -> int:
+        """Move jobs whose lease has expired back to pending.
+
+        Args:
+            worker_id: Identifier of the worker doing the check
+            lease: Lease duration in seconds
+
+        Returns:
+            Number of jobs requeued
+        """
+        now = self.shared_time(worker_id)
+        requeued = 0
+        for claimed_path in (self.root / "claimed").glob("*.json"):
+            with contextlib.suppress(FileNotFoundError):
+                if now - claimed_path.stat().st_mtime > lease:
+                    claimed_path.rename(self.root / "pending" / claimed_path.name)
+                    logger.warning(f"Lease on job {claimed_path.stem} expired, requeued it")
+                    requeued += 1
+        return requeued
+
+    def finish(self, job: SpoolJob, worker_id: str, error: Exception | None = None) -> None:
+        """Record the result of a job and release its lease."""
+        state = "failed" if error else "done"
+        result = job.model_copy(update={"worker": worker_id, "error": str(error) if error else None})
+        _write_atomic(self._path(state, job.job_id), result.model_dump_json())
+        self._path("claimed", job.job_id).unlink(missing_ok=True)
+
+    def requeue_failed(self) -> int:
+        """Move failed jobs back to pending.
+
+        Returns:
+            Number of jobs requeued
+        """
+        requeued = 0
+        for failed_path in (self.root / "failed").glob("*.json"):
+            job = SpoolJob.model_validate_json(failed_path.read_text(encoding="utf-8"))
+            _write_atomic(self._path("pending", job.job_id), job.model_copy(update={"error": None}).model_dump_json())
+            failed_path.unlink(missing_ok=True)
+            requeued += 1
+        return requeued
+
+    def counts(self) -> dict[str, int]:
+        """Count the jobs in each state."""
+        return {state: sum(1 for _ in (self.root / state).glob("*.json")) for state in SPOOL_STATES}
+
+    def is_drained(self) -> bool:
+        """Check if no job is pending or running anywhere."""
+        counts = self.counts()
+        return counts["pending"] == 0 and counts["claimed"] == 0
+
+
+def run_spooled_job(
+    config: TransformConfig, job: SpoolJob, lock: multiprocessing.RLock, current_iter: multiprocessing.Value
+) -> None:
+    """Transform one spooled file, writing its outputs atomically.
+
+    Args:
+        config: Transformation configuration of the job
+        job: Job to run
+        lock: Lock for progress tracking
+        current_iter: Shared counter for progress tracking
+    """
+    output_file = job.output_file
+    final_files = [output_file, *target_output_files(config, job.input_file)]
+    parquet_file = parquet_copy_path(config, output_file)
+    if parquet_file is not None:
+        final_files.append(parquet_file)
+    partial_files = [_partial_path(f, job.job_id) for f in final_files]
+
+    try:
+        transform_file(
+            config,
+            job.input_file,
+            partial_files[0],
+            lock,
+            current_iter,
+            parquet_file=partial_files[-1] if parquet_file is not None else None,
+            target_files=partial_files[1 : 1 + len(config.targets)],
+        )
+        # Spatial indexes are renamed first and the main output last, so it only appears once the
+        # other outputs are in place
+        sidecars = [
+            (lax_path(partial_file), lax_path(final_file))
+            for partial_file, final_file in zip(partial_files, final_files)
+            if not is_columnar(final_file) and lax_path(partial_file).exists()
+        ]
+        for partial_file, final_file in [*sidecars, *reversed(list(zip(partial_files, final_files)))]:
+            partial_file.replace(final_file)
+    finally:
+        for partial_file in partial_files:
+            partial_file.unlink(missing_ok=True)
+            lax_path(partial_file).unlink(missing_ok=True)
+
+
+def _partial_path(output_file: Path, job_id: str) -> Path:
+    # Keep the extension last, it selects the output format
+    suffix = output_suffix(output_file)
+    stem = output_file.name.removesuffix(suffix)
+    return output_file.with_name(f"{stem}.{job_id}{SpoolConstants.PARTIAL_SUFFIX}{suffix}")
+
+
+class SpoolWorker:
+    """Runs jobs from a spool on a local pool until the spool is drained.
+
+    Each job is transformed with its own config. Pool settings (executor, worker count) come from
+    the worker, as they depend on the node rather than the batch.
+    """
+
+    def __init__(
+        self,
+        spool: FileSpool,
+        max_workers: int,
+        lease: float = SpoolConstants.LEASE_SECONDS,
+        poll_interval: float = SpoolConstants.POLL_INTERVAL,
+        executor: TrxExecutor = TrxExecutor.AUTO,
+        worker_id: str | None = None,
+    ) -> None:
+        """Initialize the worker.
+
+        Args:
+            spool: Spool to take jobs from
+            max_workers: Number of jobs to run at once on this node
+            lease: Seconds without a heartbeat after which a job is given to another worker
+            poll_interval: Seconds between checks for new or expired jobs while idle
+            executor: Executor backend of the local pool
+            worker_id: Identifier of this worker, unique across nodes
+        """
+        self.spool = spool
+        self.max_workers = max_workers
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self.backend = resolve_executor_backend(executor)
+        self.worker_id = worker_id or default_worker_id()
+        self.in_flight: dict[futures.Future, SpoolJob] = {}
+        # Guards in_flight, which the heartbeat thread reads while run() adds and removes jobs
+        self._in_flight_lock = threading.Lock()
+
+        self._stop_heartbeat = threading.Event()
+        self._heartbeat = threading.Thread(target=self._beat, name="las-trx-spool-heartbeat", daemon=True)
+
+    def __enter__(self) -> "SpoolWorker":
+        self._heartbeat.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self._stop_heartbeat.set()
+        self._heartbeat.join()
+
+    def _beat(self) -> None:
+        while not self._stop_heartbeat.wait(self.lease / SpoolConstants.HEARTBEATS_PER_LEASE):
+            with self._in_flight_lock:
+                job_ids = [job.job_id for job in self.in_flight.values()]
+            try:
+                self.spool.heartbeat(self.worker_id, job_ids)
+            except Exception as e:
+                # A failed beat must not end the thread, or every lease would expire
+                logger.warning(f"Heartbeat failed: {e}")
+
+    def run(self) -> tuple[int, int]:
+        """Run jobs until no job is pending or leased by any worker.
+
+        Returns:
+            Tuple of (succeeded, failed) job counts for this worker
+        """
+        logger.info(f"Spool worker {self.worker_id} running up to {self.max_workers} job(s) from {self.spool.root}")
+        manager, lock, current_iter = create_progress_tracker(self.backend)
+        succeeded = failed = 0
+
+        try:
+            with create_executor(self.backend, self.max_workers) as pool:
+                while True:
+                    self.spool.requeue_expired(self.worker_id, self.lease)
+                    while len(self.in_flight) < self.max_workers and (job := self.spool.claim(self.worker_id)):
+                        try:
+                            config = self.spool.load_config(job.config_hash)
+                        except SpoolError as e:
+                            logger.error(str(e))
+                            self.spool.finish(job, self.worker_id, e)
+                            failed += 1
+                            continue
+                        future = pool.submit(run_spooled_job, config, job, lock, current_iter)
+                        with self._in_flight_lock:
+                            self.in_flight[future] = job
+
+                    if not self.in_flight:
+                        # Wait for jobs still leased by other workers, in case their leases expire
+                        if self.spool.is_drained():
+                            break
+                        time.sleep(self.poll_interval)
+                        continue
+
+                    done, _ = futures.wait(
+                        self.in_flight, timeout=self.poll_interval, return_when=futures.FIRST_COMPLETED
+                    )
+                    for future in done:
+                        with self._in_flight_lock:
+                            job = self.in_flight.pop(future)
+                        exception = future.exception()
+                        self.spool.finish(job, self.worker_id, exception)
+                        if exception:
+                            failed += 1
+                            logger.error(f"Error transforming {job.input_file}: {exception}")
+                        else:
+                            succeeded += 1
+                            logger.info(f"{job.input_file} -> {job.output_file}")
+        finally:
+            if manager is not None:
+                manager.shutdown()
+
+        logger.info(f"Spool drained: {succeeded} job(s) succeeded, {failed} failed on {self.worker_id}")
+        return succeeded, failed
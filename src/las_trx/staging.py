@@ -0,0 +1,248 @@
+"""Staging of network-storage inputs and outputs through a local scratch directory."""
+
+import contextlib
+import queue
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from types import TracebackType
+
+from loguru import logger
+
+from las_trx.config import StagingConfig
+from las_trx.constants import StagingConstants
+from las_trx.file_operations import output_suffix
+from las_trx.lax import lax_path
+
+
+class StagingError(Exception):
+    """Exception for failures while staging files."""
+
+    pass
+
+
+class ScratchStager:
+    """Prefetches inputs to local scratch and moves finished outputs to their destination in the background.
+
+    A copier thread stays up to ``prefetch`` files ahead of the jobs handed to workers, copying each input
+    with large sequential reads. Outputs, and the extra outputs of a job such as Parquet copies and additional
+    targets, are written to scratch and moved to their destination by a mover thread. Scratch use is capped:
+    each job reserves its input size once for the input copy and once for each local output, until its
+    outputs have been moved. The scratch directory is removed on exit, whether or not the run failed.
+    """
+
+    def __init__(
+        self, config: StagingConfig, jobs: list[tuple[Path, Path]], extra_outputs: dict[Path, list[Path]] | None = None
+    ) -> None:
+        """Initialize the stager.
+
+        Args:
+            config: Staging configuration
+            jobs: (input_file, output_file) pairs, in the order they will be submitted
+            extra_outputs: Optional other outputs written by the job of each input file
+        """
+        self.prefetch = max(1, config.prefetch)
+        self.cap = config.cap_mb * 1024**2
+        self.jobs = jobs
+        self.scratch_dir = Path(tempfile.mkdtemp(prefix="las-trx-", dir=config.scratch_dir))
+
+        self._extra_outputs = {input_file: (extra_outputs or {}).get(input_file, []) for input_file, _ in jobs}
+        self._input_sizes = {input_file: input_file.stat().st_size for input_file, _ in jobs}
+        self._output_sizes = {
+            input_file: (1 + len(self._extra_outputs[input_file])) * self._input_sizes[input_file]
+            for input_file, _ in jobs
+        }
+        self._local_paths = {
+            input_file: (
+                self.scratch_dir / f"{i}_in{input_file.suffix}",
+                self.scratch_dir / f"{i}_out{output_suffix(output_file)}",
+            )
+            for i, (input_file, output_file) in enumerate(jobs)
+        }
+        self._local_extras = {
+            extra_file: self.scratch_dir / f"{i}_out{j}{output_suffix(extra_file)}"
+            for i, (input_file, _) in enumerate(jobs)
+            for j, extra_file in enumerate(self._extra_outputs[input_file], start=1)
+        }
+
+        self._cond = threading.Condition()
+        self._used = 0
+        self._claimed = 0
+        self._staged: set[Path] = set()
+        self._copy_errors: dict[Path, Exception] = {}
+        self._moves: queue.Queue[tuple[Path, Path] | None] = queue.Queue()
+        self._moves_pending = 0
+        self._moved: list[tuple[Path, Path, Exception | None]] = []
+        self._closed = False
+
+        self._copier = threading.Thread(target=self._copy_inputs, name="las-trx-stage-in", daemon=True)
+        self._mover = threading.Thread(target=self._move_outputs, name="las-trx-stage-out", daemon=True)
+
+    def __enter__(self) -> "ScratchStager":
+        logger.info(f"Staging through {self.scratch_dir} (prefetch {self.prefetch}, cap {self.cap / 1024**2:.0f} MB)")
+        self._copier.start()
+        self._mover.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._moves.put(None)
+        self._copier.join()
+        self._mover.join()
+
+        shutil.rmtree(self.scratch_dir, ignore_errors=True)
+        logger.debug(f"Removed scratch directory {self.scratch_dir}")
+
+    @property
+    def moves_pending(self) -> bool:
+        """Check if outputs are still waiting to be moved to their destination."""
+        with self._cond:
+            return self._moves_pending > 0
+
+    def is_ready(self, input_file: Path) -> bool:
+        """Check if an input has been staged.
+
+        Raises:
+            StagingError: If staging the input failed
+        """
+        with self._cond:
+            if input_file in self._copy_errors:
+                raise StagingError(f"Failed to stage {input_file}: {self._copy_errors[input_file]}")
+            return input_file in self._staged
+
+    def claim(self, input_file: Path) -> tuple[Path, Path]:
+        """Hand a staged job to a worker, letting the copier prefetch the next input.
+
+        Args:
+            input_file: A staged input file
+
+        Returns:
+            Local (input_file, output_file) paths for the worker to use
+        """
+        with self._cond:
+            self._claimed += 1
+            self._cond.notify_all()
+        return self._local_paths[input_file]
+
+    def local_output(self, extra_file: Path) -> Path:
+        """Get the local path a worker writes an extra output of a claimed job to."""
+        return self._local_extras[extra_file]
+
+    def finish(self, input_file: Path, output_file: Path, success: bool) -> None:
+        """Release a finished job's staged input and queue its local outputs for moving.
+
+        Args:
+            input_file: Original input file
+            output_file: Final destination of the output
+            success: Whether the transformation succeeded; the outputs of failed jobs are discarded
+        """
+        local_input, local_output = self._local_paths[input_file]
+        local_input.unlink(missing_ok=True)
+
+        if not success:
+            for local_file in [local_output, *map(self.local_output, self._extra_outputs[input_file])]:
+                local_file.unlink(missing_ok=True)
+                lax_path(local_file).unlink(missing_ok=True)
+            self._release(self._input_sizes[input_file] + self._output_sizes[input_file])
+            return
+
+        self._release(self._input_sizes[input_file])
+        with self._cond:
+            self._moves_pending += 1
+        self._moves.put((input_file, output_file))
+
+    def completed_moves(self) -> list[tuple[Path, Path, Exception | None]]:
+        """Get the jobs whose outputs reached their destination since the last call."""
+        with self._cond:
+            moved, self._moved = self._moved, []
+        return moved
+
+    def wait(self, timeout: float) -> None:
+        """Wait until a copy or move finishes, or the timeout expires."""
+        with self._cond:
+            self._cond.wait(timeout)
+
+    def _release(self, size: int) -> None:
+        with self._cond:
+            self._used -= size
+            self._cond.notify_all()
+
+    def _can_stage(self, index: int, size: int) -> bool:
+        within_prefetch = index < self._claimed + len(self._copy_errors) + self.prefetch
+        return within_prefetch and (self._used == 0 or self._used + size <= self.cap)
+
+    def _copy_inputs(self) -> None:
+        for i, (input_file, _) in enumerate(self.jobs):
+            size = self._input_sizes[input_file] + self._output_sizes[input_file]
+            with self._cond:
+                # Stay at most `prefetch` jobs ahead of those handed out or failed, and within the cap
+                # unless the scratch directory is empty
+                self._cond.wait_for(lambda i=i, size=size: self._closed or self._can_stage(i, size))
+                if self._closed:
+                    return
+                self._used += size
+
+            local_input, _ = self._local_paths[input_file]
+            try:
+                with input_file.open("rb") as src, local_input.open("wb") as dst:
+                    shutil.copyfileobj(src, dst, StagingConstants.COPY_BUFFER_SIZE)
+                logger.debug(f"Staged {input_file} -> {local_input}")
+            except OSError as e:
+                logger.error(f"Failed to stage {input_file}: {e}")
+                local_input.unlink(missing_ok=True)
+                with self._cond:
+                    self._copy_errors[input_file] = e
+                    self._used -= size
+                    self._cond.notify_all()
+                continue
+
+            with self._cond:
+                self._staged.add(input_file)
+                self._cond.notify_all()
+
+    def _move_outputs(self) -> None:
+        while (job := self._moves.get()) is not None:
+            input_file, output_file = job
+            _, local_output = self._local_paths[input_file]
+
+            # Each spatial index goes before its output, and the main output goes last, so outputs
+            # only appear once their index, and the main output once every other output, is in place
+            outputs = [(self.local_output(f), f) for f in self._extra_outputs[input_file]]
+            outputs.append((local_output, output_file))
+            moves = []
+            for local_file, final_file in outputs:
+                if lax_path(local_file).exists():
+                    moves.append((lax_path(local_file), lax_path(final_file)))
+                moves.append((local_file, final_file))
+
+            exception = None
+            for local_file, final_file in moves:
+                partial_file = final_file.with_name(final_file.name + StagingConstants.PARTIAL_SUFFIX)
+                try:
+                    if exception is None:
+                        # Copy under a temporary name so a failed move never leaves a truncated output behind
+                        with local_file.open("rb") as src, partial_file.open("wb") as dst:
+                            shutil.copyfileobj(src, dst, StagingConstants.COPY_BUFFER_SIZE)
+                        partial_file.replace(final_file)
+                        logger.debug(f"Moved {local_file} -> {final_file}")
+                except OSError as e:
+                    logger.error(f"Failed to move {local_file} to {final_file}: {e}")
+                    with contextlib.suppress(OSError):
+                        partial_file.unlink(missing_ok=True)
+                    exception = StagingError(f"Failed to move output to {final_file}: {e}")
+                finally:
+                    local_file.unlink(missing_ok=True)
+
+            with self._cond:
+                self._used -= self._output_sizes[input_file]
+                self._moves_pending -= 1
+                self._moved.append((input_file, output_file, exception))
+                self._cond.notify_all()
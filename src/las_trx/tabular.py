@@ -0,0 +1,299 @@
+"""Transformation of coordinate tables in delimited text and NumPy files.
+
+Text files (.csv, .txt, .xyz) are streamed line by line and written back with only the X, Y and Z
+fields replaced, so extra columns, comment lines starting with ``#`` and blank lines are kept.
+Fields are split on the configured delimiter, or on commas for .csv and runs of whitespace
+otherwise. .npy files are memory-mapped on both sides; .npz archives are loaded whole, as zip
+members cannot be memory-mapped, and written back with their other arrays.
+
+The X, Y and Z columns are set in ``TransformConfig.tabular``, as column indices or, for text
+files with a header row and structured arrays, as column names.
+"""
+
+import contextlib
+import itertools
+import zipfile
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from las_trx.config import TabularConfig, TransformConfig, TrxCoordType
+from las_trx.constants import MemoryConstants, TabularConstants
+
+if TYPE_CHECKING:
+    from csrspy import CSRSTransformer
+
+# Config, path and transformer of an output table
+TableOutput = tuple[TransformConfig, Path, "CSRSTransformer"]
+
+
+def is_tabular(path: Path) -> bool:
+    """Check whether a file holds a coordinate table rather than LAS data."""
+    return path.suffix.lower() in TabularConstants.TEXT_SUFFIXES + TabularConstants.ARRAY_SUFFIXES
+
+
+def count_rows(path: Path, config: TabularConfig) -> int:
+    """Count the rows of a coordinate table without reading its values.
+
+    Comment and blank lines of text files are counted, as they take part in chunking.
+
+    Args:
+        path: Path of the table
+        config: Column mapping of the table
+
+    Returns:
+        Number of rows, excluding any header row
+    """
+    suffix = path.suffix.lower()
+    if suffix == ".npy":
+        return len(np.load(path, mmap_mode="r"))
+
+    if suffix == ".npz":
+        with zipfile.ZipFile(path) as archive, archive.open(f"{_array_key(archive, config)}.npy") as member:
+            version = np.lib.format.read_magic(member)
+            if version == (1, 0):
+                shape, _, _ = np.lib.format.read_array_header_1_0(member)
+            else:
+                shape, _, _ = np.lib.format.read_array_header_2_0(member)
+        return shape[0] if shape else 0
+
+    lines = 0
+    last = b"\n"
+    with path.open("rb") as f:
+        while block := f.read(TabularConstants.COUNT_BUFFER_SIZE):
+            lines += block.count(b"\n")
+            last = block[-1:]
+    if last != b"\n":
+        lines += 1
+    return max(0, lines - 1) if config.header else lines
+
+
+def estimate_table_memory(path: Path, chunk_size: int, num_outputs: int = 1) -> int:
+    """Estimate the peak memory needed to transform one coordinate table to all of its outputs."""
+    per_row = MemoryConstants.TRANSFORM_BYTES_PER_POINT
+    if path.suffix.lower() in TabularConstants.TEXT_SUFFIXES:
+        per_row += TabularConstants.TEXT_BYTES_PER_ROW
+    table_bytes = chunk_size * per_row
+
+    # Archives are held in memory as read and as written to each output
+    if path.suffix.lower() == ".npz":
+        table_bytes += (1 + num_outputs) * path.stat().st_size
+    return table_bytes
+
+
+def transform_table(
+    config: TransformConfig,
+    input_file: Path,
+    output_file: Path,
+    transformer: "CSRSTransformer",
+    chunk_size: int,
+    targets: Sequence[TableOutput] = (),
+) -> Iterator[int]:
+    """Transform a coordinate table into a table of the same format.
+
+    Args:
+        config: Transformation configuration
+        input_file: Input table path
+        output_file: Output table path, with the same suffix as the input
+        transformer: Transformer to apply to the X, Y and Z columns
+        chunk_size: Number of rows transformed at a time
+        targets: Config, output path and transformer of each additional output, written from the same read
+
+    Yields:
+        Number of rows in each chunk once it is transformed for every output
+
+    Raises:
+        ValueError: If an output format differs from the input or the columns are not found
+    """
+    outputs = [(config, output_file, transformer), *targets]
+    suffix = input_file.suffix.lower()
+    for _, path, _ in outputs:
+        if path.suffix.lower() != suffix:
+            raise ValueError(f"Output of {input_file.name} must also be a {suffix} file, got {path.name}")
+
+    if suffix == ".npy":
+        yield from _transform_npy(outputs, input_file, chunk_size)
+    elif suffix == ".npz":
+        yield from _transform_npz(outputs, input_file, chunk_size)
+    else:
+        yield from _transform_text(outputs, input_file, chunk_size)
+
+
+def _transform_text(outputs: list[TableOutput], input_file: Path, chunk_size: int) -> Iterator[int]:
+    tabular = outputs[0][0].tabular
+    delimiter = tabular.delimiter
+    if delimiter is None and input_file.suffix.lower() == ".csv":
+        delimiter = ","
+    joiner = delimiter if delimiter is not None else " "
+
+    # newline="" keeps the line endings of the input in the outputs
+    with contextlib.ExitStack() as stack:
+        src = stack.enter_context(input_file.open(newline=""))
+        dsts = [stack.enter_context(path.open("w", newline="")) for _, path, _ in outputs]
+        names = None
+        if tabular.header:
+            header_line = src.readline()
+            for dst in dsts:
+                dst.write(header_line)
+            names = [name.strip() for name in header_line.rstrip("\r\n").split(delimiter)]
+        columns = [_text_column(c, names) for c in (tabular.x_column, tabular.y_column, tabular.z_column)]
+
+        # Lines are parsed once, and their coordinates transformed once per distinct transformer
+        while lines := list(itertools.islice(src, chunk_size)):
+            stripped = [line.rstrip("\r\n") for line in lines]
+            data = [
+                i
+                for i, line in enumerate(stripped)
+                if line.strip() and not line.lstrip().startswith(TabularConstants.COMMENT_PREFIX)
+            ]
+            rows = [stripped[i].split(delimiter) for i in data]
+            coords = np.array([float(row[c]) for row in rows for c in columns]).reshape(-1, 3)
+
+            transformed = {}
+            for (out_config, _, transformer), dst in zip(outputs, dsts, strict=True):
+                if not data:
+                    dst.writelines(lines)
+                    continue
+                key = id(transformer)
+                if key not in transformed:
+                    transformed[key] = np.array(list(transformer(coords)))
+                values = [
+                    [fmt % v for v in transformed[key][:, k].tolist()]
+                    for k, fmt in enumerate(_text_formats(out_config))
+                ]
+
+                # Rows are updated in place, as every output replaces the same fields
+                out_lines = list(lines)
+                x_column, y_column, z_column = columns
+                for i, row, x, y, z in zip(data, rows, *values):
+                    row[x_column] = x
+                    row[y_column] = y
+                    row[z_column] = z
+                    out_lines[i] = joiner.join(row) + lines[i][len(stripped[i]) :]
+                dst.writelines(out_lines)
+            yield len(lines)
+
+
+def _text_formats(config: TransformConfig) -> list[str]:
+    """Get the formats of the X, Y and Z fields written in the destination of a config."""
+    geographic = config.destination.coord_type == TrxCoordType.GEOG
+    xy_decimals = TabularConstants.GEOGRAPHIC_DECIMALS if geographic else TabularConstants.LINEAR_DECIMALS
+    return [f"%.{xy_decimals}f", f"%.{xy_decimals}f", f"%.{TabularConstants.LINEAR_DECIMALS}f"]
+
+
+def _text_column(column: int | str, names: list[str] | None) -> int:
+    if isinstance(column, int):
+        return column
+    if names is None:
+        raise ValueError(f"Column {column!r} is given by name, which needs a header row")
+    if column not in names:
+        raise ValueError(f"Column {column!r} not found in header {names}")
+    return names.index(column)
+
+
+def _transform_npy(outputs: list[TableOutput], input_file: Path, chunk_size: int) -> Iterator[int]:
+    array = np.load(input_file, mmap_mode="r")
+    columns = _array_columns(array, outputs[0][0].tabular)
+    dtype = _output_dtype(array, columns)
+    outs = [np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=array.shape) for _, path, _ in outputs]
+    try:
+        for start in range(0, len(array), chunk_size):
+            chunk = np.array(array[start : start + chunk_size], dtype=dtype)
+            coords = _read_coords(chunk, columns)
+            transformed = {}
+            for (_, _, transformer), out in zip(outputs, outs, strict=True):
+                key = id(transformer)
+                if key not in transformed:
+                    transformed[key] = np.array(list(transformer(coords)))
+                # Every output replaces the same columns, so the chunk is reused for all of them
+                _write_coords(chunk, columns, transformed[key])
+                out[start : start + len(chunk)] = chunk
+            yield len(chunk)
+        for out in outs:
+            out.flush()
+    finally:
+        del outs
+
+
+def _transform_npz(outputs: list[TableOutput], input_file: Path, chunk_size: int) -> Iterator[int]:
+    tabular = outputs[0][0].tabular
+    with zipfile.ZipFile(input_file) as archive:
+        key = _array_key(archive, tabular)
+        compressed = any(info.compress_type != zipfile.ZIP_STORED for info in archive.infolist())
+    with np.load(input_file) as npz:
+        arrays = {name: npz[name] for name in npz.files}
+
+    array = arrays[key]
+    columns = _array_columns(array, tabular)
+    outs = [np.array(array, dtype=_output_dtype(array, columns)) for _ in outputs]
+    for start in range(0, len(array), chunk_size):
+        coords = _read_coords(outs[0][start : start + chunk_size], columns)
+        transformed = {}
+        for (_, _, transformer), out in zip(outputs, outs, strict=True):
+            transformer_key = id(transformer)
+            if transformer_key not in transformed:
+                transformed[transformer_key] = np.array(list(transformer(coords)))
+            _write_coords(out[start : start + chunk_size], columns, transformed[transformer_key])
+        yield len(coords)
+
+    # Writing to an open file stops NumPy from appending its own suffix
+    save = np.savez_compressed if compressed else np.savez
+    for (_, path, _), out in zip(outputs, outs, strict=True):
+        with path.open("wb") as f:
+            save(f, **{**arrays, key: out})
+
+
+def _array_key(archive: zipfile.ZipFile, config: TabularConfig) -> str:
+    keys = [name.removesuffix(".npy") for name in archive.namelist()]
+    if config.array_key is None:
+        if not keys:
+            raise ValueError(f"{archive.filename} holds no arrays")
+        return keys[0]
+    if config.array_key not in keys:
+        raise ValueError(f"Array {config.array_key!r} not found in {archive.filename}, which holds {keys}")
+    return config.array_key
+
+
+def _array_columns(array: np.ndarray, config: TabularConfig) -> list[int | str]:
+    """Resolve the X, Y and Z columns to indices of a 2D array or field names of a structured array."""
+    columns = [config.x_column, config.y_column, config.z_column]
+    names = array.dtype.names
+    if names is not None:
+        resolved = [names[c] if isinstance(c, int) else c for c in columns]
+        missing = [c for c in resolved if c not in names]
+        if missing:
+            raise ValueError(f"Fields {missing} not found in array fields {list(names)}")
+        return resolved
+
+    if array.ndim != 2:
+        raise ValueError(f"Expected a 2D array or a structured array, got shape {array.shape}")
+    if any(isinstance(c, str) for c in columns):
+        raise ValueError("Columns can only be given by name for structured arrays")
+    return columns
+
+
+def _output_dtype(array: np.ndarray, columns: list[int | str]) -> np.dtype:
+    if array.dtype.names is None:
+        return np.promote_types(array.dtype, np.float64)
+    for name in columns:
+        if array.dtype[name].kind != "f":
+            raise ValueError(f"Field {name!r} must be a floating point field to hold transformed coordinates")
+    return array.dtype
+
+
+def _read_coords(chunk: np.ndarray, columns: list[int | str]) -> np.ndarray:
+    """Get the X, Y and Z columns of a chunk as an array of shape (N, 3)."""
+    if chunk.dtype.names is not None:
+        return np.stack([chunk[c].astype(np.float64) for c in columns], axis=1)
+    return chunk[:, columns].astype(np.float64)
+
+
+def _write_coords(chunk: np.ndarray, columns: list[int | str], coords: np.ndarray) -> None:
+    """Set the X, Y and Z columns of a chunk in place."""
+    for k, c in enumerate(columns):
+        if chunk.dtype.names is not None:
+            chunk[c] = coords[:, k]
+        else:
+            chunk[:, c] = coords[:, k]
@@ -0,0 +1,145 @@
+"""I/O bandwidth limiting and scheduling priority for workers sharing a workstation."""
+
+import ctypes
+import ctypes.util
+import multiprocessing
+import os
+import platform
+import sys
+import threading
+import time
+
+from loguru import logger
+
+from las_trx.constants import ThrottleConstants
+
+
+class IoThrottle:
+    """Token bucket limiting the combined read and write bandwidth of all workers.
+
+    The bucket is kept as a single "next free" timestamp shared between workers: each request
+    pushes it forward by the time its bytes take at the current rate, and a worker only sleeps
+    once it is more than the burst allowance ahead of the clock. The rate is read on every
+    request, so changing it takes effect for all workers immediately. The throttle pickles
+    with its shared values, so it can be passed to process and thread workers alike.
+    """
+
+    def __init__(
+        self,
+        lock: multiprocessing.RLock,
+        rate: multiprocessing.Value,
+        next_free: multiprocessing.Value,
+        burst: float = ThrottleConstants.BURST_SECONDS,
+    ) -> None:
+        """Initialize the throttle.
+
+        Args:
+            lock: Lock shared by all workers
+            rate: Shared limit in MB/s, 0 for unlimited
+            next_free: Shared monotonic time at which the bucket is empty
+            burst: Seconds of traffic at the current rate that may pass without waiting
+        """
+        self.lock = lock
+        self.rate = rate
+        self.next_free = next_free
+        self.burst = burst
+
+    def set_rate(self, mb_per_second: float | None) -> None:
+        """Change the limit, applying to every worker from its next request.
+
+        Args:
+            mb_per_second: New limit in MB/s, or None/0 for unlimited
+        """
+        with self.lock:
+            self.rate.value = mb_per_second or 0.0
+            # Drop reservations made at the previous rate
+            self.next_free.value = time.monotonic()
+        logger.info(f"I/O limit set to {f'{mb_per_second:g} MB/s' if mb_per_second else 'unlimited'}")
+
+    def consume(self, num_bytes: int) -> None:
+        """Wait until the given number of bytes may be read or written.
+
+        Args:
+            num_bytes: Number of bytes about to be transferred
+        """
+        rate = self.rate.value
+        if rate <= 0 or num_bytes <= 0:
+            return
+
+        with self.lock:
+            now = time.monotonic()
+            start = max(self.next_free.value, now)
+            self.next_free.value = start + num_bytes / (rate * 1024**2)
+            delay = self.next_free.value - now - self.burst
+
+        if delay > 0:
+            time.sleep(delay)
+
+
+def lower_priority() -> None:
+    """Lower the CPU and I/O scheduling priority of the calling worker.
+
+    Process workers lower their whole process. Thread workers only lower their own thread
+    where the platform allows it, so the GUI thread keeps its normal priority.
+    """
+    whole_process = threading.current_thread() is threading.main_thread()
+    try:
+        if sys.platform == "win32":
+            _lower_priority_windows(whole_process)
+            return
+
+        # On Linux, the nice value and I/O priority are per thread
+        if whole_process or sys.platform == "linux":
+            os.nice(ThrottleConstants.NICE_INCREMENT)
+        if sys.platform == "linux":
+            _lower_io_priority_linux()
+        elif sys.platform == "darwin":
+            _lower_io_priority_darwin(whole_process)
+    except OSError as e:
+        logger.warning(f"Could not lower worker priority: {e}")
+        return
+
+    logger.debug(f"Lowered scheduling priority of worker {os.getpid()}")
+
+
+def _lower_priority_windows(whole_process: bool) -> None:
+    """Enter background mode, which lowers CPU, I/O and memory priority."""
+    kernel32 = ctypes.windll.kernel32
+    if whole_process:
+        kernel32.GetCurrentProcess.restype = ctypes.c_void_p
+        ok = kernel32.SetPriorityClass(
+            ctypes.c_void_p(kernel32.GetCurrentProcess()), ThrottleConstants.PROCESS_MODE_BACKGROUND_BEGIN
+        )
+    else:
+        kernel32.GetCurrentThread.restype = ctypes.c_void_p
+        ok = kernel32.SetThreadPriority(
+            ctypes.c_void_p(kernel32.GetCurrentThread()), ThrottleConstants.THREAD_MODE_BACKGROUND_BEGIN
+        )
+    if not ok:
+        raise ctypes.WinError()
+
+
+def _lower_io_priority_linux() -> None:
+    """Move the calling thread to the lowest best-effort I/O priority.
+
+    The idle class is avoided because it can starve the run entirely under constant foreground I/O.
+    """
+    syscall_number = ThrottleConstants.LINUX_IOPRIO_SET_SYSCALLS.get(platform.machine())
+    if syscall_number is None:
+        logger.debug(f"I/O priority is not supported on {platform.machine()}")
+        return
+
+    libc = ctypes.CDLL(None, use_errno=True)
+    ioprio = (ThrottleConstants.IOPRIO_CLASS_BE << ThrottleConstants.IOPRIO_CLASS_SHIFT) | 7
+    if libc.syscall(syscall_number, ThrottleConstants.IOPRIO_WHO_PROCESS, 0, ioprio) != 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, os.strerror(errno))
+
+
+def _lower_io_priority_darwin(whole_process: bool) -> None:
+    """Throttle disk I/O of the calling process or thread."""
+    libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    scope = ThrottleConstants.IOPOL_SCOPE_PROCESS if whole_process else ThrottleConstants.IOPOL_SCOPE_THREAD
+    if libc.setiopolicy_np(ThrottleConstants.IOPOL_TYPE_DISK, scope, ThrottleConstants.IOPOL_THROTTLE) != 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, os.strerror(errno))
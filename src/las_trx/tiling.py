@@ -0,0 +1,163 @@
+"""Outputs retiled on write into fixed-size tiles of the destination grid.
+
+With tiling configured, the output pattern names tiles by the lower-left corner of each tile in
+destination units, e.g. ``tiles/{x}_{y}.laz`` for 1 km tiles named like ``tiles/512000_5434000.laz``,
+rather than by the input stem. Each worker routes its transformed chunks by tile into uncompressed
+fragment files next to the tiles, one per tile and input. At most ``TilingConfig.max_open`` of them
+are kept open: the least recently used is closed when another is needed, and appended to if its
+tile comes up again.
+
+Tiles are usually fed by several inputs, transformed by different workers. Once every input is
+transformed, the fragments of each tile are merged into the tile in the worker pool, as in merged
+outputs, and written as LAS, LAZ or COPC by the suffix of the pattern, with a LAX index if the
+config asks for one. Fragments of inputs that failed are removed rather than merged.
+"""
+
+import copy
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from types import TracebackType
+
+import laspy
+import numpy as np
+from laspy import LasHeader
+from laspy.lasappender import LasAppender
+from loguru import logger
+
+from las_trx.config import TilingConfig, TransformConfig
+from las_trx.merge import fragment_path, merge_fragments
+
+
+@dataclass(frozen=True)
+class TileFragment:
+    """Points of one input written to one tile, waiting to be merged."""
+
+    tile_file: Path
+    key: tuple[int, int]
+    path: Path
+
+
+def tile_path(pattern: Path, size: float, key: tuple[int, int]) -> Path:
+    """Name a tile from the output pattern and the lower-left corner of the tile.
+
+    Corners are formatted as integers when they are whole, so patterns may use integer format
+    specs such as ``{x:07d}``.
+    """
+    corner = [int(v) if float(v).is_integer() else v for v in (key[0] * size, key[1] * size)]
+    return Path(str(pattern).format(x=corner[0], y=corner[1]))
+
+
+def tile_root(pattern: Path) -> Path:
+    """Get the deepest directory of an output pattern that does not depend on the tile."""
+    return next(parent for parent in pattern.parents if "{" not in str(parent))
+
+
+def tile_bounds(size: float, key: tuple[int, int]) -> tuple[np.ndarray, np.ndarray]:
+    """Get the lower and upper X and Y bounds of a tile."""
+    mins = np.array(key, dtype=np.float64) * size
+    return mins, mins + size
+
+
+class TileRouter:
+    """Routes the transformed points of one input and output into fragment files by tile."""
+
+    def __init__(self, pattern: Path, header: LasHeader, tiling: TilingConfig, input_id: str) -> None:
+        """Initialize the router.
+
+        Args:
+            pattern: Output pattern, with {x} and {y} placeholders for the tile corner
+            header: Header of the transformed points, with their CRS VLRs, scales and offsets
+            tiling: Tile size and number of fragment writers kept open
+            input_id: Identifier of the input, naming its fragments
+        """
+        self.pattern = pattern
+        self.header = header
+        self.tiling = tiling
+        self.input_id = input_id
+        self._open: OrderedDict[tuple[int, int], laspy.LasWriter | LasAppender] = OrderedDict()
+        self._fragments: dict[tuple[int, int], TileFragment] = {}
+        self._reopened = 0
+
+    def __enter__(self) -> "TileRouter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        while self._open:
+            self._open.popitem(last=False)[1].close()
+        if exc_type is not None:
+            for fragment in self._fragments.values():
+                fragment.path.unlink(missing_ok=True)
+            return
+        logger.debug(f"Wrote {len(self._fragments)} tile fragment(s) for {self.pattern}, reopened {self._reopened}")
+
+    @property
+    def fragments(self) -> list[TileFragment]:
+        """Get the fragments written so far."""
+        return list(self._fragments.values())
+
+    def write_points(self, points: laspy.ScaleAwarePointRecord) -> None:
+        """Write a chunk of transformed points to the fragments of their tiles.
+
+        Points keep their order within each tile.
+        """
+        tiles = np.floor(np.column_stack((points.x, points.y)) / self.tiling.size).astype(np.int64)
+        keys, inverse = np.unique(tiles, axis=0, return_inverse=True)
+        order = np.argsort(inverse.ravel(), kind="stable")
+        starts = np.searchsorted(inverse.ravel()[order], np.arange(len(keys) + 1))
+
+        for i, key in enumerate(map(tuple, keys.tolist())):
+            writer = self._writer(key)
+            tile_points = points[order[starts[i] : starts[i + 1]]]
+            if isinstance(writer, LasAppender):
+                writer.append_points(tile_points)
+            else:
+                writer.write_points(tile_points)
+
+    def _writer(self, key: tuple[int, int]) -> laspy.LasWriter | LasAppender:
+        """Get the open writer of a tile's fragment, evicting the least recently used if too many are open."""
+        if key in self._open:
+            self._open.move_to_end(key)
+            return self._open[key]
+        if len(self._open) >= self.tiling.max_open:
+            self._open.popitem(last=False)[1].close()
+
+        if key in self._fragments:
+            writer = laspy.open(str(self._fragments[key].path), mode="a")
+            self._reopened += 1
+        else:
+            tile_file = tile_path(self.pattern, self.tiling.size, key)
+            path = fragment_path(tile_file, self.input_id)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            writer = laspy.open(str(path), mode="w", header=copy.deepcopy(self.header))
+            self._fragments[key] = TileFragment(tile_file, key, path)
+        self._open[key] = writer
+        return writer
+
+
+def merge_tile(config: TransformConfig, tile_file: Path, key: tuple[int, int], fragments: list[Path]) -> int:
+    """Merge the fragments of a tile, written from any number of inputs, into the tile.
+
+    Args:
+        config: Transformation configuration of the output
+        tile_file: Tile path
+        key: Tile indices along X and Y
+        fragments: Fragment files of the tile
+
+    Returns:
+        Number of points in the tile
+    """
+    # A single uncompressed fragment is already the tile
+    if len(fragments) == 1 and tile_file.suffix.lower() == ".las" and not config.lax_index:
+        with laspy.open(str(fragments[0])) as in_las:
+            point_count = in_las.header.point_count
+        fragments[0].replace(tile_file)
+        return point_count
+
+    bounds = tile_bounds(config.tiling.size, key)
+    return merge_fragments(config, tile_file, fragments, bounds, config.threads_per_worker or 1)
@@ -2,12 +2,20 @@
 
 import contextlib
 import copy
+import itertools
 import math
 import multiprocessing
 import os
+import tempfile
+import threading
+import time
+from collections import Counter, OrderedDict, deque
 from collections.abc import Callable, Iterator
 from concurrent import futures
+from dataclasses import dataclass
+from multiprocessing.managers import SyncManager
 from pathlib import Path
+from typing import BinaryIO
 
 import laspy
 import numpy as np
@@ -16,12 +24,52 @@ from laspy import LasHeader
 from laspy.vlrs.known import WktCoordinateSystemVlr
 from loguru import logger
 from pyproj import CRS
+from pyproj.exceptions import CRSError
 
-from las_trx.config import TransformConfig
-from las_trx.constants import ProcessingConstants
-from las_trx.file_operations import ensure_output_extension, validate_file_paths
+from las_trx.autoscale import WorkerAutoscaler
+from las_trx.columnar import ColumnarWriter, is_columnar, parquet_copy_path
+from las_trx.config import ReferenceConfig, TransformConfig, TrxFilterFrame, TrxSpaceCheck
+from las_trx.constants import EstimateConstants, PreviewConstants, ProcessingConstants, StagingConstants
+from las_trx.copc import CopcWriter, copc_header, estimate_copc_memory, estimate_copc_spill, is_copc, spill_path
+from las_trx.epochs import check_gps_time, split_by_epoch, uses_gps_time_epochs
+from las_trx.estimate import RunEstimate, disk_estimates
+from las_trx.executor import (
+    create_executor,
+    create_progress_tracker,
+    create_shared_value,
+    plan_worker_layout,
+    resolve_executor_backend,
+)
+from las_trx.file_operations import discover_files, target_output_files, validate_file_paths
+from las_trx.filters import (
+    check_filters,
+    indexed_intervals,
+    read_chunks,
+    source_mask,
+    spatial_mask,
+    uses_spatial_filter,
+)
+from las_trx.governor import MemoryGovernor, estimate_task_memory, peak_rss_bytes
+from las_trx.lax import LaxIndex, lax_path
+from las_trx.manifest import Manifest
+from las_trx.merge import FragmentWriter, discard_merge, fragment_id, fragment_path, merge_fragments, merged_header
+from las_trx.preview import PreviewReport, preview_report, sample_chunks
+from las_trx.sorting import (
+    PointSorter,
+    estimate_sort_memory,
+    estimate_sort_spill,
+    sort_scratch_dir,
+    uses_spatial_sort,
+)
+from las_trx.staging import ScratchStager, StagingError
+from las_trx.tabular import count_rows, estimate_table_memory, is_tabular, transform_table
+from las_trx.throttle import IoThrottle
+from las_trx.tiling import TileFragment, TileRouter, merge_tile
 from las_trx.vlr import TrxGeoAsciiParamsVlr, TrxGeoKeyDirectoryVlr
 
+# Per-thread cache of transformers, see get_transformer
+_transformer_cache = threading.local()
+
 
 class TransformationError(Exception):
     """Base exception for transformation operations."""
@@ -29,54 +77,277 @@ class TransformationError(Exception):
     pass
 
 
+@dataclass(frozen=True)
+class TransformStats:
+    """Resource usage reported by a worker after transforming a file."""
+
+    pid: int
+    peak_rss: int | None
+    fragments: tuple[TileFragment, ...] = ()
+
+
 class TransformationManager:
     """Manages coordinate transformation operations without threading concerns."""
 
-    def __init__(self, config: TransformConfig, input_pattern: str, output_pattern: str) -> None:
+    def __init__(
+        self, config: TransformConfig, input_pattern: str | None, output_pattern: str, manifest: Path | None = None
+    ) -> None:
+        """Initialize the manager.
+
+        Args:
+            config: Transformation configuration
+            input_pattern: Input file pattern (supports wildcards), unused with a manifest
+            output_pattern: Output file pattern (supports {} formatting with the input stem, or {x} and {y}
+                with the tile corner for tiled outputs)
+            manifest: Optional manifest listing the input files and their per-file overrides
+        """
         self.config = config
-        self.input_pattern = Path(input_pattern)
+        self.input_pattern = Path(input_pattern) if input_pattern is not None else None
         self.output_pattern = output_pattern
 
-        # Discover input files
-        self.input_files = [f for f in self.input_pattern.parent.glob(self.input_pattern.name) if f.is_file()]
-        self.output_files = [ensure_output_extension(Path(output_pattern.format(f.stem))) for f in self.input_files]
-
-        # Validate file paths
-        validate_file_paths(self.input_files, self.output_files)
+        # Discover and validate input and output files
+        self.manifest = Manifest.read(manifest) if manifest is not None else None
+        if self.manifest is not None:
+            self.input_files, self.output_files = self.manifest.files(output_pattern, config)
+        else:
+            self.input_files, self.output_files = discover_files(input_pattern, output_pattern, config)
+        self.target_files = {input_file: target_output_files(config, input_file) for input_file in self.input_files}
+        if self.manifest is not None:
+            all_outputs = [*self.output_files, *itertools.chain(*self.target_files.values())]
+            validate_file_paths(self.input_files, list(dict.fromkeys(all_outputs)) if config.merge else all_outputs)
+        if config.tiling is not None:
+            self._check_tiling()
+        if config.merge:
+            self._check_merge()
 
         # Calculate processing parameters
+        self.point_counts, self.record_sizes, self.task_memory, self.input_crs = self._scan_input_headers()
         self.total_iterations = self._calculate_total_iterations()
-        self.num_workers = min(config.max_workers, os.cpu_count() or 1)
+        self.governor = MemoryGovernor(config.memory_budget_mb)
+        self.num_workers = self.governor.max_workers(
+            min(config.max_workers, os.cpu_count() or 1), min(self.task_memory.values(), default=0)
+        )
+        self.backend = resolve_executor_backend(config.executor)
+        self.layout = plan_worker_layout(self.num_workers, config.threads_per_worker, config.pin_workers)
+        self.worker_config = config.model_copy(update={"threads_per_worker": self.layout.threads_per_worker})
+        self.file_configs = self._resolve_file_configs()
+        self.merge_header = self._merged_header() if config.merge and self.input_files else None
+        self.worker_peak_rss: dict[int, int] = {}
+        self._cancel_requested = threading.Event()
+        self._results: dict[Path, str | None] = {}
+        self._fragments: dict[Path, tuple[TileFragment, ...]] = {}
+        self.failed_merges: dict[Path, Exception] = {}
 
         # Progress tracking
         self.manager, self.lock, self.current_iter = self.create_progress_tracker()
+        self.cpu_time = create_shared_value(self.manager, "d", 0.0)
+        self.autoscaler = WorkerAutoscaler(self.num_workers) if config.autoscale else None
+        self.throttle = IoThrottle(
+            self.lock,
+            create_shared_value(self.manager, "d", config.io_limit_mb_s or 0.0),
+            create_shared_value(self.manager, "d", 0.0),
+        )
 
         # Logging
         logger.info(f"Found {len(self.input_files)} input files")
         logger.info(f"Transform config: {self.config}")
         logger.info(f"Input CRS\\n{self.config.origin.crs.to_wkt(pretty=True)}")
         logger.info(f"Output CRS\\n{self.config.destination.crs.to_wkt(pretty=True)}")
+        for target in config.targets:
+            logger.info(f"Additional target {target.output}\\n{target.destination.crs.to_wkt(pretty=True)}")
         logger.info(f"Total iterations until complete: {self.total_iterations}")
-        logger.info(f"CPU process pool size: {self.num_workers}")
+        logger.info(f"Worker pool size: {self.num_workers} ({self.backend.value} executor)")
+        logger.info(f"Worker layout: {self.layout.describe()}")
+        if self.autoscaler is not None:
+            logger.info(f"Autoscaling from {self.autoscaler.target} up to {self.num_workers} worker(s)")
+        if config.memory_budget_mb is not None:
+            logger.info(f"Memory budget: {config.memory_budget_mb} MB")
+        if config.io_limit_mb_s:
+            logger.info(f"I/O limit: {config.io_limit_mb_s:g} MB/s")
+        if config.low_priority:
+            logger.info("Workers run at low CPU and I/O priority")
+        if uses_gps_time_epochs(config):
+            logger.info(f"Origin epochs from GPS time in {config.epoch_resolution_days}-day buckets")
+        if config.tiling is not None:
+            logger.info(f"Retiling into {config.tiling.size:g} unit tiles, {config.tiling.max_open} open per worker")
+        if self.merge_header is not None:
+            logger.info(
+                f"Merging into {self.output_files[0]} with point format {self.merge_header.point_format.id}, "
+                f"offsets {self.merge_header.offsets}"
+            )
+
+    def _check_tiling(self) -> None:
+        """Check that the options of a tiled run can be combined with tiling.
+
+        Raises:
+            TransformationError: If the run stages files, writes Parquet copies or writes coordinate tables
+        """
+        if self.config.staging is not None:
+            raise TransformationError("Tiled outputs cannot be staged, as each tile is written from several inputs")
+        if self.config.parquet_copy:
+            raise TransformationError("Parquet copies are not supported with tiled outputs")
+        outputs = [*self.output_files, *itertools.chain(*self.target_files.values())]
+        if any(is_columnar(f) for f in outputs) or any(is_tabular(f) for f in self.input_files):
+            raise TransformationError("Tiled outputs are written from LAS inputs to LAS, LAZ or COPC files only")
+
+    def _check_merge(self) -> None:
+        """Check that the options of a merged run can be combined with merging.
+
+        Raises:
+            TransformationError: If the run is also tiled, stages files, writes Parquet copies or additional
+                targets, or writes coordinate tables
+        """
+        if self.config.tiling is not None:
+            raise TransformationError("Outputs cannot be both tiled and merged")
+        if self.config.staging is not None:
+            raise TransformationError("Merged outputs cannot be staged, as they are written from several inputs")
+        if self.config.parquet_copy or self.config.targets:
+            raise TransformationError("Parquet copies and additional targets are not supported with merged outputs")
+        if any(is_columnar(f) for f in self.output_files) or any(is_tabular(f) for f in self.input_files):
+            raise TransformationError("Merged outputs are written from LAS inputs to LAS, LAZ or COPC files only")
+
+    def _merged_header(self, input_files: list[Path] | None = None) -> LasHeader:
+        """Reconcile the headers of all inputs into the header of the merged output.
+
+        Args:
+            input_files: Inputs to reconcile, all inputs by default
+
+        Raises:
+            TransformationError: If the inputs have different destinations or extra bytes dimensions that conflict
+        """
+        destinations = {config.destination.model_dump_json() for config in self.file_configs.values()}
+        if len(destinations) > 1:
+            raise TransformationError(f"Merged inputs must share a destination, they have {len(destinations)}")
+
+        headers = []
+        mins = []
+        transformers = {}
+        for input_file in self.input_files if input_files is None else input_files:
+            config = self.file_configs[input_file]
+            transformer = transformers.setdefault(config.model_dump_json(), get_transformer(config))
+            with laspy.open(str(input_file)) as las_file:
+                headers.append(las_file.header)
+            mins.append(transform_header_bounds(headers[-1], transformer)[0])
+
+        base = clear_header_geokeys(copy.deepcopy(headers[0]))
+        base = write_header_scales(write_header_geokeys_from_crs(base, self.config.destination.crs))
+        try:
+            return merged_header(base, headers, np.min(mins, axis=0))
+        except ValueError as e:
+            raise TransformationError(f"Cannot merge the inputs: {e}") from e
+
+    def _scan_input_headers(
+        self,
+    ) -> tuple[dict[Path, int], dict[Path, int], dict[Path, int], dict[Path, CRS | Exception | None]]:
+        """Read each input header once for point counts, record sizes, task memory and, if detecting, CRS."""
+        logger.info("Scanning input file headers")
+        point_counts = {}
+        record_sizes = {}
+        task_memory = {}
+        input_crs = {}
+        for input_file, output_file in zip(self.input_files, self.output_files, strict=True):
+            if is_tabular(input_file):
+                point_counts[input_file] = count_rows(input_file, self.config.tabular)
+                task_memory[input_file] = estimate_table_memory(
+                    input_file, ProcessingConstants.DEFAULT_CHUNK_SIZE, 1 + len(self.config.targets)
+                )
+            else:
+                with laspy.open(str(input_file)) as las_file:
+                    point_counts[input_file] = las_file.header.point_count
+                    record_sizes[input_file] = las_file.header.point_format.size
+                    task_memory[input_file] = estimate_task_memory(
+                        las_file.header, input_file.stat().st_size, ProcessingConstants.DEFAULT_CHUNK_SIZE
+                    )
+                    if uses_spatial_sort(self.config):
+                        task_memory[input_file] += estimate_sort_memory(las_file.header, 1 + len(self.config.targets))
+                    # Tiled and merged COPC outputs are built once the inputs are merged, not by the workers
+                    copc_outputs = [path for path in [output_file, *self.target_files[input_file]] if is_copc(path)]
+                    if self.config.merges_inputs():
+                        copc_outputs = []
+                    task_memory[input_file] += len(copc_outputs) * estimate_copc_memory(
+                        las_file.header, self.config.threads_per_worker or 1
+                    )
+                    if self.config.detect_origin:
+                        try:
+                            input_crs[input_file] = las_file.header.parse_crs()
+                        except CRSError as e:
+                            input_crs[input_file] = e
+            logger.debug(
+                f"{input_file.name}: {point_counts[input_file]} points, "
+                f"~{task_memory[input_file] / 1024**2:.0f} MB estimated peak memory"
+            )
+        return point_counts, record_sizes, task_memory, input_crs
+
+    def _resolve_file_configs(self) -> dict[Path, TransformConfig]:
+        """Get the config of each file, with the origin detected from its CRS VLRs if enabled.
+
+        Raises:
+            TransformationError: If the origin of any file cannot be detected, before any file is transformed
+        """
+        if not self.config.detect_origin:
+            return self._apply_manifest(dict.fromkeys(self.input_files, self.worker_config))
+
+        file_configs = {}
+        origins: dict[str, ReferenceConfig | ValueError] = {}  # By CRS WKT, as most files share a few CRSs
+        unresolved = []
+        for input_file in self.input_files:
+            # Coordinate tables carry no CRS and keep the configured origin
+            if is_tabular(input_file):
+                file_configs[input_file] = self.worker_config
+                continue
+
+            crs = self.input_crs[input_file]
+            if crs is None or isinstance(crs, Exception):
+                unresolved.append(f"{input_file.name}: {crs or 'no CRS VLRs'}")
+                continue
+
+            wkt = crs.to_wkt()
+            if wkt not in origins:
+                try:
+                    origins[wkt] = ReferenceConfig.from_crs(crs, self.config.origin.epoch)
+                except ValueError as e:
+                    origins[wkt] = e
+            if isinstance(origins[wkt], ValueError):
+                unresolved.append(f"{input_file.name}: {origins[wkt]}")
+                continue
+            file_configs[input_file] = self.worker_config.model_copy(update={"origin": origins[wkt]})
+
+        if unresolved:
+            raise TransformationError(
+                f"Could not detect the origin CRS of {len(unresolved)} file(s):\n" + "\n".join(unresolved)
+            )
+
+        groups = Counter(
+            f"{c.origin.ref_frame.value} {c.origin.coord_type.value} {c.origin.vd.value}" for c in file_configs.values()
+        )
+        for origin, count in groups.items():
+            logger.info(f"Detected origin {origin}: {count} file(s)")
+        return self._apply_manifest(file_configs)
+
+    def _apply_manifest(self, file_configs: dict[Path, TransformConfig]) -> dict[Path, TransformConfig]:
+        """Apply the per-file overrides of the manifest, if any."""
+        if self.manifest is None:
+            return file_configs
+
+        file_configs = {entry.input: entry.apply(file_configs[entry.input]) for entry in self.manifest.entries}
+        logger.info(f"Manifest gives {len({c.model_dump_json() for c in file_configs.values()})} distinct config(s)")
+        return file_configs
 
     def _calculate_total_iterations(self) -> int:
         """Calculate total number of processing iterations."""
         logger.info("Calculating total number of processing iterations")
         total = 0
         for input_file in self.input_files:
-            with laspy.open(str(input_file)) as las_file:
-                point_count = las_file.header.point_count
-                chunks = math.ceil(point_count / ProcessingConstants.DEFAULT_CHUNK_SIZE)
-                total += chunks
-                logger.debug(f"{input_file.name}: {point_count} points, {chunks} chunks")
+            chunks = math.ceil(self.point_counts[input_file] / ProcessingConstants.DEFAULT_CHUNK_SIZE)
+            total += chunks
+            logger.debug(f"{input_file.name}: {chunks} chunks")
         return total
 
-    def create_progress_tracker(self) -> tuple[multiprocessing.Manager, multiprocessing.RLock, multiprocessing.Value]:
-        """Create shared progress tracking objects."""
-        manager = multiprocessing.Manager()
-        lock = manager.RLock()
-        current_iter = manager.Value("i", 0)
-        return manager, lock, current_iter
+    def create_progress_tracker(
+        self,
+    ) -> tuple[SyncManager | None, multiprocessing.RLock, multiprocessing.Value]:
+        """Create shared progress tracking objects suited to the executor backend."""
+        return create_progress_tracker(self.backend)
 
     def execute_transformations(
         self, progress_callback: Callable[[int], None] | None = None
@@ -89,31 +360,403 @@ class TransformationManager:
         Yields:
             Tuples of (input_file, output_file, exception_or_none)
         """
-        with futures.ProcessPoolExecutor(max_workers=self.num_workers) as pool:
-            # Submit all transformation jobs
-            future_to_files = {}
-            for input_file, output_file in zip(self.input_files, self.output_files):
-                future = pool.submit(
-                    transform_file,
-                    self.config,
-                    input_file,
-                    output_file,
-                    self.lock,
-                    self.current_iter,
+        if self.config.space_check != TrxSpaceCheck.OFF:
+            self._check_space()
+
+        pending = deque(zip(self.input_files, self.output_files))
+        in_flight = {}
+        self._results.clear()
+        self._fragments.clear()
+        self.failed_merges.clear()
+
+        with contextlib.ExitStack() as stack:
+            # The stager is entered first so the pool has shut down before the scratch directory is removed
+            stager = None
+            if self.config.staging is not None:
+                # Parquet copies and additional targets are staged with the output of their input
+                extra_outputs = {input_file: list(self.target_files[input_file]) for input_file, _ in pending}
+                for input_file, output_file in pending:
+                    parquet_file = parquet_copy_path(self.config, output_file)
+                    if parquet_file is not None:
+                        extra_outputs[input_file].append(parquet_file)
+                stager = stack.enter_context(ScratchStager(self.config.staging, list(pending), extra_outputs))
+            pool = stack.enter_context(
+                create_executor(
+                    self.backend,
+                    self.num_workers,
+                    self.config.max_tasks_per_child,
+                    self.layout,
+                    self.config.low_priority,
                 )
-                future_to_files[future] = (input_file, output_file)
+            )
 
-            # Process completed futures
-            for future in futures.as_completed(future_to_files):
-                input_file, output_file = future_to_files[future]
-                exception = future.exception()
+            while pending or in_flight or (stager is not None and stager.moves_pending):
+                # After a cancel, only the files already running are seen through
+                if pending and self._cancel_requested.is_set():
+                    logger.info(f"Transformation cancelled, skipping {len(pending)} file(s) not started yet")
+                    pending.clear()
 
-                if exception:
-                    logger.error(f"Error transforming {input_file}: {exception}")
+                # Submit jobs while there are free workers and the memory budget allows
+                while pending and len(in_flight) < self._target_workers(len(in_flight)):
+                    input_file, output_file = pending[0]
+                    if not self.governor.can_admit(self.task_memory[input_file]):
+                        break
+
+                    local_input, local_output = input_file, output_file
+                    parquet_file = parquet_copy_path(self.config, output_file)
+                    target_files = self.target_files[input_file]
+                    if stager is not None:
+                        try:
+                            if not stager.is_ready(input_file):
+                                break
+                        except StagingError as e:
+                            pending.popleft()
+                            yield self._report_result(input_file, output_file, e)
+                            continue
+                        local_input, local_output = stager.claim(input_file)
+                        if parquet_file is not None:
+                            parquet_file = stager.local_output(parquet_file)
+                        target_files = [stager.local_output(f) for f in target_files]
+
+                    pending.popleft()
+                    self.governor.admit(self.task_memory[input_file])
+                    future = pool.submit(
+                        transform_file,
+                        self.file_configs[input_file],
+                        local_input,
+                        local_output,
+                        self.lock,
+                        self.current_iter,
+                        self.cpu_time,
+                        self.throttle,
+                        parquet_file=parquet_file,
+                        target_files=target_files,
+                        merge_header=self.merge_header,
+                        point_count=self.point_counts[input_file],
+                    )
+                    in_flight[future] = (input_file, output_file)
+
+                # Process completed futures, waking up regularly to let the autoscaler measure throughput
+                # and to pick up inputs staged or outputs moved in the meantime
+                timeout = self.autoscaler.window / 2 if self.autoscaler is not None else None
+                if stager is not None:
+                    timeout = min(timeout or StagingConstants.POLL_INTERVAL, StagingConstants.POLL_INTERVAL)
+                    if not in_flight:
+                        stager.wait(timeout)
+
+                done, _ = futures.wait(in_flight, timeout=timeout, return_when=futures.FIRST_COMPLETED)
+                for future in done:
+                    input_file, output_file = in_flight.pop(future)
+                    self.governor.release(self.task_memory[input_file])
+                    exception = future.exception()
+                    if exception is None:
+                        self._record_stats(future.result())
+                        self._fragments[input_file] = future.result().fragments
+
+                    if stager is None:
+                        yield self._report_result(input_file, output_file, exception)
+                        continue
+
+                    # Successful outputs are reported once they have reached their destination
+                    stager.finish(input_file, output_file, success=exception is None)
+                    if exception is not None:
+                        yield self._report_result(input_file, output_file, exception)
+
+                if stager is not None:
+                    for input_file, output_file, exception in stager.completed_moves():
+                        yield self._report_result(input_file, output_file, exception)
+
+            if self.config.merges_inputs() and self._cancel_requested.is_set():
+                # Merging the inputs transformed before the cancel would leave incomplete outputs behind
+                logger.info("Transformation cancelled, not merging the inputs transformed so far")
+                self._discard_fragments()
+            elif self.config.tiling is not None:
+                self._merge_tiles(pool)
+            elif self.merge_header is not None:
+                self._merge_output(pool)
+
+        self._log_worker_memory()
+        if self.manifest is not None:
+            results_path = self.manifest.write_results(self.output_files, self._results)
+            logger.info(f"Wrote results manifest {results_path}")
+
+    def _report_result(
+        self, input_file: Path, output_file: Path, exception: Exception | None
+    ) -> tuple[Path, Path, Exception | None]:
+        """Log and record the outcome of a file and build the tuple yielded by execute_transformations."""
+        self._results[input_file] = str(exception) if exception else None
+        if exception:
+            logger.error(f"Error transforming {input_file}: {exception}")
+        else:
+            logger.info(f"{input_file} -> {output_file}")
+        return input_file, output_file, exception
+
+    def _merge_tiles(self, pool: futures.Executor) -> None:
+        """Merge the fragments written by the inputs that succeeded into their tiles, in parallel across tiles."""
+        tiles: dict[Path, list[TileFragment]] = {}
+        for input_file in self.input_files:
+            for fragment in self._fragments.get(input_file, ()):
+                tiles.setdefault(fragment.tile_file, []).append(fragment)
+        logger.info(f"Merging {sum(map(len, tiles.values()))} fragment(s) into {len(tiles)} tile(s)")
+
+        merges = {}
+        for tile_file, fragments in tiles.items():
+            paths = [fragment.path for fragment in fragments]
+            future = pool.submit(merge_tile, self.worker_config, tile_file, fragments[0].key, paths)
+            merges[future] = (tile_file, paths)
+        for future in futures.as_completed(merges):
+            tile_file, paths = merges[future]
+            exception = future.exception()
+            if exception is not None:
+                logger.error(f"Error merging tile {tile_file}: {exception}")
+                discard_merge(tile_file, paths)
+                self.failed_merges[tile_file] = exception
+            else:
+                logger.debug(f"Tile {tile_file}: {future.result()} points")
+
+    def _merge_output(self, pool: futures.Executor) -> None:
+        """Write the fragments of the inputs that succeeded into the merged output, in input order."""
+        output_file = self.output_files[0]
+        inputs = [f for f in self.input_files if f in self._results and self._results[f] is None]
+        if not inputs:
+            logger.warning(f"No input was transformed, not writing {output_file}")
+            return
+        logger.info(f"Merging {len(inputs)} input(s) into {output_file}")
+
+        # The merge is the only task left, so it may compress with the threads of the whole pool
+        fragments = [fragment_path(output_file, fragment_id(f)) for f in inputs]
+        threads = self.num_workers * self.layout.threads_per_worker
+        future = pool.submit(merge_fragments, self.worker_config, output_file, fragments, None, threads)
+        if future.exception() is not None:
+            logger.error(f"Error merging {output_file}: {future.exception()}")
+            discard_merge(output_file, fragments)
+            self.failed_merges[output_file] = future.exception()
+        else:
+            logger.info(f"Merged {future.result()} points into {output_file}")
+
+    def _discard_fragments(self) -> None:
+        """Remove the fragments written by the inputs of a run whose outputs are not merged."""
+        if self.config.tiling is not None:
+            fragments = [
+                fragment.path for input_file in self.input_files for fragment in self._fragments.get(input_file, ())
+            ]
+        else:
+            fragments = [fragment_path(self.output_files[0], fragment_id(f)) for f in self.input_files]
+        for fragment in fragments:
+            fragment.unlink(missing_ok=True)
+
+    def preview(self, preview_file: Path | None = None, seed: int | None = None) -> list[PreviewReport]:
+        """Transform a stratified random sample of the chunks of each input, with the configs of the run.
+
+        Inputs are previewed one after the other in this process, for the main output only. Nothing is
+        written but the optional preview file.
+
+        Args:
+            preview_file: Optional LAS/LAZ file to write the transformed sample of all inputs to
+            seed: Seed of the chunk sampling, for repeatable previews
+
+        Returns:
+            Report of each LAS input, in input order; coordinate tables are skipped
+
+        Raises:
+            TransformationError: If an input cannot be previewed, or the inputs cannot be written to one preview file
+        """
+        input_files = [f for f in self.input_files if not is_tabular(f)]
+        if len(input_files) < len(self.input_files):
+            logger.warning(f"Skipping {len(self.input_files) - len(input_files)} coordinate table(s) in the preview")
+        rng = np.random.default_rng(seed)
+
+        reports = []
+        with contextlib.ExitStack() as stack:
+            writer = None
+            if preview_file is not None and input_files:
+                header = self.merge_header or self._merged_header(input_files)
+                writer = stack.enter_context(FragmentWriter(preview_file, header))
+            for input_file in input_files:
+                if self._cancel_requested.is_set():
+                    logger.info("Preview cancelled")
+                    break
+                try:
+                    reports.append(preview_input(self.file_configs[input_file], input_file, rng, writer))
+                except Exception as e:
+                    raise TransformationError(f"Failed to preview {input_file}: {e}") from e
+                logger.info(f"Preview of {reports[-1].describe()}")
+        return reports
+
+    def estimate(self, seed: int | None = None) -> RunEstimate:
+        """Estimate the runtime, output size and disk space of the run by benchmarking a few chunks.
+
+        See las_trx.estimate for how inputs are grouped, benchmarked and extrapolated.
+
+        Args:
+            seed: Seed of the chunk sampling, for repeatable estimates
+
+        Returns:
+            Estimate of the whole run
+        """
+        rng = np.random.default_rng(seed)
+        groups: dict[tuple, list[Path]] = {}
+        for input_file, output_file in zip(self.input_files, self.output_files, strict=True):
+            if is_tabular(input_file):
+                continue
+            outputs = [output_file, *self.target_files[input_file]]
+            key = (
+                self.file_configs[input_file].model_dump_json(),
+                self.record_sizes[input_file],
+                input_file.suffix.lower(),
+                tuple(path.suffix.lower() for path in outputs),
+            )
+            groups.setdefault(key, []).append(input_file)
+
+        # Seconds per point, bytes of compressed output per point and fraction of points kept of each input
+        rates = {}
+        copc_record_sizes = {}
+        for (_, _, _, suffixes), input_files in groups.items():
+            input_file = max(input_files, key=lambda f: self.point_counts[f])
+            rate = benchmark_input(self.file_configs[input_file], input_file, ".laz" in suffixes, rng)
+            logger.debug(
+                f"Benchmarked {input_file.name}: {rate[0] * 1e6:.2f} us and {rate[1]:.1f} bytes per point, "
+                f"{rate[2]:.0%} of points kept"
+            )
+            rates.update(dict.fromkeys(input_files, rate))
+            with laspy.open(str(input_file)) as las_file:
+                copc_record_sizes.update(dict.fromkeys(input_files, copc_header(las_file.header).point_format.size))
+
+        seconds = 0.0
+        needed: dict[Path, float] = {}
+        fragments: dict[Path, float] = {}
+        scratch: list[dict[Path, float]] = []
+        merged_copc_points: dict[Path, int] = {}
+        for input_file, output_file in zip(self.input_files, self.output_files, strict=True):
+            point_count = self.point_counts[input_file]
+            outputs = [output_file, *self.target_files[input_file]]
+            parquet_file = parquet_copy_path(self.config, output_file)
+            if parquet_file is not None:
+                outputs.append(parquet_file)
+
+            # Coordinate tables are written in about the size they are read
+            if input_file not in rates:
+                for path in outputs:
+                    needed[path] = needed.get(path, 0.0) + input_file.stat().st_size
+                continue
+
+            seconds_per_point, compressed_bytes, kept = rates[input_file]
+            seconds += point_count * seconds_per_point
+            record_bytes = self.record_sizes[input_file] * kept
+            for path in outputs:
+                if path.suffix.lower() == ".laz":
+                    point_bytes = compressed_bytes
+                elif is_columnar(path):
+                    point_bytes = record_bytes + 3 * np.dtype(np.float64).itemsize * kept
                 else:
-                    logger.info(f"{input_file} -> {output_file}")
+                    point_bytes = record_bytes
+                needed[path] = needed.get(path, 0.0) + point_count * point_bytes
+            if self.config.merges_inputs():
+                fragments[fragment_path(output_file, fragment_id(input_file))] = (
+                    point_count * record_bytes * len(outputs)
+                )
 
-                yield input_file, output_file, exception
+            # Sort runs and COPC spill files live next to the outputs while the input is transformed
+            kept_points = int(point_count * kept)
+            files = {}
+            if uses_spatial_sort(self.config):
+                # Runs hold the records of each output, and the coordinates of columnar outputs
+                num_records = 1 + len(self.target_files[input_file])
+                num_columnar = sum(is_columnar(path) for path in outputs)
+                row_bytes = (
+                    num_records * self.record_sizes[input_file] + num_columnar * 3 * np.dtype(np.float64).itemsize
+                )
+                sort_file = sort_scratch_dir(self.config, output_file) / f".las-trx-sort-{input_file.name}"
+                files[sort_file] = estimate_sort_spill(kept_points, row_bytes)
+            for path in filter(is_copc, outputs):
+                # Tiled and merged COPC outputs are built from all their inputs once the inputs are merged
+                if self.config.merges_inputs():
+                    merged_copc_points[path] = merged_copc_points.get(path, 0) + kept_points
+                else:
+                    files[spill_path(path)] = estimate_copc_spill(kept_points, copc_record_sizes[input_file])
+            scratch.append(files)
+
+        # At most one input per worker is transformed at a time, so only the largest temporary files coexist
+        scratch.sort(key=lambda files: sum(files.values()), reverse=True)
+        temporary = {path: num_bytes for files in scratch[: self.num_workers] for path, num_bytes in files.items()}
+        record_size = max(copc_record_sizes.values(), default=0)
+        for path, point_count in merged_copc_points.items():
+            temporary[spill_path(path)] = estimate_copc_spill(point_count, record_size)
+
+        existing = {path for path in needed if path.is_file()}
+        return RunEstimate(
+            point_count=sum(self.point_counts.values()),
+            num_workers=self.num_workers,
+            seconds=seconds / max(1, self.num_workers),
+            output_bytes=int(sum(needed.values())),
+            disks=disk_estimates({**needed, **fragments, **temporary}, existing),
+            unbenchmarked_files=len(self.input_files) - len(rates),
+        )
+
+    def _check_space(self) -> None:
+        """Estimate the run and warn, or refuse to start, if its outputs will not fit on disk.
+
+        Raises:
+            TransformationError: If the outputs will not fit, or cannot be estimated, and the config refuses such runs
+        """
+        logger.info("Estimating the runtime and disk space of the run")
+        try:
+            estimate = self.estimate()
+        except Exception as e:
+            if self.config.space_check == TrxSpaceCheck.REFUSE:
+                raise TransformationError(f"Could not estimate the disk space of the run: {e}") from e
+            logger.warning(f"Could not estimate the disk space of the run: {e}")
+            return
+        logger.info(estimate.describe())
+        if estimate.fits:
+            return
+
+        full = ", ".join(str(disk.path) for disk in estimate.disks if not disk.fits)
+        message = f"The outputs of the run are estimated not to fit in the free space of {full}"
+        if self.config.space_check == TrxSpaceCheck.REFUSE:
+            raise TransformationError(message)
+        logger.warning(message)
+
+    def cancel(self) -> None:
+        """Stop submitting files; execute_transformations returns once the running files have finished.
+
+        Safe to call from any thread.
+        """
+        self._cancel_requested.set()
+
+    def progress(self) -> int:
+        """Get the number of chunks processed so far."""
+        with self.lock:
+            return self.current_iter.value
+
+    def set_io_limit(self, mb_per_second: float | None) -> None:
+        """Change the I/O limit of a run in progress.
+
+        Args:
+            mb_per_second: Combined read and write limit of all workers in MB/s, or None/0 for unlimited
+        """
+        self.throttle.set_rate(mb_per_second)
+
+    def _target_workers(self, active_workers: int) -> int:
+        """Get the number of jobs that should be running, consulting the autoscaler if enabled."""
+        if self.autoscaler is None:
+            return self.num_workers
+
+        with self.lock:
+            chunks = self.current_iter.value
+            cpu_seconds = self.cpu_time.value
+        points = chunks * ProcessingConstants.DEFAULT_CHUNK_SIZE
+        return self.autoscaler.update(points, cpu_seconds, active_workers, time.monotonic())
+
+    def _record_stats(self, stats: TransformStats) -> None:
+        """Keep the highest peak RSS seen for each worker."""
+        if stats.peak_rss is not None:
+            self.worker_peak_rss[stats.pid] = max(stats.peak_rss, self.worker_peak_rss.get(stats.pid, 0))
+
+    def _log_worker_memory(self) -> None:
+        """Report the observed peak RSS of each worker."""
+        for pid, peak_rss in sorted(self.worker_peak_rss.items()):
+            logger.info(f"Worker {pid} peak RSS: {peak_rss / 1024**2:.0f} MB")
 
 
 def transform_file(
@@ -122,8 +765,14 @@ def transform_file(
     output_file: Path,
     lock: multiprocessing.RLock,
     current_iter: multiprocessing.Value,
-) -> None:
-    """Transform a single LAS file.
+    cpu_time: "multiprocessing.Value | None" = None,
+    throttle: IoThrottle | None = None,
+    parquet_file: Path | None = None,
+    target_files: list[Path] | None = None,
+    merge_header: LasHeader | None = None,
+    point_count: int | None = None,
+) -> TransformStats:
+    """Transform a single LAS file or coordinate table.
 
     Args:
         config: Transformation configuration
@@ -131,42 +780,517 @@ def transform_file(
         output_file: Output file path
         lock: Multiprocessing lock for progress tracking
         current_iter: Shared counter for progress tracking
+        cpu_time: Optional shared total of CPU seconds used by workers
+        throttle: Optional limit on the bandwidth used to read and write files
+        parquet_file: Optional path of a Parquet copy of a LAS output, written in the same pass
+        target_files: Output paths of the additional targets of the config, named from the input stem by default
+        merge_header: Header of the output merged from all inputs, if merging
+        point_count: Number of rows of a coordinate table, if already counted
+
+    With tiling configured, output paths are tile patterns, and the points are written to tile
+    fragments that are listed in the returned stats, to be merged with merge_tile. With a merge
+    header, the points are written to the fragment of the input, to be merged with merge_fragments.
+
+    Returns:
+        Resource usage of the worker that ran the transformation
 
     Raises:
         TransformationError: If transformation fails
     """
+    cpu_clock = worker_cpu_clock()
+    last_cpu = cpu_clock()
+
+    def report_chunk(count: int = 1) -> None:
+        nonlocal last_cpu
+        now_cpu = cpu_clock()
+        with lock:
+            current_iter.value += count
+            if cpu_time is not None:
+                cpu_time.value += now_cpu - last_cpu
+        last_cpu = now_cpu
+
+    if target_files is None:
+        target_files = target_output_files(config, input_file)
+    outputs = [(config, output_file, parquet_file)]
+    outputs += [(config.for_target(t), f, None) for t, f in zip(config.targets, target_files, strict=True)]
+
     try:
-        transformer = CSRSTransformer(**config.to_csrspy().model_dump(exclude_none=True))
+        if is_tabular(input_file):
+            if uses_gps_time_epochs(config):
+                raise ValueError("GPS time epochs are only supported for LAS inputs")
+            if config.merges_inputs():
+                raise ValueError("Tiled and merged outputs are only supported for LAS inputs")
+            if config.filters is not None:
+                raise ValueError("Filters are only supported for LAS inputs")
 
-        with laspy.open(str(input_file)) as in_las:
-            # Prepare output header
-            new_header = prepare_output_header(in_las.header, config, input_file, transformer)
+            # Rows are only counted once read, so the I/O limit is accounted after each chunk
+            if point_count is None:
+                point_count = count_rows(input_file, config.tabular)
+            bytes_per_row = input_file.stat().st_size / max(1, point_count)
 
-            # Determine LAZ backend
-            laz_backend = laspy.LazBackend.Laszip if output_file.suffix == ".laz" else None
-            logger.debug(f"Using LAZ backend: {laz_backend}")
+            # The table is read once for all outputs, as LAS files are decoded once
+            chunks = transform_table(
+                config,
+                input_file,
+                output_file,
+                get_transformer(config),
+                ProcessingConstants.DEFAULT_CHUNK_SIZE,
+                targets=[
+                    (out_config, out_file, get_transformer(out_config)) for out_config, out_file, _ in outputs[1:]
+                ],
+            )
+            for num_rows in chunks:
+                if throttle is not None:
+                    throttle.consume((1 + len(outputs)) * int(num_rows * bytes_per_row))
+                report_chunk()
+            return TransformStats(pid=os.getpid(), peak_rss=peak_rss_bytes())
 
-            # Process file in chunks
-            with laspy.open(str(output_file), mode="w", header=new_header, laz_backend=laz_backend) as out_las:
-                for points in in_las.chunk_iterator(ProcessingConstants.DEFAULT_CHUNK_SIZE):
-                    # Transform coordinates
+        with laspy.open(str(input_file), laz_backend=laz_read_backend(config.threads_per_worker or 1)) as in_las:
+            if uses_gps_time_epochs(config):
+                check_gps_time(in_las.header)
+
+            # On-disk size of a point, used to account chunks against the I/O limit
+            bytes_per_point = input_file.stat().st_size / max(1, in_las.header.point_count)
+
+            filters = config.filters
+            intervals = None
+            if filters is not None:
+                check_filters(filters, in_las.header)
+                intervals = indexed_intervals(filters, input_file, in_las.header.point_count)
+
+            with contextlib.ExitStack() as stack:
+                writers = [
+                    open_output_writers(
+                        stack, out_config, in_las.header, input_file, out_file, out_parquet, merge_header
+                    )
+                    for out_config, out_file, out_parquet in outputs
+                ]
+                sorter = None
+                if uses_spatial_sort(config):
+                    # Runs spill next to the output, which is on local scratch when staging
+                    mins, maxs = transform_header_bounds(in_las.header, writers[0].transformer)
+                    scratch_dir = sort_scratch_dir(config, output_file)
+                    sorter = stack.enter_context(PointSorter(config.sort_order, mins, maxs, scratch_dir))
+
+                # Process file in chunks, decoding each chunk once for all outputs
+                chunks_done = 0
+                for points, position in read_chunks(in_las, ProcessingConstants.DEFAULT_CHUNK_SIZE, intervals):
+                    chunk_bytes = int(len(points) * bytes_per_point)
+                    if throttle is not None:
+                        throttle.consume(chunk_bytes)
+
+                    # Progress counts the chunks of the input up to this one, including those skipped by the index
+                    chunk_count = math.ceil(position / ProcessingConstants.DEFAULT_CHUNK_SIZE) - chunks_done
+                    chunks_done += chunk_count
+
+                    # Drop the points rejected by the filters, before transforming them unless in the destination frame
+                    if filters is not None:
+                        mask = source_mask(filters, points)
+                        if not mask.all():
+                            points = points[mask]
                     data = stack_point_dimensions(points)
-                    transformed_data = np.array(list(transformer(data)))
+                    transformed = {}
+                    if uses_spatial_filter(filters, TrxFilterFrame.DESTINATION) and len(points):
+                        main = writers[0]
+                        main_data = transform_coords(main.config, main.transformer, data, points)
+                        mask = spatial_mask(filters, main_data)
+                        points, data = points[mask], data[mask]
+                        transformed[id(main.transformer)] = main_data[mask]
+                    if not len(points):
+                        report_chunk(chunk_count)
+                        continue
+
+                    # Transform coordinates, once per distinct transformer
+                    columns = []
+                    for i, output in enumerate(writers):
+                        key = id(output.transformer)
+                        if key not in transformed:
+                            transformed[key] = transform_coords(output.config, output.transformer, data, points)
+                        transformed_data = transformed[key]
 
-                    # Update point records
-                    points.change_scaling(offsets=new_header.offsets, scales=new_header.scales)
-                    points.x = transformed_data[:, 0]
-                    points.y = transformed_data[:, 1]
-                    points.z = transformed_data[:, 2]
-                    out_las.write_points(points)
+                        # Update point records, in place for the last output and on copies for the others
+                        if i == len(writers) - 1:
+                            points.change_scaling(offsets=output.header.offsets, scales=output.header.scales)
+                            out_points = points
+                        else:
+                            out_points = laspy.ScaleAwarePointRecord(
+                                points.array.copy(), points.point_format, output.header.scales, output.header.offsets
+                            )
+                        out_points.x = transformed_data[:, 0]
+                        out_points.y = transformed_data[:, 1]
+                        out_points.z = transformed_data[:, 2]
+                        if sorter is not None:
+                            # Points are written once sorted, keeping the coordinates of columnar outputs unrounded
+                            columns.append(out_points.array)
+                            if output.columnar is not None:
+                                columns.append(transformed_data)
+                            continue
+                        if throttle is not None:
+                            throttle.consume(chunk_bytes)
+                        write_output_points(output, out_points, transformed_data)
+                    if sorter is not None:
+                        sorter.add(transformed[id(writers[0].transformer)][:, :2], columns)
+                    report_chunk(chunk_count)
 
-                    # Update progress
-                    with lock:
-                        current_iter.value += 1
+                # Chunks after the last interval read from the index
+                remaining = math.ceil(in_las.header.point_count / ProcessingConstants.DEFAULT_CHUNK_SIZE) - chunks_done
+                if remaining > 0:
+                    report_chunk(remaining)
+
+                if sorter is not None:
+                    for columns in sorter.sorted_chunks(ProcessingConstants.DEFAULT_CHUNK_SIZE):
+                        values = iter(columns)
+                        for output in writers:
+                            array = next(values)
+                            out_points = laspy.ScaleAwarePointRecord(
+                                array, in_las.header.point_format, output.header.scales, output.header.offsets
+                            )
+                            coords = next(values) if output.columnar is not None else None
+                            if throttle is not None:
+                                throttle.consume(int(len(array) * bytes_per_point))
+                            write_output_points(output, out_points, coords)
 
     except Exception as e:
         raise TransformationError(f"Failed to transform {input_file}: {e}") from e
 
+    fragments = tuple(f for output in writers if output.tiles is not None for f in output.tiles.fragments)
+    return TransformStats(pid=os.getpid(), peak_rss=peak_rss_bytes(), fragments=fragments)
+
+
+@dataclass
+class OutputWriters:
+    """Writers of one output of a file, with the config, transformer and header they use."""
+
+    config: TransformConfig
+    transformer: CSRSTransformer
+    header: LasHeader
+    las: laspy.LasWriter | None
+    columnar: ColumnarWriter | None
+    index: LaxIndex | None = None
+    copc: CopcWriter | None = None
+    tiles: TileRouter | None = None
+    fragment: FragmentWriter | None = None
+
+
+def write_output_points(output: OutputWriters, points: laspy.ScaleAwarePointRecord, coords: np.ndarray | None) -> None:
+    """Write transformed points to the writers of an output.
+
+    Args:
+        output: Writers of the output
+        points: Transformed point records
+        coords: Transformed coordinates of the points, of shape (N, 3), needed if the output has a columnar writer
+    """
+    if output.las is not None:
+        output.las.write_points(points)
+    if output.index is not None:
+        output.index.add(points.x, points.y)
+    if output.copc is not None:
+        output.copc.write_points(points)
+    if output.columnar is not None:
+        output.columnar.write_points(points, coords)
+    if output.tiles is not None:
+        output.tiles.write_points(points)
+    if output.fragment is not None:
+        output.fragment.write_points(points)
+
+
+def open_output_writers(
+    stack: contextlib.ExitStack,
+    config: TransformConfig,
+    input_header: LasHeader,
+    input_file: Path,
+    output_file: Path,
+    parquet_file: Path | None = None,
+    merge_header: LasHeader | None = None,
+) -> OutputWriters:
+    """Open the writers of one output, closing them with the stack.
+
+    Args:
+        stack: Exit stack that closes the writers
+        config: Transformation configuration of the output
+        input_header: Header of the input file
+        input_file: Input file path
+        output_file: Output file path, written as Arrow, Parquet or COPC for those suffixes and as LAS otherwise,
+            or pattern of tiled outputs
+        parquet_file: Optional path of a Parquet copy of a LAS or COPC output
+        merge_header: Header of the output merged from all inputs, whose points are then written to the
+            fragment of this input
+
+    Returns:
+        Writers of the output
+    """
+    transformer = get_transformer(config)
+    new_header = prepare_output_header(input_header, config, input_file, transformer)
+
+    if merge_header is not None:
+        fragment = stack.enter_context(
+            FragmentWriter(fragment_path(output_file, fragment_id(input_file)), merge_header)
+        )
+        return OutputWriters(config, transformer, merge_header, None, None, fragment=fragment)
+    if config.tiling is not None:
+        tiles = stack.enter_context(TileRouter(output_file, new_header, config.tiling, fragment_id(input_file)))
+        return OutputWriters(config, transformer, new_header, None, None, tiles=tiles)
+    if is_columnar(output_file):
+        columnar = stack.enter_context(ColumnarWriter(output_file, new_header, config.destination.crs))
+        return OutputWriters(config, transformer, new_header, None, columnar)
+
+    # COPC files carry their own hierarchy, so they get no LAX index
+    index = None
+    out_las = None
+    copc = None
+    if is_copc(output_file):
+        copc = stack.enter_context(CopcWriter(output_file, new_header, config.threads_per_worker or 1))
+    else:
+        # Opened first so that the index is only written once the output has been closed without error
+        if config.lax_index:
+            mins, maxs = transform_header_bounds(input_header, transformer)
+            index = stack.enter_context(LaxIndex(lax_path(output_file), mins, maxs))
+
+        # Determine LAZ backend
+        laz_backend = laspy.LazBackend.Laszip if output_file.suffix == ".laz" else None
+        logger.debug(f"Using LAZ backend: {laz_backend}")
+        out_las = stack.enter_context(
+            laspy.open(str(output_file), mode="w", header=new_header, laz_backend=laz_backend)
+        )
+
+    columnar = None
+    if parquet_file is not None:
+        columnar = stack.enter_context(ColumnarWriter(parquet_file, new_header, config.destination.crs))
+    return OutputWriters(config, transformer, new_header, out_las, columnar, index, copc)
+
+
+def transform_stream(
+    config: TransformConfig,
+    source: BinaryIO,
+    dest: BinaryIO,
+    chunk_size: int = ProcessingConstants.DEFAULT_CHUNK_SIZE,
+) -> int:
+    """Transform a LAS/LAZ stream into an uncompressed LAS stream in a single forward pass.
+
+    Neither stream is ever seeked, so pipes work on both ends and memory use is bounded by the chunk
+    size. As the output header is written before any point, its offsets and bounds come from the
+    transformed corners of the input header bounds rather than from the points. EVLRs are dropped,
+    as reading them needs a seek to the end of the input. LAZ streams are decompressed with lazrs,
+    as the laszip backend seeks. If the config detects the origin, it is detected from the CRS VLRs
+    of the stream header.
+
+    Args:
+        config: Transformation configuration
+        source: Readable binary stream of LAS or LAZ data
+        dest: Writable binary stream receiving uncompressed LAS data
+        chunk_size: Number of points processed at a time
+
+    Returns:
+        Number of points written
+
+    Raises:
+        TransformationError: If transformation fails
+    """
+    try:
+        if config.merges_inputs():
+            raise ValueError("Tiled and merged outputs cannot be streamed")
+        if config.filters is not None:
+            # The header, with the number of points, is written before any point is read
+            raise ValueError("Filters cannot be applied to streams")
+        # Points are only decompressed once read, so LAZ without lazrs is rejected before any output
+        lazrs = laspy.LazBackend.Lazrs
+        laz_backend = lazrs if lazrs.is_available() else ()
+        with laspy.open(source, closefd=False, read_evlrs=False, laz_backend=laz_backend) as in_las:
+            if in_las.header.are_points_compressed and not laz_backend:
+                raise ValueError("LAZ streams can only be read with lazrs, install las-trx[copc] or pipe LAS")
+            if config.detect_origin:
+                crs = in_las.header.parse_crs()
+                if crs is None:
+                    raise ValueError("Cannot detect the origin of a stream without CRS VLRs")
+                config = config.model_copy(update={"origin": ReferenceConfig.from_crs(crs, config.origin.epoch)})
+            transformer = get_transformer(config)
+            if uses_gps_time_epochs(config):
+                check_gps_time(in_las.header)
+            new_header = copy.deepcopy(in_las.header)
+            new_header = clear_header_geokeys(new_header)
+            new_header = write_header_geokeys_from_crs(new_header, config.destination.crs)
+            new_header = write_header_scales(new_header)
+
+            mins, maxs = transform_header_bounds(in_las.header, transformer)
+            new_header.offsets = mins
+            new_header.mins = mins
+            new_header.maxs = maxs
+            new_header.number_of_evlrs = 0
+            new_header.start_of_first_evlr = 0
+            # Points are written uncompressed, whatever the input
+            new_header.set_compressed(False)
+            new_header.vlrs.extract("LasZipVlr")
+            new_header.write_to(dest)
+
+            num_points = 0
+            for points in in_las.chunk_iterator(chunk_size):
+                transformed_data = transform_coords(config, transformer, stack_point_dimensions(points), points)
+                points.change_scaling(offsets=new_header.offsets, scales=new_header.scales)
+                points.x = transformed_data[:, 0]
+                points.y = transformed_data[:, 1]
+                points.z = transformed_data[:, 2]
+                dest.write(points.array.tobytes())
+                num_points += len(points)
+        dest.flush()
+    except Exception as e:
+        raise TransformationError(f"Failed to transform stream: {e}") from e
+
+    return num_points
+
+
+def preview_input(
+    config: TransformConfig,
+    input_file: Path,
+    rng: np.random.Generator,
+    writer: FragmentWriter | None = None,
+    samples: int = PreviewConstants.SAMPLE_CHUNKS,
+) -> PreviewReport:
+    """Transform a stratified random sample of the chunks of a LAS file, as transform_file would.
+
+    Args:
+        config: Transformation configuration of the file
+        input_file: Input file path
+        rng: Random generator drawing the sampled chunks
+        writer: Optional writer of the transformed points that have finite coordinates
+        samples: Number of chunks sampled
+
+    Returns:
+        Report of the sample
+    """
+    with laspy.open(str(input_file), laz_backend=laz_read_backend(config.threads_per_worker or 1)) as in_las:
+        if uses_gps_time_epochs(config):
+            check_gps_time(in_las.header)
+        filters = config.filters
+        if filters is not None:
+            check_filters(filters, in_las.header)
+
+        transformer = get_transformer(config)
+        point_count = in_las.header.point_count
+        intervals = sample_chunks(point_count, ProcessingConstants.DEFAULT_CHUNK_SIZE, samples, rng)
+        sampled_points = 0
+        coords = []
+        results = []
+        for points, _ in read_chunks(in_las, ProcessingConstants.DEFAULT_CHUNK_SIZE, intervals):
+            sampled_points += len(points)
+            if filters is not None:
+                points = points[source_mask(filters, points)]
+            if not len(points):
+                continue
+            data = stack_point_dimensions(points)
+            transformed = transform_coords(config, transformer, data, points)
+            if uses_spatial_filter(filters, TrxFilterFrame.DESTINATION):
+                mask = spatial_mask(filters, transformed)
+                points, data, transformed = points[mask], data[mask], transformed[mask]
+            coords.append(data)
+            results.append(transformed)
+
+            if writer is not None:
+                finite = np.isfinite(transformed).all(axis=1)
+                out_points = laspy.ScaleAwarePointRecord(
+                    points.array[finite], points.point_format, writer.header.scales, writer.header.offsets
+                )
+                out_points.x = transformed[finite, 0]
+                out_points.y = transformed[finite, 1]
+                out_points.z = transformed[finite, 2]
+                writer.write_points(out_points)
+
+    return preview_report(input_file, point_count, sampled_points, coords, results)
+
+
+def benchmark_input(
+    config: TransformConfig, input_file: Path, compressed: bool, rng: np.random.Generator
+) -> tuple[float, float, float]:
+    """Time transforming a sample of the chunks of a LAS file and writing them to a temporary output.
+
+    Args:
+        config: Transformation configuration of the file
+        input_file: Input file path
+        compressed: Whether to write the sample as LAZ rather than LAS
+        rng: Random generator drawing the sampled chunks
+
+    Returns:
+        Tuple of (seconds per input point, bytes of point data written per input point, fraction of the
+        points kept by the filters)
+    """
+    with laspy.open(str(input_file)) as in_las:
+        header = copy.deepcopy(in_las.header)
+    mins, _ = transform_header_bounds(header, get_transformer(config))
+    header = write_header_scales(write_header_geokeys_from_crs(clear_header_geokeys(header), config.destination.crs))
+    header.offsets = mins
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / ("benchmark.laz" if compressed else "benchmark.las")
+        start = time.perf_counter()
+        with FragmentWriter(path, header) as writer:
+            report = preview_input(config, input_file, rng, writer, EstimateConstants.SAMPLE_CHUNKS)
+        seconds = time.perf_counter() - start
+        with laspy.open(str(path)) as out_las:
+            point_bytes = path.stat().st_size - out_las.header.offset_to_point_data
+
+    sampled_points = max(1, report.sampled_points)
+    return seconds / sampled_points, point_bytes / sampled_points, report.kept_points / sampled_points
+
+
+def transform_header_bounds(header: LasHeader, transformer: CSRSTransformer) -> tuple[np.ndarray, np.ndarray]:
+    """Estimate the bounds of a file after transformation from the corners of its header bounds.
+
+    Returns:
+        Tuple of (mins, maxs) in the destination reference system
+    """
+    corners = np.array(list(itertools.product(*zip(header.mins, header.maxs))))
+    transformed = np.array(list(transformer(corners)))
+    return transformed.min(axis=0), transformed.max(axis=0)
+
+
+def read_point_count(input_file: Path, config: TransformConfig) -> int:
+    """Get the number of points of a LAS file or rows of a coordinate table."""
+    if is_tabular(input_file):
+        return count_rows(input_file, config.tabular)
+    with laspy.open(str(input_file)) as las_file:
+        return las_file.header.point_count
+
+
+def get_transformer(config: TransformConfig) -> CSRSTransformer:
+    """Get a transformer for the config, reusing one built earlier by the same thread.
+
+    Building a transformer sets up PROJ pipelines and loads geoid grids, which dominates the cost of
+    small files. Long-lived workers keep the most recently used transformers; the cache is per thread
+    because PROJ objects must not be shared between threads.
+    """
+    kwargs = config.to_csrspy().model_dump(exclude_none=True)
+    key = tuple(sorted(kwargs.items()))
+
+    cache = getattr(_transformer_cache, "transformers", None)
+    if cache is None:
+        cache = _transformer_cache.transformers = OrderedDict()
+
+    if key in cache:
+        cache.move_to_end(key)
+        return cache[key]
+
+    transformer = CSRSTransformer(**kwargs)
+    cache[key] = transformer
+    if len(cache) > ProcessingConstants.TRANSFORMER_CACHE_SIZE:
+        cache.popitem(last=False)
+    return transformer
+
+
+def worker_cpu_clock() -> Callable[[], float]:
+    """Get a clock measuring the CPU time of the current worker.
+
+    Process pool tasks run on the worker's main thread and own the whole process, including any
+    decompression threads. Thread pool tasks share the process, so only their own thread counts.
+    """
+    if threading.current_thread() is threading.main_thread():
+        return time.process_time
+    return time.thread_time
+
+
+def laz_read_backend(threads: int) -> laspy.LazBackend | None:
+    """Pick a LAZ decompression backend that stays within the worker's thread budget."""
+    backend = laspy.LazBackend.LazrsParallel if threads > 1 else laspy.LazBackend.Lazrs
+    return backend if backend.is_available() else None
+
 
 def prepare_output_header(
     input_header: LasHeader, config: TransformConfig, input_file: Path, transformer: CSRSTransformer
@@ -238,6 +1362,29 @@ def write_header_offsets(header: LasHeader, input_file: Path, transformer: CSRST
     return header
 
 
+def transform_coords(
+    config: TransformConfig, transformer: CSRSTransformer, coords: np.ndarray, points: object
+) -> np.ndarray:
+    """Transform the coordinates of a chunk of points.
+
+    Args:
+        config: Transformation configuration
+        transformer: Transformer of the config, used unless the origin epoch comes from GPS time
+        coords: Array of shape (N, 3) with the coordinates of the points
+        points: Point records of the chunk, read for their GPS time in GPS time epoch mode
+
+    Returns:
+        Array of shape (N, 3) with coordinates in the destination reference system
+    """
+    if not uses_gps_time_epochs(config):
+        return np.array(list(transformer(coords)))
+
+    result = np.empty_like(coords)
+    for epoch_config, indices in split_by_epoch(config, points.gps_time):
+        result[indices] = np.array(list(get_transformer(epoch_config)(coords[indices])))
+    return result
+
+
 def stack_point_dimensions(points: object) -> np.ndarray:
     """Stack point X, Y, Z coordinates into array for transformation."""
     x = points.x.scaled_array().copy()
@@ -57,10 +57,17 @@ class UIWidgetInterface(Protocol):
     # Worker settings
     def get_worker_cores(self) -> int: ...
     def set_worker_cores(self, cores: int) -> None: ...
+    def is_autoscale_enabled(self) -> bool: ...
+    def set_autoscale_enabled(self, enabled: bool) -> None: ...
+    def get_io_limit(self) -> float | None: ...
+    def set_io_limit(self, mb_per_second: float | None) -> None: ...
+    def is_low_priority_enabled(self) -> bool: ...
+    def set_low_priority_enabled(self, enabled: bool) -> None: ...
 
     # Progress and status
     def set_progress(self, value: int) -> None: ...
     def set_convert_button_enabled(self, enabled: bool) -> None: ...
+    def set_preview_button_enabled(self, enabled: bool) -> None: ...
 
     # Log output
     def get_log_content(self) -> str: ...
@@ -212,6 +219,24 @@ class UIWidgetAdapter:
     def set_worker_cores(self, cores: int) -> None:
         self.cw.spinBox_worker_cores.setValue(cores)
 
+    def is_autoscale_enabled(self) -> bool:
+        return self.cw.checkBox_autoscale.isChecked()
+
+    def set_autoscale_enabled(self, enabled: bool) -> None:
+        self.cw.checkBox_autoscale.setChecked(enabled)
+
+    def get_io_limit(self) -> float | None:
+        return self.cw.spinBox_io_limit.value() or None
+
+    def set_io_limit(self, mb_per_second: float | None) -> None:
+        self.cw.spinBox_io_limit.setValue(round(mb_per_second or 0))
+
+    def is_low_priority_enabled(self) -> bool:
+        return self.cw.checkBox_low_priority.isChecked()
+
+    def set_low_priority_enabled(self, enabled: bool) -> None:
+        self.cw.checkBox_low_priority.setChecked(enabled)
+
     # Progress and status
     def set_progress(self, value: int) -> None:
         self.cw.progressBar.setValue(value)
@@ -219,6 +244,9 @@ class UIWidgetAdapter:
     def set_convert_button_enabled(self, enabled: bool) -> None:
         self.cw.pushButton_convert.setEnabled(enabled)
 
+    def set_preview_button_enabled(self, enabled: bool) -> None:
+        self.cw.pushButton_preview.setEnabled(enabled)
+
     # Log output
     def get_log_content(self) -> str:
         return self.cw.textBrowser_log_output.toPlainText()
@@ -40,9 +40,21 @@ class TransformWorker(QThread):
         self.transformation_manager: TransformationManager | None = None
         self._should_stop = False
 
+    def set_io_limit(self, mb_per_second: float | None) -> None:
+        """Change the I/O limit, including for a transformation in progress.
+
+        Args:
+            mb_per_second: Combined read and write limit of all workers in MB/s, or None for unlimited
+        """
+        self.config = self.config.model_copy(update={"io_limit_mb_s": mb_per_second})
+        if self.transformation_manager is not None:
+            self.transformation_manager.set_io_limit(mb_per_second)
+
     def stop_transformation(self) -> None:
         """Request transformation to stop."""
         self._should_stop = True
+        if self.transformation_manager is not None:
+            self.transformation_manager.cancel()
         logger.info("Stop requested for transformation")
 
     def run(self) -> None:
@@ -64,10 +76,9 @@ class TransformWorker(QThread):
 
             # Execute transformations
             for input_file, output_file, exception in self.transformation_manager.execute_transformations():
-                # Check if stop was requested
+                # After a stop, the files still running are seen through so the manager can clean up
                 if self._should_stop:
-                    logger.info("Transformation stopped by user request")
-                    return
+                    continue
 
                 if exception:
                     has_errors = True
@@ -81,6 +92,16 @@ class TransformWorker(QThread):
                 # Small delay to allow UI updates
                 sleep(UIConstants.PROGRESS_UPDATE_INTERVAL / 10)
 
+            if self._should_stop:
+                logger.info("Transformation stopped by user request")
+                return
+
+            # Outputs merged after the batch, tiles or a merged output, fail on their own
+            for output_file, exception in self.transformation_manager.failed_merges.items():
+                has_errors = True
+                error_count += 1
+                self.error.emit(TransformationError(f"Failed to merge {output_file}: {exception}"))
+
             # Emit final result
             if not has_errors:
                 logger.info(f"All {success_count} file(s) transformed successfully")
@@ -104,8 +125,7 @@ class TransformWorker(QThread):
         while not self._should_stop and self.transformation_manager:
             try:
                 # Get current progress from the shared counter
-                with self.transformation_manager.lock:
-                    current_value = self.transformation_manager.current_iter.value
+                current_value = self.transformation_manager.progress()
 
                 if self.transformation_manager.total_iterations > 0:
                     progress = int(100 * current_value / float(self.transformation_manager.total_iterations))
@@ -145,3 +165,47 @@ class TransformWorker(QThread):
     def __del__(self) -> None:
         """Destructor to ensure cleanup."""
         self.cleanup()
+
+
+class PreviewWorker(QThread):
+    """Worker thread previewing a transformation on a sample of each input."""
+
+    # Signals
+    started = Signal()
+    finished = Signal()
+    reports = Signal(list)  # PreviewReport of each input
+    error = Signal(Exception)
+
+    def __init__(
+        self, config: TransformConfig, input_pattern: str, output_pattern: str, parent: object | None = None
+    ) -> None:
+        """Initialize the worker thread.
+
+        Args:
+            config: Transformation configuration
+            input_pattern: Input file pattern (supports wildcards)
+            output_pattern: Output file pattern (supports {} formatting)
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.config = config
+        self.input_pattern = input_pattern
+        self.output_pattern = output_pattern
+        self.transformation_manager: TransformationManager | None = None
+
+    def stop_preview(self) -> None:
+        """Request the preview to stop after the current input."""
+        if self.transformation_manager is not None:
+            self.transformation_manager.cancel()
+
+    def run(self) -> None:
+        """Execute the preview in the thread."""
+        self.started.emit()
+        try:
+            self.transformation_manager = TransformationManager(self.config, self.input_pattern, self.output_pattern)
+            self.reports.emit(self.transformation_manager.preview())
+        except Exception as e:
+            logger.error(f"Preview failed: {e}")
+            self.error.emit(e)
+        finally:
+            self.finished.emit()
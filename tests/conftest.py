@@ -0,0 +1,17 @@
+from datetime import date
+
+import pytest
+
+from las_trx.config import ReferenceConfig, TransformConfig, TrxCoordType, TrxReference, TrxVd
+
+
+@pytest.fixture
+def transform_config() -> TransformConfig:
+    return TransformConfig(
+        origin=ReferenceConfig(
+            ref_frame=TrxReference.ITRF14, vd=TrxVd.GRS80, coord_type=TrxCoordType.UTM10, epoch=date(2020, 1, 1)
+        ),
+        destination=ReferenceConfig(
+            ref_frame=TrxReference.NAD83CSRS, vd=TrxVd.GRS80, coord_type=TrxCoordType.UTM10, epoch=date(2010, 1, 1)
+        ),
+    )
@@ -0,0 +1,82 @@
+import asyncio
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import ClassVar
+
+import pytest
+
+from las_trx.aio import FileResult, TransformProgress, transform_files
+from las_trx.config import TransformConfig
+
+
+class FakeManager:
+    """Stand-in for TransformationManager that runs each file as a short sleep."""
+
+    instances: ClassVar[list["FakeManager"]] = []
+
+    def __init__(self, config: TransformConfig, input_pattern: str, output_pattern: str) -> None:
+        self.files = [Path(f"{i}.las") for i in range(int(input_pattern))]
+        self.total_iterations = len(self.files)
+        self.chunks = 0
+        self.cancelled = threading.Event()
+        self.finished = threading.Event()
+        FakeManager.instances.append(self)
+
+    def execute_transformations(self) -> Iterator[tuple[Path, Path, Exception | None]]:
+        try:
+            for input_file in self.files:
+                if self.cancelled.is_set():
+                    return
+                time.sleep(0.05)
+                self.chunks += 1
+                error = RuntimeError("boom") if input_file.stem == "1" else None
+                yield input_file, input_file.with_suffix(".laz"), error
+        finally:
+            self.finished.set()
+
+    def progress(self) -> int:
+        return self.chunks
+
+    def cancel(self) -> None:
+        self.cancelled.set()
+
+
+@pytest.fixture(autouse=True)
+def fake_manager(monkeypatch: pytest.MonkeyPatch) -> None:
+    FakeManager.instances = []
+    monkeypatch.setattr("las_trx.aio.TransformationManager", FakeManager)
+
+
+def test_results_and_progress(transform_config: TransformConfig) -> None:
+    async def collect() -> list[object]:
+        return [event async for event in transform_files(transform_config, "3", "{}", progress_interval=0.01)]
+
+    events = asyncio.run(collect())
+
+    results = [event for event in events if isinstance(event, FileResult)]
+    assert [result.input_file.name for result in results] == ["0.las", "1.las", "2.las"]
+    assert [result.error is not None for result in results] == [False, True, False]
+    progress = [event for event in events if isinstance(event, TransformProgress)]
+    assert progress[-1] == TransformProgress(3, 3)
+
+
+def test_cancelling_task_stops_submission(transform_config: TransformConfig) -> None:
+    async def consume() -> None:
+        async for _ in transform_files(transform_config, "100", "{}"):
+            pass
+
+    async def cancel_soon() -> None:
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.2)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_soon())
+
+    manager = FakeManager.instances[0]
+    assert manager.cancelled.is_set()
+    assert manager.finished.wait(1)
+    assert manager.chunks < 100
@@ -0,0 +1,86 @@
+import laspy
+import numpy as np
+import pytest
+
+from las_trx.api import transform_coordinates, transform_las
+from las_trx.config import FilterConfig, TransformConfig, TrxEpochMode, TrxFilterFrame
+
+
+class ShiftTransformer:
+    """Stand-in for CSRSTransformer that shifts coordinates by a fixed amount."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self, coords: np.ndarray) -> list[tuple[float, float, float]]:
+        self.calls += 1
+        return [(x + 1000.0, y - 1000.0, z + 1.0) for x, y, z in coords]
+
+
+@pytest.fixture
+def transformer(monkeypatch: pytest.MonkeyPatch) -> ShiftTransformer:
+    fake = ShiftTransformer()
+    monkeypatch.setattr("las_trx.api.get_transformer", lambda config: fake)
+    return fake
+
+
+def test_transform_coordinates_in_chunks(transformer: ShiftTransformer, transform_config: TransformConfig) -> None:
+    coords = np.arange(30, dtype=np.float64).reshape(10, 3)
+    result = transform_coordinates(coords, transform_config, chunk_size=4)
+
+    assert transformer.calls == 3
+    np.testing.assert_allclose(result, coords + np.array([1000.0, -1000.0, 1.0]))
+    assert result is not coords
+
+
+def test_transform_coordinates_rejects_bad_shape(transform_config: TransformConfig) -> None:
+    with pytest.raises(ValueError, match=r"\(N, 3\)"):
+        transform_coordinates(np.zeros((4, 2)), transform_config)
+
+
+@pytest.mark.parametrize(
+    ("update", "message"),
+    [({"epoch_mode": TrxEpochMode.GPS_TIME}, "GPS time"), ({"filters": FilterConfig(classifications=[2])}, "Filters")],
+)
+def test_transform_coordinates_rejects_configs_needing_points(
+    transform_config: TransformConfig, update: dict, message: str
+) -> None:
+    with pytest.raises(ValueError, match=message):
+        transform_coordinates(np.zeros((4, 3)), transform_config.model_copy(update=update))
+
+
+def test_transform_las(transformer: ShiftTransformer, transform_config: TransformConfig) -> None:
+    header = laspy.LasHeader(point_format=3, version="1.2")
+    header.scales = np.array([0.001, 0.001, 0.001])
+    header.offsets = np.array([480_000.0, 5_400_000.0, 0.0])
+    las = laspy.LasData(header)
+    las.x = np.linspace(480_000, 481_000, 25)
+    las.y = np.linspace(5_400_000, 5_401_000, 25)
+    las.z = np.linspace(0, 10, 25)
+    las.intensity = np.arange(25)
+
+    result = transform_las(las, transform_config, chunk_size=10)
+
+    assert transformer.calls == 3
+    np.testing.assert_allclose(result.x, las.x + 1000.0, atol=0.01)
+    np.testing.assert_allclose(result.y, las.y - 1000.0, atol=0.01)
+    np.testing.assert_array_equal(result.intensity, las.intensity)
+    np.testing.assert_allclose(result.header.offsets, [481_000.0, 5_399_000.0, 1.0])
+    assert result.header.parse_crs() == transform_config.destination.crs
+    np.testing.assert_allclose(las.x[0], 480_000.0)
+
+
+def test_transform_las_applies_filters(transformer: ShiftTransformer, transform_config: TransformConfig) -> None:
+    las = laspy.LasData(laspy.LasHeader(point_format=3, version="1.2"))
+    las.x = np.arange(10.0)
+    las.y = np.full(10, 1000.0)
+    las.z = np.zeros(10)
+    las.classification = np.array([2, 1] * 5)
+    # The box is in the destination frame, shifted by 1000 in X
+    filters = FilterConfig(frame=TrxFilterFrame.DESTINATION, bbox=(1003.0, -1.0, 1100.0, 1.0), classifications=[2])
+
+    result = transform_las(las, transform_config.model_copy(update={"filters": filters}), chunk_size=4)
+
+    np.testing.assert_allclose(result.x, [1004.0, 1006.0, 1008.0])
+    np.testing.assert_array_equal(result.classification, [2, 2, 2])
+    assert len(las.points) == 10
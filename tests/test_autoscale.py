@@ -0,0 +1,56 @@
+from las_trx.autoscale import WorkerAutoscaler
+
+
+def run_windows(autoscaler: WorkerAutoscaler, rate_for: dict[int, float], utilization: float, windows: int) -> None:
+    """Drive the autoscaler with a throughput curve that only depends on the worker count."""
+    now = points = cpu = 0.0
+    autoscaler.update(int(points), cpu, autoscaler.target, now)
+    for _ in range(windows):
+        target = autoscaler.target
+        now += autoscaler.window
+        points += rate_for[target] * autoscaler.window
+        cpu += utilization * target * autoscaler.window
+        autoscaler.update(int(points), cpu, target, now)
+
+
+def test_cpu_bound_doubles_until_max() -> None:
+    autoscaler = WorkerAutoscaler(max_workers=16, initial_workers=2, window=1.0)
+    rates = {2: 100, 4: 200, 8: 400, 16: 800}
+    run_windows(autoscaler, rates, utilization=0.95, windows=20)
+
+    assert autoscaler.settled
+    assert autoscaler.target == 16
+
+
+def test_io_bound_steps_by_one_and_settles_on_best() -> None:
+    autoscaler = WorkerAutoscaler(max_workers=32, initial_workers=2, window=1.0)
+    rates = {2: 100, 3: 140, 4: 150, 5: 120}
+    run_windows(autoscaler, rates, utilization=0.3, windows=20)
+
+    assert autoscaler.settled
+    assert autoscaler.target == 4
+    assert set(autoscaler.history) == {2, 3, 4, 5}
+
+
+def test_no_gain_falls_back() -> None:
+    autoscaler = WorkerAutoscaler(max_workers=8, initial_workers=2, window=1.0)
+    rates = {2: 100, 4: 101}
+    run_windows(autoscaler, rates, utilization=0.9, windows=10)
+
+    assert autoscaler.settled
+    assert autoscaler.target == 2
+
+
+def test_waits_for_full_window() -> None:
+    autoscaler = WorkerAutoscaler(max_workers=8, initial_workers=2, window=5.0)
+    assert autoscaler.update(0, 0.0, 2, now=0.0) == 2
+    assert autoscaler.update(1_000_000, 10.0, 2, now=4.9) == 2
+    assert not autoscaler.history
+
+
+def test_window_without_progress_is_extended() -> None:
+    autoscaler = WorkerAutoscaler(max_workers=8, initial_workers=2, window=1.0)
+    autoscaler.update(0, 0.0, 2, now=0.0)
+    autoscaler.update(0, 0.0, 2, now=10.0)
+    assert not autoscaler.settled
+    assert autoscaler.update(1_000, 22.0, 2, now=11.0) == 4
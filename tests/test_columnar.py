@@ -0,0 +1,54 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from las_trx.columnar import ColumnarWriter, parquet_copy_path
+from las_trx.config import TransformConfig
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+class FakePoints:
+    """Stand-in for a laspy point record with a few dimensions."""
+
+    def __init__(self, n: int) -> None:
+        self.point_format = SimpleNamespace(dimension_names=["X", "Y", "Z", "intensity", "normals"])
+        self.dimensions = {
+            "intensity": np.arange(n, dtype=np.uint16),
+            "normals": np.ones((n, 3), dtype=np.float32),
+        }
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.dimensions[name]
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".arrow"])
+def test_columnar_writer(tmp_path: Path, transform_config: TransformConfig, suffix: str) -> None:
+    path = tmp_path / f"out{suffix}"
+    coords = np.arange(15, dtype=np.float64).reshape(5, 3)
+    with ColumnarWriter(path, header=None, crs=transform_config.destination.crs) as writer:
+        writer.write_points(FakePoints(3), coords[:3])
+        writer.write_points(FakePoints(2), coords[3:])
+
+    if suffix == ".parquet":
+        table = pq.read_table(path)
+        assert pq.ParquetFile(path).num_row_groups == 2
+    else:
+        table = pa.ipc.open_file(path).read_all()
+
+    assert table.column_names == ["x", "y", "z", "intensity", "normals"]
+    np.testing.assert_array_equal(table["x"].to_numpy(), coords[:, 0])
+    np.testing.assert_array_equal(table["intensity"].to_numpy(), [0, 1, 2, 0, 1])
+    assert table["normals"].type == pa.list_(pa.float32(), 3)
+    assert b"NAD83" in table.schema.metadata[b"crs"]
+
+
+def test_parquet_copy_path(transform_config: TransformConfig) -> None:
+    assert parquet_copy_path(transform_config, Path("out.laz")) is None
+
+    config = transform_config.model_copy(update={"parquet_copy": True})
+    assert parquet_copy_path(config, Path("out.laz")) == Path("out.parquet")
+    assert parquet_copy_path(config, Path("out.parquet")) is None
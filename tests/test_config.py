@@ -1,5 +1,8 @@
 from datetime import date
 
+import pytest
+from pyproj import CRS
+
 from las_trx.config import (
     ReferenceConfig,
     TransformConfig,
@@ -443,3 +446,38 @@ def test_t_crs_itrf_cart_cgvd28() -> None:
     )
     assert config.destination.crs.is_geocentric
     # assert config.destination.crs.name == "ITRF2014 + CGVD28 height"
+
+
+@pytest.mark.parametrize(
+    ("ref_frame", "coord_type", "vd"),
+    [
+        (TrxReference.NAD83CSRS, TrxCoordType.UTM10, TrxVd.CGG2013A),
+        (TrxReference.NAD83CSRS, TrxCoordType.GEOG, TrxVd.HT2_2010v70),
+        (TrxReference.ITRF14, TrxCoordType.UTM9, TrxVd.GRS80),
+        (TrxReference.ITRF20, TrxCoordType.CART, TrxVd.GRS80),
+        (TrxReference.WGS84, TrxCoordType.GEOG, TrxVd.WGS84),
+    ],
+)
+def test_reference_from_crs_round_trip(ref_frame: TrxReference, coord_type: TrxCoordType, vd: TrxVd) -> None:
+    reference = ReferenceConfig(ref_frame=ref_frame, coord_type=coord_type, vd=vd, epoch=date(2010, 1, 1))
+    assert ReferenceConfig.from_crs(CRS.from_wkt(reference.crs.to_wkt()), date(2010, 1, 1)) == reference
+
+
+def test_reference_from_epsg_crs() -> None:
+    # NAD83(CSRS)v7 / UTM zone 10N
+    reference = ReferenceConfig.from_crs(CRS.from_epsg(22710), date(2010, 1, 1))
+    assert (reference.ref_frame, reference.coord_type, reference.vd) == (
+        TrxReference.NAD83CSRS,
+        TrxCoordType.UTM10,
+        TrxVd.GRS80,
+    )
+
+    # NAD83(CSRS) / UTM zone 10N + CGVD2013 height
+    assert ReferenceConfig.from_crs(CRS.from_epsg(6653), date(2010, 1, 1)).vd == TrxVd.CGG2013
+
+
+def test_reference_from_unsupported_crs() -> None:
+    with pytest.raises(ValueError, match="northern UTM"):
+        ReferenceConfig.from_crs(CRS.from_epsg(32710), date(2010, 1, 1))
+    with pytest.raises(ValueError, match="reference frame"):
+        ReferenceConfig.from_crs(CRS.from_epsg(4267), date(2010, 1, 1))
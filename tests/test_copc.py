@@ -0,0 +1,71 @@
+from pathlib import Path
+
+import laspy
+import numpy as np
+import pytest
+
+from las_trx.copc import CopcWriter, is_copc
+from las_trx.file_operations import ensure_output_extension, output_suffix
+from las_trx.spool import _partial_path
+
+
+def test_copc_extension() -> None:
+    assert ensure_output_extension(Path("out/a.copc")) == Path("out/a.copc.laz")
+    assert ensure_output_extension(Path("out/a.COPC.laz")) == Path("out/a.COPC.laz")
+    assert is_copc(Path("out/a.copc.laz"))
+    assert not is_copc(Path("out/a.laz"))
+
+
+def test_output_suffix_keeps_copc() -> None:
+    assert output_suffix(Path("a.b.copc.laz")) == ".copc.laz"
+    assert output_suffix(Path("a.b.laz")) == ".laz"
+    assert is_copc(_partial_path(Path("out/a.copc.laz"), "job1"))
+    assert _partial_path(Path("out/a.laz"), "job1").suffix == ".laz"
+
+
+def test_copc_round_trip_keeps_colour(tmp_path: Path) -> None:
+    pytest.importorskip("lazrs")
+    rng = np.random.default_rng(0)
+    header = laspy.LasHeader(point_format=3, version="1.2")
+    header.scales = np.array([0.01, 0.01, 0.01])
+    header.offsets = np.array([500_000.0, 5_400_000.0, 0.0])
+    points = laspy.ScaleAwarePointRecord.zeros(250_000, header=header)
+    points.x = rng.uniform(500_000, 501_000, len(points))
+    points.y = rng.uniform(5_400_000, 5_401_000, len(points))
+    points.z = rng.uniform(0, 100, len(points))
+    points.red = rng.integers(0, 65536, len(points))
+    points.green = rng.integers(0, 65536, len(points))
+    points.blue = rng.integers(0, 65536, len(points))
+    path = tmp_path / "a.copc.laz"
+
+    with CopcWriter(path, header) as writer:
+        for start in range(0, len(points), 100_000):
+            writer.write_points(points[start : start + 100_000])
+
+    with laspy.CopcReader.open(str(path)) as reader:
+        assert reader.header.point_count == len(points)
+        assert reader.header.point_format.id == 7
+        everything = reader.query()
+        box = laspy.Bounds(mins=np.array([500_100.0, 5_400_100.0]), maxs=np.array([500_300.0, 5_400_200.0]))
+        queried = reader.query(bounds=box)
+
+    assert len(everything) == len(points)
+    order = np.lexsort((everything.Y, everything.X))
+    expected = np.lexsort((points.Y, points.X))
+    for name in ("X", "Y", "Z", "red", "green", "blue"):
+        np.testing.assert_array_equal(np.asarray(everything[name])[order], np.asarray(points[name])[expected])
+
+    inside = (
+        (np.asarray(points.x) >= 500_100)
+        & (np.asarray(points.x) <= 500_300)
+        & (np.asarray(points.y) >= 5_400_100)
+        & (np.asarray(points.y) <= 5_400_200)
+    )
+    queried_inside = (
+        (np.asarray(queried.x) >= 500_100)
+        & (np.asarray(queried.x) <= 500_300)
+        & (np.asarray(queried.y) >= 5_400_100)
+        & (np.asarray(queried.y) <= 5_400_200)
+    )
+    assert np.count_nonzero(queried_inside) == np.count_nonzero(inside) > 0
+    assert len(queried) < len(points)
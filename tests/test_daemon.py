@@ -0,0 +1,145 @@
+import json
+import os
+import stat
+import threading
+import time
+from collections.abc import Iterator
+from http.client import HTTPConnection
+from pathlib import Path
+from urllib.request import Request, urlopen
+
+import pytest
+
+from las_trx import daemon
+from las_trx.config import TransformConfig, TrxExecutor
+from las_trx.daemon import TransformHTTPServer, TransformService
+
+
+@pytest.fixture
+def fake_transform(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    started = []
+
+    def transform(
+        config: object, input_file: Path, output_file: Path, lock: object, progress: object, **kwargs: object
+    ) -> None:
+        started.append(input_file.name)
+        time.sleep(0.02)
+        with lock:
+            progress.value += 1
+        if input_file.stem == "bad":
+            raise RuntimeError("boom")
+
+    monkeypatch.setattr("las_trx.daemon.transform_file", transform)
+    monkeypatch.setattr("las_trx.daemon.count_chunks", lambda files, config: len(files))
+    return started
+
+
+def drain(job: object) -> list[dict]:
+    events = []
+    while not events or events[-1]["event"] != "done":
+        events.append(job.events.get(timeout=5))
+    return events
+
+
+def test_jobs_take_turns(fake_transform: list[str], transform_config: TransformConfig) -> None:
+    with TransformService(1, TrxExecutor.THREAD) as service:
+        # Hold the only worker so both jobs are queued before dispatch starts
+        with service._cond:
+            service._running = 1
+            first = service.submit(
+                transform_config, [Path(f"a{i}.las") for i in range(3)], [Path(f"a{i}.laz") for i in range(3)]
+            )
+            second = service.submit(
+                transform_config, [Path(f"b{i}.las") for i in range(2)], [Path(f"b{i}.laz") for i in range(2)]
+            )
+            service._running = 0
+            service._cond.notify_all()
+
+        assert drain(first)[-1] == {"event": "done", "job": first.job_id, "succeeded": 3, "failed": 0}
+        assert drain(second)[-1]["succeeded"] == 2
+
+    assert fake_transform == ["a0.las", "b0.las", "a1.las", "b1.las", "a2.las"]
+
+
+def test_submit_rejects_detected_origins(transform_config: TransformConfig) -> None:
+    config = transform_config.model_copy(update={"detect_origin": True})
+
+    with TransformService(1, TrxExecutor.THREAD) as service, pytest.raises(ValueError, match="Origins cannot"):
+        service.submit(config, [Path("a.las")], [Path("a.laz")])
+
+
+def test_http_job_streams_events(fake_transform: list[str], tmp_path: Path, transform_config: TransformConfig) -> None:
+    (tmp_path / "good.las").write_bytes(b"")
+    (tmp_path / "bad.las").write_bytes(b"")
+    body = {
+        "config": json.loads(transform_config.model_dump_json()),
+        "input": str(tmp_path / "*.las"),
+        "output": "{}_out.laz",
+    }
+
+    service = TransformService(2, TrxExecutor.THREAD)
+    with service, TransformHTTPServer(("127.0.0.1", 0), service) as server:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+
+        with urlopen(f"{url}/health") as response:  # noqa: S310
+            assert json.load(response)["workers"] == 2
+
+        headers = {"Content-Type": "application/json"}
+        request = Request(f"{url}/jobs", data=json.dumps(body).encode(), headers=headers, method="POST")  # noqa: S310
+        with urlopen(request) as response:  # noqa: S310
+            events = [json.loads(line) for line in response]
+        server.shutdown()
+
+    assert events[0]["event"] == "accepted"
+    assert events[0]["files"] == 2
+    errors = {Path(e["input"]).stem: e["error"] for e in events if e["event"] == "file"}
+    assert errors == {"good": None, "bad": "boom"}
+    assert events[-1]["succeeded"] == 1
+    assert events[-1]["failed"] == 1
+
+
+SERVICE_KEY = "secret"
+
+
+@pytest.fixture
+def server(transform_config: TransformConfig) -> Iterator[TransformHTTPServer]:
+    service = TransformService(1, TrxExecutor.THREAD)
+    with service, TransformHTTPServer(("127.0.0.1", 0), service, token=SERVICE_KEY) as server:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield server
+        server.shutdown()
+
+
+def post_job(server: TransformHTTPServer, headers: dict[str, str]) -> int:
+    connection = HTTPConnection("127.0.0.1", server.server_address[1])
+    connection.request("POST", "/jobs", body=b"{}", headers=headers)
+    status = connection.getresponse().status
+    connection.close()
+    return status
+
+
+@pytest.mark.parametrize(
+    ("headers", "status"),
+    [
+        ({"Content-Type": "text/plain"}, 415),
+        ({"Origin": "https://example.com"}, 403),
+        ({"Host": "rebound.example.com"}, 403),
+        ({"Authorization": "Bearer wrong"}, 401),
+        ({}, 400),
+    ],
+)
+def test_requests_web_pages_could_send_are_refused(
+    server: TransformHTTPServer, headers: dict[str, str], status: int
+) -> None:
+    headers = {"Content-Type": "application/json", "Authorization": f"Bearer {SERVICE_KEY}", **headers}
+    assert post_job(server, headers) == status
+
+
+@pytest.mark.skipif(os.name != "posix", reason="Unix sockets require POSIX")
+def test_unix_socket_is_private(tmp_path: Path) -> None:
+    service = TransformService(1, TrxExecutor.THREAD)
+    with service, daemon.TransformUnixServer(tmp_path / "las-trx.sock", service):
+        assert stat.S_IMODE((tmp_path / "las-trx.sock").stat().st_mode) == 0o600
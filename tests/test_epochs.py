@@ -0,0 +1,48 @@
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from las_trx.config import TransformConfig, TrxEpochMode
+from las_trx.epochs import split_by_epoch
+from las_trx.transformation import transform_coords
+
+
+def adjusted_gps_time(when: datetime) -> float:
+    return (when - datetime(1980, 1, 6)).total_seconds() - 1e9
+
+
+@pytest.fixture
+def gps_config(transform_config: TransformConfig) -> TransformConfig:
+    return transform_config.model_copy(update={"epoch_mode": TrxEpochMode.GPS_TIME, "epoch_resolution_days": 1})
+
+
+def test_split_by_epoch(gps_config: TransformConfig) -> None:
+    gps_time = np.array([
+        adjusted_gps_time(datetime(2019, 6, 1, 12)),
+        adjusted_gps_time(datetime(2021, 3, 2, 8)),
+        adjusted_gps_time(datetime(2019, 6, 1, 23)),
+    ])
+
+    buckets = [(config.origin.epoch, indices.tolist()) for config, indices in split_by_epoch(gps_config, gps_time)]
+
+    assert buckets == [(date(2019, 6, 1), [0, 2]), (date(2021, 3, 2), [1])]
+
+
+def test_transform_coords_per_epoch(monkeypatch: pytest.MonkeyPatch, gps_config: TransformConfig) -> None:
+    def fake_transformer(config: TransformConfig) -> object:
+        # Shift X by the origin year, so each point shows the epoch it was transformed at
+        calls.append(config.origin.epoch)
+        return lambda coords: [(x + config.origin.epoch.year, y, z) for x, y, z in coords]
+
+    calls = []
+    monkeypatch.setattr("las_trx.transformation.get_transformer", fake_transformer)
+    points = SimpleNamespace(
+        gps_time=np.array([adjusted_gps_time(datetime(year, 1, 1, 12)) for year in (2018, 2020, 2018, 2020)])
+    )
+
+    result = transform_coords(gps_config, None, np.zeros((4, 3)), points)
+
+    assert len(calls) == 2
+    np.testing.assert_array_equal(result[:, 0], [2018, 2020, 2018, 2020])
@@ -0,0 +1,111 @@
+import shutil
+from pathlib import Path
+from types import SimpleNamespace
+
+import laspy
+import numpy as np
+import pytest
+
+from las_trx.config import TransformConfig, TrxExecutor, TrxSortOrder, TrxSpaceCheck
+from las_trx.constants import CopcConstants, SortConstants
+from las_trx.estimate import disk_estimates, existing_parent, format_duration
+from las_trx.transformation import TransformationError, TransformationManager
+
+
+def test_outputs_are_summed_per_filesystem(tmp_path: Path) -> None:
+    outputs = {tmp_path / "out" / "a.laz": 1000.0, tmp_path / "out" / "{x}_{y}.laz": 500.0}
+
+    (disk,) = disk_estimates(outputs, set())
+
+    assert disk.path == tmp_path
+    assert disk.needed_bytes == 1500
+    assert disk.fits
+
+
+def test_outputs_larger_than_free_space_do_not_fit(tmp_path: Path) -> None:
+    free = shutil.disk_usage(tmp_path).free
+
+    (disk,) = disk_estimates({tmp_path / "a.laz": float(free)}, set())
+
+    assert not disk.fits
+
+
+def test_existing_outputs_count_as_free(tmp_path: Path) -> None:
+    output = tmp_path / "a.laz"
+    output.write_bytes(b"\0" * 400)
+
+    (disk,) = disk_estimates({output: 1000.0}, {output})
+
+    assert disk.needed_bytes == 600
+
+
+def test_existing_parent_and_duration(tmp_path: Path) -> None:
+    assert existing_parent(tmp_path / "a" / "b" / "c.laz") == tmp_path
+    assert format_duration(42.4) == "42 s"
+    assert format_duration(125) == "2 min 05 s"
+    assert format_duration(3 * 3600 + 7 * 60 + 30) == "3 h 07 min"
+
+
+def write_las(path: Path, point_count: int) -> None:
+    las = laspy.LasData(laspy.LasHeader(point_format=3, version="1.2"))
+    las.x = np.linspace(500_000.0, 500_100.0, point_count)
+    las.y = np.linspace(5_500_000.0, 5_500_100.0, point_count)
+    las.z = np.linspace(0.0, 10.0, point_count)
+    las.write(path)
+
+
+@pytest.fixture
+def identity_transformer(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("las_trx.transformation.get_transformer", lambda config: lambda coords: coords)
+
+
+@pytest.mark.usefixtures("identity_transformer")
+def test_run_is_estimated_per_output(tmp_path: Path, transform_config: TransformConfig) -> None:
+    write_las(tmp_path / "a.las", 1000)
+    write_las(tmp_path / "b.las", 3000)
+    config = transform_config.model_copy(update={"executor": TrxExecutor.THREAD, "max_workers": 1})
+    manager = TransformationManager(config, str(tmp_path / "*.las"), str(tmp_path / "out" / "{}.las"))
+
+    estimate = manager.estimate(seed=0)
+
+    assert estimate.point_count == 4000
+    assert estimate.seconds > 0
+    # Uncompressed outputs take the record size of each point
+    assert estimate.output_bytes == 4000 * 34
+    assert estimate.fits
+    assert not (tmp_path / "out").exists()
+
+
+@pytest.mark.usefixtures("identity_transformer")
+def test_temporary_files_of_the_largest_input_are_counted(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, transform_config: TransformConfig
+) -> None:
+    pytest.importorskip("lazrs")
+    monkeypatch.setattr(SortConstants, "RUN_POINTS", 100)
+    monkeypatch.setattr(CopcConstants, "BUCKET_POINTS", 100)
+    write_las(tmp_path / "a.las", 1000)
+    write_las(tmp_path / "b.las", 3000)
+    config = transform_config.model_copy(
+        update={"executor": TrxExecutor.THREAD, "max_workers": 1, "sort_order": TrxSortOrder.MORTON}
+    )
+    manager = TransformationManager(config, str(tmp_path / "*.las"), str(tmp_path / "out" / "{}.copc.laz"))
+
+    estimate = manager.estimate(seed=0)
+
+    # Sort runs of format 3 records and their keys, and two copies of the points as format 7 COPC records
+    (disk,) = estimate.disks
+    assert disk.needed_bytes - estimate.output_bytes == 3000 * (34 + 8) + 2 * 3000 * 36
+
+
+@pytest.mark.usefixtures("identity_transformer")
+def test_refused_runs_write_nothing(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, transform_config: TransformConfig
+) -> None:
+    monkeypatch.setattr("las_trx.estimate.shutil.disk_usage", lambda path: SimpleNamespace(free=0))
+    write_las(tmp_path / "a.las", 1000)
+    config = transform_config.model_copy(update={"executor": TrxExecutor.THREAD, "space_check": TrxSpaceCheck.REFUSE})
+    manager = TransformationManager(config, str(tmp_path / "*.las"), str(tmp_path / "out" / "{}.laz"))
+
+    with pytest.raises(TransformationError, match="not to fit"):
+        list(manager.execute_transformations())
+    assert not (tmp_path / "out").exists()
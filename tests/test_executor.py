@@ -0,0 +1,73 @@
+import os
+from concurrent import futures
+
+import pytest
+
+from las_trx.config import TrxExecutor
+from las_trx.executor import (
+    THREAD_LIMIT_ENV_VARS,
+    ThreadCounter,
+    create_executor,
+    create_progress_tracker,
+    plan_worker_layout,
+    resolve_executor_backend,
+)
+
+
+def test_resolve_explicit_backend() -> None:
+    assert resolve_executor_backend(TrxExecutor.PROCESS) == TrxExecutor.PROCESS
+    assert resolve_executor_backend(TrxExecutor.THREAD) == TrxExecutor.THREAD
+
+
+def test_resolve_auto_backend(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("las_trx.executor.is_free_threaded", lambda: True)
+    assert resolve_executor_backend(TrxExecutor.AUTO) == TrxExecutor.THREAD
+
+    monkeypatch.setattr("las_trx.executor.is_free_threaded", lambda: False)
+    assert resolve_executor_backend(TrxExecutor.AUTO) == TrxExecutor.PROCESS
+
+
+def test_thread_backend_skips_manager() -> None:
+    manager, lock, counter = create_progress_tracker(TrxExecutor.THREAD)
+    assert manager is None
+    assert isinstance(counter, ThreadCounter)
+    with lock:
+        counter.value += 1
+    assert counter.value == 1
+
+    with create_executor(TrxExecutor.THREAD, 2) as pool:
+        assert isinstance(pool, futures.ThreadPoolExecutor)
+
+
+def test_layout_splits_cpus_between_workers(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("las_trx.executor.available_cpus", lambda: list(range(8)))
+    assert plan_worker_layout(4).threads_per_worker == 2
+    assert plan_worker_layout(16).threads_per_worker == 1
+    assert plan_worker_layout(4, threads_per_worker=3).threads_per_worker == 3
+
+
+@pytest.mark.skipif(not hasattr(os, "sched_setaffinity"), reason="CPU pinning requires Linux")
+def test_layout_pins_disjoint_cpu_sets(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("las_trx.executor.available_cpus", lambda: list(range(8)))
+    layout = plan_worker_layout(4, pin=True)
+    assert layout.cpu_sets == ((0, 1), (2, 3), (4, 5), (6, 7))
+
+    assert plan_worker_layout(4, threads_per_worker=4, pin=True).cpu_sets is None
+
+
+def _thread_limits() -> dict[str, str | None]:
+    return {name: os.environ.get(name) for name in THREAD_LIMIT_ENV_VARS}
+
+
+def test_thread_limits_apply_to_worker_processes_only(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OMP_NUM_THREADS", "7")
+    monkeypatch.delenv("RAYON_NUM_THREADS", raising=False)
+    layout = plan_worker_layout(1, threads_per_worker=2)
+
+    with create_executor(TrxExecutor.PROCESS, 1, layout=layout) as pool:
+        assert pool.submit(_thread_limits).result() == dict.fromkeys(THREAD_LIMIT_ENV_VARS, "2")
+    with create_executor(TrxExecutor.THREAD, 1, layout=layout) as pool:
+        assert pool.submit(_thread_limits).result()["OMP_NUM_THREADS"] == "7"
+
+    assert os.environ["OMP_NUM_THREADS"] == "7"
+    assert "RAYON_NUM_THREADS" not in os.environ
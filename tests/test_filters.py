@@ -0,0 +1,42 @@
+from pathlib import Path
+
+import laspy
+import numpy as np
+
+from las_trx.config import FilterConfig
+from las_trx.filters import source_mask, spatial_mask
+from las_trx.lax import LaxIndex, query_intervals
+
+
+def test_box_and_polygon() -> None:
+    filters = FilterConfig(bbox=(0.0, 0.0, 8.0, 10.0), polygon=[(0.0, 0.0), (10.0, 0.0), (0.0, 10.0)])
+    xy = np.array([[1.0, 1.0], [6.0, 6.0], [9.0, 0.5], [7.0, 1.0], [-1.0, 1.0]])
+
+    np.testing.assert_array_equal(spatial_mask(filters, xy), [True, False, False, True, False])
+
+
+def test_source_mask_by_attributes() -> None:
+    header = laspy.LasHeader(point_format=6, version="1.4")
+    points = laspy.ScaleAwarePointRecord.zeros(4, header=header)
+    points.classification = [2, 2, 9, 5]
+    points.return_number = [1, 2, 1, 1]
+    points.gps_time = [10.0, 20.0, 30.0, 40.0]
+
+    filters = FilterConfig(classifications=[2, 9], return_numbers=[1], gps_time=(0.0, 35.0))
+
+    np.testing.assert_array_equal(source_mask(filters, points), [True, False, True, False])
+
+
+def test_index_query_skips_far_cells(tmp_path: Path) -> None:
+    rng = np.random.default_rng(0)
+    west = rng.uniform([500_000, 5_400_000], [500_100, 5_400_100], size=(2000, 2))
+    east = rng.uniform([500_900, 5_400_900], [501_000, 5_401_000], size=(2000, 2))
+    xy = np.concatenate([west, east])
+    with LaxIndex(tmp_path / "a.lax", xy.min(axis=0), xy.max(axis=0)) as index:
+        index.add(xy[:, 0], xy[:, 1])
+
+    intervals = query_intervals(tmp_path / "a.lax", np.array([500_000, 5_400_000]), np.array([500_100, 5_400_100]))
+
+    selected = np.concatenate([np.arange(start, end + 1) for start, end in intervals])
+    assert set(range(2000)) <= set(selected.tolist())
+    assert selected.max() < 2000
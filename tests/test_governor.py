@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+
+from las_trx.constants import MemoryConstants
+from las_trx.governor import MemoryGovernor, estimate_task_memory, peak_rss_bytes
+
+MB = 1024**2
+
+
+def make_header(point_count: int, record_length: int = 34, evlr_start: int = 0, num_evlrs: int = 0) -> object:
+    return SimpleNamespace(
+        point_count=point_count,
+        point_format=SimpleNamespace(size=record_length),
+        offset_to_point_data=1_000,
+        start_of_first_evlr=evlr_start,
+        number_of_evlrs=num_evlrs,
+    )
+
+
+def test_estimate_scales_with_chunk_not_file() -> None:
+    small = estimate_task_memory(make_header(10_000), file_size=1 * MB, chunk_size=10_000)
+    large = estimate_task_memory(make_header(10_000_000), file_size=1_000 * MB, chunk_size=10_000)
+    assert small == large
+
+    bigger_chunks = estimate_task_memory(make_header(10_000_000), file_size=1_000 * MB, chunk_size=100_000)
+    assert bigger_chunks > large
+
+
+def test_estimate_counts_evlrs() -> None:
+    without = estimate_task_memory(make_header(10_000), file_size=500 * MB, chunk_size=10_000)
+    with_evlrs = estimate_task_memory(
+        make_header(10_000, evlr_start=400 * MB, num_evlrs=1), file_size=500 * MB, chunk_size=10_000
+    )
+    assert with_evlrs - without == 3 * 100 * MB
+
+
+def test_unlimited_governor_admits_everything() -> None:
+    governor = MemoryGovernor(None)
+    for _ in range(100):
+        assert governor.can_admit(10_000 * MB)
+        governor.admit(10_000 * MB)
+    assert governor.max_workers(64, 10_000 * MB) == 64
+
+
+def test_governor_admits_within_budget() -> None:
+    governor = MemoryGovernor(1_000, worker_overhead=100 * MB)
+    assert governor.max_workers(64, 100 * MB) == 5
+
+    for _ in range(5):
+        assert governor.can_admit(100 * MB)
+        governor.admit(100 * MB)
+    assert not governor.can_admit(100 * MB)
+
+    governor.release(100 * MB)
+    assert governor.can_admit(100 * MB)
+
+
+def test_governor_always_admits_first_task() -> None:
+    governor = MemoryGovernor(100, worker_overhead=MemoryConstants.WORKER_OVERHEAD_BYTES)
+    assert governor.can_admit(1_000 * MB)
+    governor.admit(1_000 * MB)
+    assert not governor.can_admit(1 * MB)
+
+
+def test_peak_rss_is_reported() -> None:
+    peak = peak_rss_bytes()
+    assert peak is None or peak > 0
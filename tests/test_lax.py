@@ -0,0 +1,62 @@
+import struct
+from pathlib import Path
+
+import numpy as np
+
+from las_trx.lax import LaxIndex, quadtree_bounds, quadtree_cells
+
+
+def read_lax(path: Path) -> tuple[int, np.ndarray, dict[int, tuple[int, list[tuple[int, int]]]]]:
+    """Parse a .lax file into its levels, bounds and cells of (point count, intervals)."""
+    data = path.read_bytes()
+    assert data[:4] == b"LASX"
+    assert data[8:12] == b"LASS"
+    assert data[16:20] == b"LASQ"
+    _, levels, _, _ = struct.unpack_from("<IIII", data, 20)
+    bounds = np.frombuffer(data, dtype="<f4", count=4, offset=36)
+    assert data[52:56] == b"LASV"
+    _, num_cells, _ = struct.unpack_from("<IIi", data, 56)
+
+    offset = 68
+    cells = {}
+    for _ in range(num_cells):
+        cell, num_intervals, num_points = struct.unpack_from("<iII", data, offset)
+        offset += 12
+        intervals = [struct.unpack_from("<II", data, offset + 8 * i) for i in range(num_intervals)]
+        offset += 8 * num_intervals
+        cells[cell] = (num_points, intervals)
+    assert offset == len(data)
+    return levels, bounds, cells
+
+
+def test_quadtree_bounds_snap_to_cells() -> None:
+    levels, bounds = quadtree_bounds(np.array([500_000.0, 5_400_000.0]), np.array([500_999.0, 5_400_999.0]))
+
+    # 100 cells of 10 m across, grown to 128
+    assert levels == 7
+    np.testing.assert_array_equal(bounds, np.array([499_860, 501_140, 5_399_860, 5_401_140], dtype=np.float32))
+
+
+def test_index_covers_every_point(tmp_path: Path) -> None:
+    rng = np.random.default_rng(0)
+    xy = rng.uniform(0, 1000, size=(5000, 2))
+    path = tmp_path / "tile.lax"
+
+    with LaxIndex(path, np.array([0.0, 0.0]), np.array([1000.0, 1000.0])) as index:
+        for start in range(0, len(xy), 700):
+            index.add(xy[start : start + 700, 0], xy[start : start + 700, 1])
+
+    levels, bounds, cells = read_lax(path)
+    assert sum(num_points for num_points, _ in cells.values()) == len(xy)
+    point_cells = quadtree_cells(xy[:, 0], xy[:, 1], levels, bounds)
+    for i, cell in enumerate(point_cells.tolist()):
+        assert any(start <= i <= end for start, end in cells[cell][1])
+
+
+def test_index_is_skipped_when_points_fall_outside(tmp_path: Path) -> None:
+    path = tmp_path / "tile.lax"
+
+    with LaxIndex(path, np.array([0.0, 0.0]), np.array([1000.0, 1000.0])) as index:
+        index.add(np.array([10.0, 5000.0]), np.array([10.0, 10.0]))
+
+    assert not path.exists()
@@ -0,0 +1,77 @@
+import json
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from las_trx.config import TransformConfig, TrxCoordType
+from las_trx.manifest import Manifest, ManifestError
+
+
+def test_read_csv_manifest_with_overrides(tmp_path: Path, transform_config: TransformConfig) -> None:
+    (tmp_path / "a.laz").touch()
+    (tmp_path / "b.laz").touch()
+    manifest_path = tmp_path / "batch.csv"
+    manifest_path.write_text(
+        "input,output,origin_epoch,destination_coord_type,flight\na.laz,,2019-06-01,,F1\nb.laz,done/b.laz,,UTM9,F2\n"
+    )
+
+    manifest = Manifest.read(manifest_path)
+    input_files, output_files = manifest.files(str(tmp_path / "out" / "{}_nad83.laz"))
+
+    assert input_files == [tmp_path / "a.laz", tmp_path / "b.laz"]
+    assert output_files == [tmp_path / "out" / "a_nad83.laz", tmp_path / "done" / "b.laz"]
+
+    a_config = manifest.entries[0].apply(transform_config)
+    assert a_config.origin.epoch == date(2019, 6, 1)
+    assert a_config.destination == transform_config.destination
+
+    b_config = manifest.entries[1].apply(transform_config)
+    assert b_config.origin == transform_config.origin
+    assert b_config.destination.coord_type == TrxCoordType.UTM9
+
+
+def test_read_jsonl_manifest(tmp_path: Path, transform_config: TransformConfig) -> None:
+    (tmp_path / "a.laz").touch()
+    manifest_path = tmp_path / "batch.jsonl"
+    manifest_path.write_text(json.dumps({"input": "a.laz", "origin": {"epoch": "2021-08-15"}}) + "\n\n")
+
+    manifest = Manifest.read(manifest_path)
+
+    assert manifest.entries[0].input == tmp_path / "a.laz"
+    assert manifest.entries[0].apply(transform_config).origin.epoch == date(2021, 8, 15)
+
+
+def test_write_results(tmp_path: Path) -> None:
+    for name in ("a.laz", "b.laz", "c.laz"):
+        (tmp_path / name).touch()
+    manifest_path = tmp_path / "batch.csv"
+    manifest_path.write_text("input,flight\na.laz,F1\nb.laz,F2\nc.laz,F3\n")
+    manifest = Manifest.read(manifest_path)
+    _, output_files = manifest.files(str(tmp_path / "{}_out.laz"))
+
+    errors = {tmp_path / "a.laz": None, tmp_path / "b.laz": "bad header"}
+    results_path = manifest.write_results(output_files, errors)
+
+    assert results_path == tmp_path / "batch.results.csv"
+    lines = results_path.read_text().splitlines()
+    assert lines[0] == "input,flight,output,status,error"
+    assert lines[1] == f"a.laz,F1,{tmp_path / 'a_out.laz'},done,"
+    assert lines[2] == f"b.laz,F2,{tmp_path / 'b_out.laz'},failed,bad header"
+    assert lines[3] == f"c.laz,F3,{tmp_path / 'c_out.laz'},skipped,"
+
+
+def test_missing_input_files(tmp_path: Path) -> None:
+    manifest_path = tmp_path / "batch.csv"
+    manifest_path.write_text("input\nmissing.laz\n")
+
+    with pytest.raises(ManifestError, match="1 input file"):
+        Manifest.read(manifest_path).files("{}_out.laz")
+
+
+def test_invalid_row(tmp_path: Path) -> None:
+    manifest_path = tmp_path / "batch.csv"
+    manifest_path.write_text("input,origin_epoch\na.laz,not a date\n")
+
+    with pytest.raises(ManifestError, match="Invalid row 1"):
+        Manifest.read(manifest_path)
@@ -0,0 +1,83 @@
+from pathlib import Path
+
+import laspy
+import numpy as np
+import pytest
+
+from las_trx.config import TransformConfig, TrxExecutor
+from las_trx.file_operations import discover_files
+from las_trx.merge import merged_point_format
+from las_trx.transformation import TransformationManager
+
+
+def with_extra_bytes(point_format_id: int, name: str, dtype: str) -> laspy.PointFormat:
+    point_format = laspy.PointFormat(point_format_id)
+    point_format.add_extra_dimension(laspy.ExtraBytesParams(name, dtype))
+    return point_format
+
+
+def test_merged_point_format_holds_all_dimensions() -> None:
+    assert merged_point_format([laspy.PointFormat(1), laspy.PointFormat(2)]).id == 3
+    assert merged_point_format([laspy.PointFormat(3), laspy.PointFormat(6)]).id == 7
+    assert merged_point_format([laspy.PointFormat(8), laspy.PointFormat(9)]).id == 10
+
+
+def test_merged_point_format_unions_extra_bytes() -> None:
+    merged = merged_point_format([with_extra_bytes(6, "height", "f4"), with_extra_bytes(6, "flight", "u2")])
+    assert list(merged.extra_dimension_names) == ["height", "flight"]
+
+    with pytest.raises(ValueError, match="'height'"):
+        merged_point_format([with_extra_bytes(6, "height", "f4"), with_extra_bytes(6, "height", "f8")])
+
+
+def test_merged_output_is_shared(tmp_path: Path, transform_config: TransformConfig) -> None:
+    (tmp_path / "a.laz").touch()
+    (tmp_path / "b.laz").touch()
+    config = transform_config.model_copy(update={"merge": True})
+
+    _, output_files = discover_files(str(tmp_path / "*.laz"), str(tmp_path / "project"), config)
+
+    assert output_files == [tmp_path / "project.laz"] * 2
+
+
+def merge_manager(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, config: TransformConfig) -> TransformationManager:
+    monkeypatch.setattr("las_trx.transformation.get_transformer", lambda config: lambda coords: coords)
+    (tmp_path / "in").mkdir()
+    (tmp_path / "out").mkdir()
+    for name in ("a", "b"):
+        las = laspy.LasData(laspy.LasHeader(point_format=3, version="1.2"))
+        las.x = las.y = las.z = np.arange(5.0)
+        las.write(tmp_path / "in" / f"{name}.las")
+    config = config.model_copy(update={"merge": True, "executor": TrxExecutor.THREAD, "max_workers": 1})
+    return TransformationManager(config, str(tmp_path / "in" / "*.las"), str(tmp_path / "out" / "project.las"))
+
+
+def test_failed_merges_are_reported_and_cleaned_up(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, transform_config: TransformConfig
+) -> None:
+    def failing_merge(config: TransformConfig, output_file: Path, *args: object) -> int:
+        output_file.write_bytes(b"partial")
+        raise OSError("disk full")
+
+    manager = merge_manager(tmp_path, monkeypatch, transform_config)
+    monkeypatch.setattr("las_trx.transformation.merge_fragments", failing_merge)
+
+    assert [exception for _, _, exception in manager.execute_transformations()] == [None, None]
+
+    assert list(manager.failed_merges) == [tmp_path / "out" / "project.las"]
+    assert not any((tmp_path / "out").iterdir())
+
+
+def test_cancelled_runs_are_not_merged(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, transform_config: TransformConfig
+) -> None:
+    manager = merge_manager(tmp_path, monkeypatch, transform_config)
+
+    results = []
+    for result in manager.execute_transformations():
+        results.append(result)
+        manager.cancel()
+
+    assert len(results) == 1
+    assert not manager.failed_merges
+    assert not any((tmp_path / "out").iterdir())
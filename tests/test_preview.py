@@ -0,0 +1,71 @@
+from pathlib import Path
+
+import laspy
+import numpy as np
+import pytest
+
+from las_trx.config import FilterConfig, TransformConfig, TrxExecutor
+from las_trx.preview import preview_report, sample_chunks
+from las_trx.transformation import TransformationManager
+
+
+def test_sample_draws_one_chunk_per_stratum() -> None:
+    rng = np.random.default_rng(0)
+    intervals = sample_chunks(1_000_000 + 5, 1000, 10, rng)
+
+    starts = [start for start, _ in intervals]
+    assert len(intervals) == 10
+    assert starts == sorted(starts)
+    # The 1001 chunks are split into strata of about 100, each drawn from once
+    for stratum, (start, end) in enumerate(intervals):
+        assert stratum * 100 <= start // 1000 < (stratum + 1) * 100 + 1
+        assert end == min(start + 999, 1_000_004)
+
+
+def test_sample_takes_every_chunk_of_small_inputs() -> None:
+    intervals = sample_chunks(2500, 1000, 10, np.random.default_rng(0))
+
+    assert intervals == [(0, 999), (1000, 1999), (2000, 2499)]
+
+
+def test_report_counts_failed_points() -> None:
+    coords = np.array([[0.0, 0.0, 10.0], [1.0, 1.0, 20.0], [2.0, 2.0, 30.0], [3.0, 3.0, 40.0]])
+    transformed = coords + np.array([5.0, 5.0, -1.5])
+    transformed[2] = np.nan
+    transformed[3] = np.inf
+
+    report = preview_report(Path("a.laz"), 100, 4, [coords], [transformed])
+
+    assert (report.nan_count, report.out_of_grid_count, report.failed_count) == (1, 1, 2)
+    np.testing.assert_allclose(report.mins, [5.0, 5.0, 8.5])
+    np.testing.assert_allclose(report.maxs, [6.0, 6.0, 18.5])
+    assert report.z_shift[50] == pytest.approx(-1.5)
+    assert "NaN: 1, out of grid: 1" in report.describe()
+
+
+def test_preview_writes_the_filtered_sample(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, transform_config: TransformConfig
+) -> None:
+    monkeypatch.setattr("las_trx.transformation.get_transformer", lambda config: lambda coords: coords + 1000)
+    for name, offset in (("a", 0.0), ("b", 500.0)):
+        las = laspy.LasData(laspy.LasHeader(point_format=3, version="1.2"))
+        las.x = np.arange(10.0) + offset
+        las.y = np.arange(10.0)
+        las.z = np.arange(10.0)
+        las.classification = np.array([2, 1] * 5)
+        las.write(tmp_path / f"{name}.las")
+    config = transform_config.model_copy(
+        update={"executor": TrxExecutor.THREAD, "filters": FilterConfig(classifications=[2])}
+    )
+    manager = TransformationManager(config, str(tmp_path / "*.las"), str(tmp_path / "out" / "{}.las"))
+
+    reports = manager.preview(tmp_path / "preview.laz", seed=0)
+
+    counts = sorted((r.input_file.name, r.sampled_points, r.kept_points) for r in reports)
+    assert counts == [("a.las", 10, 5), ("b.las", 10, 5)]
+    assert all(r.z_shift[50] == pytest.approx(1000) for r in reports)
+    preview = laspy.read(tmp_path / "preview.laz")
+    np.testing.assert_array_equal(preview.classification, [2] * 10)
+    np.testing.assert_allclose(np.sort(preview.x), [1000, 1002, 1004, 1006, 1008, 1500, 1502, 1504, 1506, 1508])
+    np.testing.assert_allclose(np.sort(preview.z), np.repeat([1000, 1002, 1004, 1006, 1008], 2))
+    assert not (tmp_path / "out").exists()
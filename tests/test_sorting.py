@@ -0,0 +1,48 @@
+from pathlib import Path
+
+import numpy as np
+
+from las_trx.config import TrxSortOrder
+from las_trx.sorting import PointSorter, curve_keys
+
+
+def test_hilbert_keys_visit_neighbouring_cells() -> None:
+    cells = np.array([(x, y) for x in range(8) for y in range(8)], dtype=np.float64)
+
+    keys = curve_keys(TrxSortOrder.HILBERT, cells, np.array([0.0, 0.0]), np.array([7.0, 7.0]), bits=3)
+
+    assert sorted(keys.tolist()) == list(range(64))
+    path = cells[np.argsort(keys)]
+    assert np.all(np.abs(np.diff(path, axis=0)).sum(axis=1) == 1)
+
+
+def test_morton_keys_interleave_bits() -> None:
+    cells = np.array([(0, 0), (1, 0), (0, 1), (1, 1), (2, 0), (3, 3)], dtype=np.float64)
+
+    keys = curve_keys(TrxSortOrder.MORTON, cells, np.array([0.0, 0.0]), np.array([3.0, 3.0]), bits=2)
+
+    assert keys.tolist() == [0, 1, 2, 3, 4, 15]
+
+
+def test_spilled_runs_merge_like_in_memory_sort(tmp_path: Path) -> None:
+    rng = np.random.default_rng(0)
+    xy = rng.uniform(0, 100, size=(1000, 2))
+    xy[500:] = xy[:500]  # Duplicates keep their input order
+    ids = np.arange(1000)
+    mins, maxs = np.array([0.0, 0.0]), np.array([100.0, 100.0])
+
+    results = []
+    for run_points in (10_000, 64):
+        with PointSorter(TrxSortOrder.HILBERT, mins, maxs, tmp_path, run_points=run_points) as sorter:
+            for start in range(0, 1000, 50):
+                sorter.add(xy[start : start + 50], [ids[start : start + 50], xy[start : start + 50]])
+            chunks = list(sorter.sorted_chunks(100))
+        assert all(len(chunk[0]) <= 100 for chunk in chunks)
+        results.append((np.concatenate([c[0] for c in chunks]), np.concatenate([c[1] for c in chunks])))
+
+    (in_memory_ids, _), (merged_ids, merged_xy) = results
+    np.testing.assert_array_equal(in_memory_ids, merged_ids)
+    np.testing.assert_array_equal(merged_xy, xy[merged_ids])
+    keys = curve_keys(TrxSortOrder.HILBERT, xy[merged_ids], mins, maxs)
+    assert np.all(np.diff(keys.astype(np.int64)) >= 0)
+    assert list(tmp_path.iterdir()) == []
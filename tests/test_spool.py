@@ -0,0 +1,116 @@
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from las_trx.config import TransformConfig, TrxExecutor
+from las_trx.spool import FileSpool, SpoolError, SpoolWorker
+
+
+@pytest.fixture
+def spool(tmp_path: Path, transform_config: TransformConfig) -> FileSpool:
+    (tmp_path / "in").mkdir()
+    (tmp_path / "out").mkdir()
+    for i in range(3):
+        (tmp_path / "in" / f"tile_{i}.laz").write_bytes(b"")
+
+    spool = FileSpool(tmp_path / "spool")
+    spool.submit(transform_config, str(tmp_path / "in" / "*.laz"), str(tmp_path / "out" / "{}.laz"))
+    return spool
+
+
+def test_submit_is_idempotent(spool: FileSpool, tmp_path: Path, transform_config: TransformConfig) -> None:
+    assert spool.counts() == {"pending": 3, "claimed": 0, "done": 0, "failed": 0}
+    assert spool.submit(transform_config, str(tmp_path / "in" / "*.laz"), str(tmp_path / "out" / "{}.laz")) == 0
+
+
+def test_submit_rejects_detected_origins(spool: FileSpool, tmp_path: Path, transform_config: TransformConfig) -> None:
+    config = transform_config.model_copy(update={"detect_origin": True})
+
+    with pytest.raises(SpoolError, match="Origins cannot be detected"):
+        spool.submit(config, str(tmp_path / "in" / "*.laz"), str(tmp_path / "out" / "{}_b.laz"))
+
+
+def test_jobs_are_claimed_once(spool: FileSpool, transform_config: TransformConfig) -> None:
+    other = FileSpool(spool.root)
+    claimed = [spool.claim("node-a"), other.claim("node-b"), spool.claim("node-a"), other.claim("node-b")]
+
+    job_ids = [job.job_id for job in claimed if job is not None]
+    assert len(job_ids) == 3
+    assert len(set(job_ids)) == 3
+    assert spool.load_config(claimed[0].config_hash) == transform_config
+
+
+def test_expired_lease_is_requeued(spool: FileSpool) -> None:
+    job = spool.claim("node-a")
+    assert spool.requeue_expired("node-b", lease=60) == 0
+
+    claimed_path = spool.root / "claimed" / f"{job.job_id}.json"
+    old = claimed_path.stat().st_mtime - 120
+    os.utime(claimed_path, (old, old))
+    assert spool.requeue_expired("node-b", lease=60) == 1
+    assert spool.counts()["pending"] == 3
+
+
+def test_old_jobs_are_not_requeued_while_claimed(spool: FileSpool, monkeypatch: pytest.MonkeyPatch) -> None:
+    for path in (spool.root / "pending").glob("*.json"):
+        os.utime(path, (path.stat().st_mtime - 120,) * 2)
+    other = FileSpool(spool.root)
+    requeued = []
+    rename = Path.rename
+
+    def rename_then_requeue(self: Path, target: Path) -> Path:
+        # Another node checks the leases right after the job is moved to claimed
+        result = rename(self, target)
+        requeued.append(other.requeue_expired("node-b", lease=60))
+        return result
+
+    monkeypatch.setattr(Path, "rename", rename_then_requeue)
+    job = spool.claim("node-a")
+
+    assert job is not None
+    assert requeued == [0]
+
+
+def test_results_are_recorded(spool: FileSpool) -> None:
+    spool.finish(spool.claim("node-a"), "node-a")
+    spool.finish(spool.claim("node-a"), "node-a", RuntimeError("boom"))
+    assert spool.counts() == {"pending": 1, "claimed": 0, "done": 1, "failed": 1}
+
+    assert spool.requeue_failed() == 1
+    assert spool.counts()["pending"] == 2
+
+
+def test_worker_drains_spool(spool: FileSpool, monkeypatch: pytest.MonkeyPatch) -> None:
+    def fake_transform(
+        config: TransformConfig, input_file: Path, output_file: Path, *args: object, **kwargs: object
+    ) -> None:
+        if input_file.stem == "tile_1":
+            raise RuntimeError("boom")
+        output_file.write_bytes(b"transformed")
+
+    monkeypatch.setattr("las_trx.spool.transform_file", fake_transform)
+    with SpoolWorker(spool, max_workers=2, poll_interval=0.01, executor=TrxExecutor.THREAD) as worker:
+        assert worker.run() == (2, 1)
+
+    outputs = sorted(p.name for p in (spool.root.parent / "out").iterdir())
+    assert outputs == ["tile_0.laz", "tile_2.laz"]
+    assert spool.counts() == {"pending": 0, "claimed": 0, "done": 2, "failed": 1}
+
+
+def test_heartbeat_survives_errors(spool: FileSpool, monkeypatch: pytest.MonkeyPatch) -> None:
+    beats = []
+
+    def flaky_heartbeat(worker_id: str, job_ids: list[str]) -> None:
+        beats.append(job_ids)
+        if len(beats) == 1:
+            raise ValueError("unreadable claim")
+
+    monkeypatch.setattr(spool, "heartbeat", flaky_heartbeat)
+    with SpoolWorker(spool, max_workers=1, lease=0.03, executor=TrxExecutor.THREAD):
+        deadline = time.monotonic() + 5
+        while len(beats) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    assert len(beats) >= 2
@@ -0,0 +1,131 @@
+import time
+from pathlib import Path
+
+import laspy
+import numpy as np
+import pytest
+
+from las_trx.config import StagingConfig, TargetConfig, TransformConfig, TrxExecutor
+from las_trx.lax import lax_path
+from las_trx.staging import ScratchStager, StagingError
+from las_trx.transformation import TransformationManager, transform_file
+
+
+def make_jobs(tmp_path: Path, count: int) -> list[tuple[Path, Path]]:
+    (tmp_path / "in").mkdir()
+    (tmp_path / "out").mkdir()
+    jobs = []
+    for i in range(count):
+        input_file = tmp_path / "in" / f"{i}.las"
+        input_file.write_bytes(bytes([i]) * 100)
+        jobs.append((input_file, tmp_path / "out" / f"{i}.laz"))
+    return jobs
+
+
+def wait_until_ready(stager: ScratchStager, input_file: Path, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not stager.is_ready(input_file):
+        assert time.monotonic() < deadline, f"{input_file} was never staged"
+        stager.wait(0.05)
+
+
+def test_stager_round_trip(tmp_path: Path) -> None:
+    jobs = make_jobs(tmp_path, 3)
+    config = StagingConfig(scratch_dir=tmp_path, prefetch=1)
+
+    with ScratchStager(config, jobs) as stager:
+        scratch_dir = stager.scratch_dir
+        for input_file, output_file in jobs:
+            wait_until_ready(stager, input_file)
+            local_input, local_output = stager.claim(input_file)
+            assert local_input.parent == scratch_dir
+            local_output.write_bytes(local_input.read_bytes()[::-1])
+            if input_file.name == "0.las":
+                lax_path(local_output).write_bytes(b"LASX")
+            stager.finish(input_file, output_file, success=input_file.name != "1.las")
+
+        while stager.moves_pending:
+            stager.wait(0.05)
+        moved = stager.completed_moves()
+
+    assert [(input_file.name, exception) for input_file, _, exception in moved] == [("0.las", None), ("2.las", None)]
+    assert sorted(p.name for p in (tmp_path / "out").iterdir()) == ["0.lax", "0.laz", "2.laz"]
+    assert (tmp_path / "out" / "2.laz").read_bytes() == bytes([2]) * 100
+    assert not scratch_dir.exists()
+
+
+def test_stager_moves_extra_outputs(tmp_path: Path) -> None:
+    jobs = make_jobs(tmp_path, 2)
+    extra_outputs = {
+        input_file: [output_file.with_suffix(".parquet"), output_file.with_name(f"{output_file.stem}_geog.laz")]
+        for input_file, output_file in jobs
+    }
+    config = StagingConfig(scratch_dir=tmp_path, prefetch=2)
+
+    with ScratchStager(config, jobs, extra_outputs) as stager:
+        for input_file, output_file in jobs:
+            wait_until_ready(stager, input_file)
+            _, local_output = stager.claim(input_file)
+            for local_file in [local_output, *map(stager.local_output, extra_outputs[input_file])]:
+                assert local_file.parent == stager.scratch_dir
+                local_file.write_bytes(b"points")
+            lax_path(stager.local_output(extra_outputs[input_file][1])).write_bytes(b"LASX")
+            stager.finish(input_file, output_file, success=input_file.name == "0.las")
+
+        while stager.moves_pending:
+            stager.wait(0.05)
+
+    assert sorted(p.name for p in (tmp_path / "out").iterdir()) == ["0.laz", "0.parquet", "0_geog.lax", "0_geog.laz"]
+
+
+def test_stager_reports_copy_failure(tmp_path: Path) -> None:
+    jobs = make_jobs(tmp_path, 2)
+    missing, _ = jobs[0]
+    config = StagingConfig(scratch_dir=tmp_path, prefetch=1)
+
+    stager = ScratchStager(config, jobs)
+    missing.unlink()
+    with stager:
+        with pytest.raises(StagingError):
+            wait_until_ready(stager, missing)
+        # A failed copy does not hold up prefetching of the next input
+        wait_until_ready(stager, jobs[1][0])
+
+
+def test_run_stages_parquet_copies_and_targets(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, transform_config: TransformConfig
+) -> None:
+    pytest.importorskip("pyarrow")
+    monkeypatch.setattr("las_trx.transformation.get_transformer", lambda config: lambda coords: coords)
+    written = []
+
+    def record_outputs(*args: object, parquet_file: Path, target_files: list[Path], **kwargs: object) -> object:
+        written.extend([args[2], parquet_file, *target_files])
+        return transform_file(*args, parquet_file=parquet_file, target_files=target_files, **kwargs)
+
+    monkeypatch.setattr("las_trx.transformation.transform_file", record_outputs)
+    (tmp_path / "in").mkdir()
+    (tmp_path / "out").mkdir()
+    las = laspy.LasData(laspy.LasHeader(point_format=3, version="1.2"))
+    las.x, las.y, las.z = np.arange(10.0), np.arange(10.0), np.arange(10.0)
+    las.write(tmp_path / "in" / "a.las")
+    scratch_dir = tmp_path / "scratch"
+    scratch_dir.mkdir()
+    config = transform_config.model_copy(
+        update={
+            "executor": TrxExecutor.THREAD,
+            "staging": StagingConfig(scratch_dir=scratch_dir),
+            "parquet_copy": True,
+            "targets": [TargetConfig(destination=transform_config.origin, output=str(tmp_path / "out" / "{}_b.laz"))],
+        }
+    )
+    manager = TransformationManager(config, str(tmp_path / "in" / "*.las"), str(tmp_path / "out" / "{}.laz"))
+
+    results = list(manager.execute_transformations())
+
+    assert [exception for _, _, exception in results] == [None]
+    assert len(written) == 3
+    assert all(path.parent.parent == scratch_dir for path in written)
+    assert sorted(p.name for p in (tmp_path / "out").iterdir()) == ["a.laz", "a.parquet", "a_b.laz"]
+    assert laspy.read(tmp_path / "out" / "a_b.laz").header.point_count == 10
+    assert not any(scratch_dir.iterdir())
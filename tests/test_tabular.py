@@ -0,0 +1,75 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from las_trx.config import TabularConfig, TransformConfig
+from las_trx.tabular import count_rows, transform_table
+
+
+def shift(coords: np.ndarray) -> list[tuple[float, float, float]]:
+    """Stand-in for CSRSTransformer that shifts coordinates by a fixed amount."""
+    return [(x + 1000.0, y - 1000.0, z + 1.0) for x, y, z in coords]
+
+
+def test_transform_csv_keeps_other_columns(tmp_path: Path, transform_config: TransformConfig) -> None:
+    input_file = tmp_path / "points.csv"
+    input_file.write_text("name,e,n,h\r\n# control\r\nA,1.5,2.5,3.5\r\n\r\nB,10,20,30\r\n", newline="")
+    config = transform_config.model_copy(
+        update={"tabular": TabularConfig(x_column="e", y_column="n", z_column="h", header=True)}
+    )
+
+    chunks = list(transform_table(config, input_file, tmp_path / "out.csv", shift, chunk_size=3))
+
+    assert chunks == [3, 1]
+    assert count_rows(input_file, config.tabular) == 4
+    assert (tmp_path / "out.csv").read_bytes() == (
+        b"name,e,n,h\r\n# control\r\nA,1001.5000,-997.5000,4.5000\r\n\r\nB,1010.0000,-980.0000,31.0000\r\n"
+    )
+
+
+def test_transform_npy_in_chunks(tmp_path: Path, transform_config: TransformConfig) -> None:
+    array = np.arange(20, dtype=np.int32).reshape(5, 4)
+    np.save(tmp_path / "points.npy", array)
+    config = transform_config.model_copy(update={"tabular": TabularConfig(x_column=1, y_column=2, z_column=3)})
+
+    chunks = list(transform_table(config, tmp_path / "points.npy", tmp_path / "out.npy", shift, chunk_size=2))
+
+    assert chunks == [2, 2, 1]
+    result = np.load(tmp_path / "out.npy")
+    assert result.dtype == np.float64
+    np.testing.assert_array_equal(result[:, 0], array[:, 0])
+    np.testing.assert_array_equal(result[:, 1:], array[:, 1:] + [1000, -1000, 1])
+
+
+def test_transform_npz_structured(tmp_path: Path, transform_config: TransformConfig) -> None:
+    points = np.zeros(3, dtype=[("x", "f8"), ("y", "f8"), ("z", "f8"), ("t", "f8")])
+    points["t"] = [1, 2, 3]
+    np.savez_compressed(tmp_path / "points.npz", meta=np.array([7]), points=points)
+    tabular = TabularConfig(x_column="x", y_column="y", z_column="z", array_key="points")
+    config = transform_config.model_copy(update={"tabular": tabular})
+
+    assert count_rows(tmp_path / "points.npz", tabular) == 3
+    assert list(transform_table(config, tmp_path / "points.npz", tmp_path / "out.npz", shift, chunk_size=10)) == [3]
+    with np.load(tmp_path / "out.npz") as result:
+        np.testing.assert_array_equal(result["meta"], [7])
+        np.testing.assert_array_equal(result["points"]["x"], [1000.0] * 3)
+        np.testing.assert_array_equal(result["points"]["t"], points["t"])
+
+
+def test_transform_npy_to_several_outputs(tmp_path: Path, transform_config: TransformConfig) -> None:
+    array = np.arange(12, dtype=np.float64).reshape(4, 3)
+    np.save(tmp_path / "points.npy", array)
+    targets = [(transform_config, tmp_path / "same.npy", lambda coords: coords)]
+
+    chunks = transform_table(transform_config, tmp_path / "points.npy", tmp_path / "out.npy", shift, 3, targets)
+
+    assert list(chunks) == [3, 1]
+    np.testing.assert_array_equal(np.load(tmp_path / "out.npy"), shift(array))
+    np.testing.assert_array_equal(np.load(tmp_path / "same.npy"), array)
+
+
+def test_transform_table_rejects_other_output_format(tmp_path: Path, transform_config: TransformConfig) -> None:
+    (tmp_path / "points.csv").write_text("1,2,3\n")
+    with pytest.raises(ValueError, match=r"must also be a \.csv file"):
+        list(transform_table(transform_config, tmp_path / "points.csv", tmp_path / "out.laz", shift, chunk_size=10))
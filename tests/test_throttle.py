@@ -0,0 +1,85 @@
+import os
+import sys
+import threading
+
+import pytest
+
+from las_trx.config import TrxExecutor
+from las_trx.executor import ThreadCounter, create_executor
+from las_trx.throttle import IoThrottle
+
+MB = 1024**2
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr("las_trx.throttle.time", fake)
+    return fake
+
+
+def make_throttle(rate: float, burst: float = 1.0) -> IoThrottle:
+    return IoThrottle(threading.RLock(), ThreadCounter(rate), ThreadCounter(0.0), burst=burst)
+
+
+def test_unlimited_throttle_never_waits(clock: FakeClock) -> None:
+    throttle = make_throttle(0.0)
+    for _ in range(100):
+        throttle.consume(100 * MB)
+    assert clock.sleeps == []
+
+
+def test_throttle_holds_average_rate(clock: FakeClock) -> None:
+    throttle = make_throttle(10.0)
+    start = clock.now
+    for _ in range(50):
+        throttle.consume(1 * MB)
+
+    # 50 MB at 10 MB/s, less the one second burst that passes without waiting
+    assert clock.now - start == pytest.approx(4.0)
+
+
+def test_rate_change_applies_immediately(clock: FakeClock) -> None:
+    throttle = make_throttle(1.0)
+    for _ in range(5):
+        throttle.consume(1 * MB)
+    assert sum(clock.sleeps) == pytest.approx(4.0)
+
+    clock.sleeps.clear()
+    throttle.set_rate(None)
+    throttle.consume(1_000 * MB)
+    assert clock.sleeps == []
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="Per-thread nice values are Linux specific")
+def test_low_priority_thread_workers_keep_main_thread_priority() -> None:
+    main_priority = os.getpriority(os.PRIO_PROCESS, 0)
+
+    with create_executor(TrxExecutor.THREAD, 1, low_priority=True) as pool:
+        worker_priority = pool.submit(os.getpriority, os.PRIO_PROCESS, 0).result()
+
+    assert worker_priority > main_priority or worker_priority == 19
+    assert os.getpriority(os.PRIO_PROCESS, 0) == main_priority
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Uses POSIX nice values")
+def test_low_priority_process_workers() -> None:
+    main_priority = os.getpriority(os.PRIO_PROCESS, 0)
+
+    with create_executor(TrxExecutor.PROCESS, 1, low_priority=True) as pool:
+        worker_priority = pool.submit(os.getpriority, os.PRIO_PROCESS, 0).result()
+
+    assert worker_priority > main_priority or worker_priority == 19
@@ -0,0 +1,120 @@
+from pathlib import Path
+
+import laspy
+import numpy as np
+import pytest
+
+from las_trx.config import TilingConfig, TransformConfig, TrxExecutor
+from las_trx.file_operations import FileOperationError, discover_files
+from las_trx.tiling import TileRouter, merge_tile, tile_path, tile_root
+from las_trx.transformation import TransformationManager
+
+
+def make_points(x: list[float], y: list[float]) -> laspy.ScaleAwarePointRecord:
+    header = laspy.LasHeader(point_format=3, version="1.2")
+    header.scales = np.array([0.01, 0.01, 0.01])
+    header.offsets = np.array([500_000.0, 5_400_000.0, 0.0])
+    points = laspy.ScaleAwarePointRecord.zeros(len(x), header=header)
+    points.x = x
+    points.y = y
+    return points
+
+
+def test_tile_path_from_corner() -> None:
+    pattern = Path("tiles/{x}/{y:07d}.laz")
+
+    assert tile_path(pattern, 1000.0, (512, 5434)) == Path("tiles/512000/5434000.laz")
+    assert tile_path(Path("{x}_{y}.las"), 0.5, (3, -1)) == Path("1.5_-0.5.las")
+    assert tile_root(pattern) == Path("tiles")
+
+
+def test_tiled_pattern_names_tiles(tmp_path: Path, transform_config: TransformConfig) -> None:
+    (tmp_path / "a.laz").touch()
+    (tmp_path / "b.laz").touch()
+    config = transform_config.model_copy(update={"tiling": TilingConfig()})
+
+    _, output_files = discover_files(str(tmp_path / "*.laz"), str(tmp_path / "{x}_{y}"), config)
+    assert output_files == [tmp_path / "{x}_{y}.laz"] * 2
+
+    with pytest.raises(FileOperationError, match="must contain"):
+        discover_files(str(tmp_path / "*.laz"), str(tmp_path / "{}_out.laz"), config)
+
+
+def test_router_reopens_evicted_fragments(tmp_path: Path, transform_config: TransformConfig) -> None:
+    points = make_points([500_100.0, 501_100.0, 500_200.0, 501_200.0], [5_400_100.0] * 4)
+    tiling = TilingConfig(size=1000.0, max_open=1)
+
+    with TileRouter(tmp_path / "{x}_{y}.las", points_header(points), tiling, "a") as router:
+        router.write_points(points[:2])
+        router.write_points(points[2:])
+    assert {f.tile_file.name for f in router.fragments} == {"500000_5400000.las", "501000_5400000.las"}
+
+    other = make_points([500_300.0], [5_400_300.0])
+    with TileRouter(tmp_path / "{x}_{y}.las", points_header(other), tiling, "b") as other_router:
+        other_router.write_points(other)
+
+    tile_file = tmp_path / "500000_5400000.las"
+    fragments = [f.path for f in [*router.fragments, *other_router.fragments] if f.tile_file == tile_file]
+    config = transform_config.model_copy(update={"tiling": tiling})
+    assert merge_tile(config, tile_file, (500, 5400), fragments) == 3
+
+    np.testing.assert_allclose(laspy.read(tile_file).x, [500_100.0, 500_200.0, 500_300.0])
+    assert not any(fragment.exists() for fragment in fragments)
+
+
+def test_tile_holds_dimensions_of_all_inputs(tmp_path: Path, transform_config: TransformConfig) -> None:
+    tile_file = tmp_path / "500000_5400000.laz"
+    fragments = []
+    for name, point_format, version in (("a", 1, "1.2"), ("b", 3, "1.2"), ("c", 7, "1.4")):
+        header = laspy.LasHeader(point_format=point_format, version=version)
+        header.scales = np.array([0.01, 0.01, 0.01])
+        header.offsets = np.array([500_000.0, 5_400_000.0, 0.0])
+        las = laspy.LasData(header)
+        las.x = np.array([500_100.0])
+        las.y = np.array([5_400_100.0])
+        if point_format != 1:
+            las.red = np.array([1000 * point_format])
+        las.classification = np.array([40 if point_format == 7 else 2])
+        fragments.append(tmp_path / f"{name}.las")
+        las.write(fragments[-1])
+
+    config = transform_config.model_copy(update={"tiling": TilingConfig()})
+    assert merge_tile(config, tile_file, (500, 5400), fragments) == 3
+
+    tile = laspy.read(tile_file)
+    assert tile.header.point_format.id == 7
+    np.testing.assert_array_equal(tile.red, [0, 3000, 7000])
+    np.testing.assert_array_equal(tile.classification, [2, 2, 40])
+
+
+def test_failed_tile_merges_are_reported_and_cleaned_up(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, transform_config: TransformConfig
+) -> None:
+    def failing_merge(config: TransformConfig, tile_file: Path, key: tuple[int, int], fragments: list[Path]) -> int:
+        if key == (501, 5400):
+            tile_file.write_bytes(b"partial")
+            raise OSError("disk full")
+        return merge_tile(config, tile_file, key, fragments)
+
+    monkeypatch.setattr("las_trx.transformation.get_transformer", lambda config: lambda coords: coords)
+    monkeypatch.setattr("las_trx.transformation.merge_tile", failing_merge)
+    (tmp_path / "in").mkdir()
+    las = laspy.LasData(points_header(make_points([], [])))
+    las.points = make_points([500_100.0, 501_100.0], [5_400_100.0] * 2)
+    las.write(tmp_path / "in" / "a.las")
+    config = transform_config.model_copy(update={"tiling": TilingConfig(), "executor": TrxExecutor.THREAD})
+    manager = TransformationManager(config, str(tmp_path / "in" / "*.las"), str(tmp_path / "out" / "{x}_{y}.las"))
+
+    assert [exception for _, _, exception in manager.execute_transformations()] == [None]
+
+    failed = tmp_path / "out" / "501000_5400000.las"
+    assert list(manager.failed_merges) == [failed]
+    assert "disk full" in str(manager.failed_merges[failed])
+    assert sorted(p.name for p in (tmp_path / "out").iterdir()) == ["500000_5400000.las"]
+
+
+def points_header(points: laspy.ScaleAwarePointRecord) -> laspy.LasHeader:
+    header = laspy.LasHeader(point_format=points.point_format, version="1.2")
+    header.scales = points.scales
+    header.offsets = points.offsets
+    return header
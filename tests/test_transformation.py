@@ -0,0 +1,298 @@
+import io
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import laspy
+import numpy as np
+import pytest
+
+from las_trx.config import ReferenceConfig, TargetConfig, TransformConfig, TrxCoordType, TrxExecutor, TrxReference
+from las_trx.file_operations import FileOperationError, discover_files
+from las_trx.transformation import (
+    OutputWriters,
+    TransformationError,
+    TransformationManager,
+    transform_file,
+    transform_header_bounds,
+    transform_stream,
+    write_header_geokeys_from_crs,
+    write_output_points,
+)
+
+
+class SwapTransformer:
+    """Stand-in for CSRSTransformer that swaps X and Y and negates Z."""
+
+    def __call__(self, coords: np.ndarray) -> list[tuple[float, float, float]]:
+        return [(y, x, -z) for x, y, z in coords]
+
+
+class ShiftTransformer:
+    """Stand-in for CSRSTransformer that shifts every coordinate by a constant."""
+
+    def __call__(self, coords: np.ndarray) -> list[tuple[float, float, float]]:
+        return [(x + 1000, y + 1000, z + 1000) for x, y, z in coords]
+
+
+class ForwardOnlyStream(io.RawIOBase):
+    """Binary stream that cannot seek, like a pipe."""
+
+    def __init__(self, data: bytes = b"") -> None:
+        self.source = io.BytesIO(data)
+        self.written = bytearray()
+
+    def readable(self) -> bool:
+        return True
+
+    def writable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: bytearray) -> int:
+        return self.source.readinto(buffer)
+
+    def write(self, data: bytes) -> int:
+        self.written.extend(data)
+        return len(data)
+
+
+def write_las(path: Path, origin: ReferenceConfig | None = None) -> laspy.LasData:
+    header = laspy.LasHeader(point_format=3, version="1.2")
+    if origin is not None:
+        write_header_geokeys_from_crs(header, origin.crs)
+    las = laspy.LasData(header)
+    las.x = np.array([0.0, 1.0, 2.0])
+    las.y = np.array([10.0, 11.0, 12.0])
+    las.z = np.array([100.0, 101.0, 102.0])
+    las.write(path)
+    return las
+
+
+def test_transform_header_bounds() -> None:
+    header = SimpleNamespace(mins=np.array([0.0, 10.0, 100.0]), maxs=np.array([1.0, 20.0, 200.0]))
+    mins, maxs = transform_header_bounds(header, SwapTransformer())
+
+    np.testing.assert_array_equal(mins, [10.0, 0.0, -200.0])
+    np.testing.assert_array_equal(maxs, [20.0, 1.0, -100.0])
+
+
+def test_transform_stream_is_forward_only(monkeypatch: pytest.MonkeyPatch, transform_config: TransformConfig) -> None:
+    monkeypatch.setattr("las_trx.transformation.get_transformer", lambda config: SwapTransformer())
+
+    las = laspy.create(point_format=3, file_version="1.2")
+    las.x = np.array([0.0, 1.0, 2.0])
+    las.y = np.array([10.0, 11.0, 12.0])
+    las.z = np.array([100.0, 101.0, 102.0])
+    las.classification = np.array([1, 2, 3])
+    source = io.BytesIO()
+    las.write(source)
+
+    stream = ForwardOnlyStream(source.getvalue())
+    num_points = transform_stream(transform_config, stream, stream, chunk_size=2)
+
+    assert num_points == 3
+    result = laspy.read(io.BytesIO(bytes(stream.written)))
+    np.testing.assert_allclose(result.x, las.y, atol=0.01)
+    np.testing.assert_allclose(result.y, las.x, atol=0.01)
+    np.testing.assert_allclose(result.z, -np.asarray(las.z), atol=0.01)
+    np.testing.assert_array_equal(result.classification, las.classification)
+    np.testing.assert_allclose(result.header.mins, [10.0, 0.0, -102.0], atol=0.01)
+
+
+def test_transform_stream_decompresses_laz(monkeypatch: pytest.MonkeyPatch, transform_config: TransformConfig) -> None:
+    pytest.importorskip("lazrs")
+    monkeypatch.setattr("las_trx.transformation.get_transformer", lambda config: SwapTransformer())
+
+    las = laspy.create(point_format=3, file_version="1.2")
+    las.x = np.array([0.0, 1.0, 2.0])
+    las.y = np.array([10.0, 11.0, 12.0])
+    las.z = np.array([100.0, 101.0, 102.0])
+    source = io.BytesIO()
+    las.write(source, do_compress=True)
+
+    stream = ForwardOnlyStream(source.getvalue())
+    transform_stream(transform_config, stream, stream)
+
+    result = laspy.read(io.BytesIO(bytes(stream.written)))
+    assert not result.header.are_points_compressed
+    assert "LasZipVlr" not in [vlr.__class__.__name__ for vlr in result.header.vlrs]
+    np.testing.assert_allclose(result.x, las.y, atol=0.01)
+    np.testing.assert_allclose(result.z, -np.asarray(las.z), atol=0.01)
+
+
+def test_transform_stream_needs_lazrs_for_laz(
+    monkeypatch: pytest.MonkeyPatch, transform_config: TransformConfig
+) -> None:
+    las = laspy.create(point_format=3, file_version="1.2")
+    las.x = las.y = las.z = np.array([0.0, 1.0, 2.0])
+    source = io.BytesIO()
+    las.write(source, do_compress=True)
+    monkeypatch.setattr(laspy.LazBackend, "is_available", lambda self: False)
+
+    stream = ForwardOnlyStream(source.getvalue())
+    with pytest.raises(TransformationError, match="lazrs"):
+        transform_stream(transform_config, stream, stream)
+    assert not stream.written
+
+
+def test_transform_file_fans_out_to_targets(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, transform_config: TransformConfig
+) -> None:
+    def fake_transformer(config: TransformConfig) -> SwapTransformer:
+        # Keyed by destination like the transformer cache, so both geographic targets share one
+        return transformers.setdefault(config.destination.coord_type, SwapTransformer())
+
+    transformers = {}
+    monkeypatch.setattr("las_trx.transformation.get_transformer", fake_transformer)
+
+    geographic = transform_config.destination.model_copy(update={"coord_type": TrxCoordType.GEOG})
+    config = transform_config.model_copy(
+        update={
+            "targets": [
+                TargetConfig(destination=geographic, output=str(tmp_path / "{}_geog.csv")),
+                TargetConfig(destination=geographic, output=str(tmp_path / "{}_copy")),
+            ]
+        }
+    )
+    (tmp_path / "points.csv").write_text("1,2,3\n")
+    progress = SimpleNamespace(value=0)
+
+    transform_file(config, tmp_path / "points.csv", tmp_path / "points_utm.csv", threading.RLock(), progress)
+
+    assert progress.value == 1
+    assert len(transformers) == 2
+    assert (tmp_path / "points_utm.csv").read_text() == "2.0000,1.0000,-3.0000\n"
+    assert (tmp_path / "points_geog.csv").read_text() == "2.000000000,1.000000000,-3.0000\n"
+    assert (tmp_path / "points_copy.csv").read_text() == "2.000000000,1.000000000,-3.0000\n"
+
+
+def test_tables_are_read_once_for_all_targets(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, transform_config: TransformConfig
+) -> None:
+    input_file = tmp_path / "points.csv"
+    input_file.write_text("1,2,3\n4,5,6\n")
+    opened = []
+    path_open = Path.open
+
+    def record_open(path: Path, *args: object, **kwargs: object) -> object:
+        if path == input_file:
+            opened.append(path)
+        return path_open(path, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "open", record_open)
+    monkeypatch.setattr("las_trx.transformation.count_rows", lambda *args: pytest.fail("Rows were already counted"))
+    monkeypatch.setattr("las_trx.transformation.get_transformer", lambda config: SwapTransformer())
+    geographic = transform_config.destination.model_copy(update={"coord_type": TrxCoordType.GEOG})
+    config = transform_config.model_copy(
+        update={"targets": [TargetConfig(destination=geographic, output=str(tmp_path / "{}_geog.csv"))]}
+    )
+
+    transform_file(
+        config, input_file, tmp_path / "points_utm.csv", threading.RLock(), SimpleNamespace(value=0), point_count=2
+    )
+
+    assert len(opened) == 1
+    assert (tmp_path / "points_utm.csv").read_text() == "2.0000,1.0000,-3.0000\n5.0000,4.0000,-6.0000\n"
+    assert (
+        tmp_path / "points_geog.csv"
+    ).read_text() == "2.000000000,1.000000000,-3.0000\n5.000000000,4.000000000,-6.0000\n"
+
+
+def test_las_is_decoded_once_for_all_targets(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, transform_config: TransformConfig
+) -> None:
+    transformers = {TrxCoordType.UTM10: SwapTransformer(), TrxCoordType.GEOG: ShiftTransformer()}
+    monkeypatch.setattr(
+        "las_trx.transformation.get_transformer", lambda config: transformers[config.destination.coord_type]
+    )
+    written = []
+
+    def record_points(output: OutputWriters, points: laspy.ScaleAwarePointRecord, coords: np.ndarray | None) -> None:
+        written.append((output.header, points))
+        write_output_points(output, points, coords)
+
+    monkeypatch.setattr("las_trx.transformation.write_output_points", record_points)
+    geographic = transform_config.destination.model_copy(update={"coord_type": TrxCoordType.GEOG})
+    config = transform_config.model_copy(
+        update={
+            "targets": [
+                TargetConfig(destination=geographic, output=str(tmp_path / "out" / "{}_geog.las")),
+                TargetConfig(destination=geographic, output=str(tmp_path / "out" / "{}_geog.laz")),
+            ]
+        }
+    )
+    las = write_las(tmp_path / "points.las")
+    output_file = tmp_path / "out" / "points.las"
+    output_file.parent.mkdir()
+
+    transform_file(config, tmp_path / "points.las", output_file, threading.RLock(), SimpleNamespace(value=0))
+
+    # The last output takes the decoded chunk, rescaled in place, and the others rescaled copies of it
+    (main_header, main), (_, geog), (last_header, last) = written
+    assert not np.shares_memory(main.array, last.array)
+    assert not np.shares_memory(geog.array, last.array)
+    for header, points in written:
+        np.testing.assert_array_equal(points.offsets, header.offsets)
+    assert not np.array_equal(main_header.offsets, last_header.offsets)
+
+    x, y, z = np.asarray(las.x), np.asarray(las.y), np.asarray(las.z)
+    result = laspy.read(output_file)
+    np.testing.assert_allclose(np.stack([result.x, result.y, result.z]), [y, x, -z], atol=0.01)
+    for name in ("points_geog.las", "points_geog.laz"):
+        result = laspy.read(tmp_path / "out" / name)
+        np.testing.assert_allclose(np.stack([result.x, result.y, result.z]), [x + 1000, y + 1000, z + 1000], atol=0.01)
+
+
+def test_discover_files_checks_target_conflicts(tmp_path: Path, transform_config: TransformConfig) -> None:
+    (tmp_path / "points.csv").write_text("1,2,3\n")
+    config = transform_config.model_copy(
+        update={"targets": [TargetConfig(destination=transform_config.destination, output=str(tmp_path / "{}.csv"))]}
+    )
+
+    with pytest.raises(FileOperationError):
+        discover_files(str(tmp_path / "*.csv"), str(tmp_path / "{}_out.csv"), config)
+
+
+def test_transform_stream_detects_origin(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, transform_config: TransformConfig
+) -> None:
+    origins = []
+
+    def fake_transformer(config: TransformConfig) -> SwapTransformer:
+        origins.append(config.origin)
+        return SwapTransformer()
+
+    monkeypatch.setattr("las_trx.transformation.get_transformer", fake_transformer)
+    origin = transform_config.origin.model_copy(update={"ref_frame": TrxReference.NAD83CSRS})
+    write_las(tmp_path / "a.las", origin)
+    config = transform_config.model_copy(update={"detect_origin": True})
+
+    stream = ForwardOnlyStream((tmp_path / "a.las").read_bytes())
+    assert transform_stream(config, stream, stream) == 3
+    assert origins == [origin]
+
+
+def test_origins_are_detected_per_crs(tmp_path: Path, transform_config: TransformConfig) -> None:
+    itrf = transform_config.origin
+    nad83 = itrf.model_copy(update={"ref_frame": TrxReference.NAD83CSRS})
+    for name, origin in (("a", itrf), ("b", nad83), ("c", itrf)):
+        write_las(tmp_path / f"{name}.las", origin)
+    config = transform_config.model_copy(update={"detect_origin": True, "executor": TrxExecutor.THREAD})
+
+    manager = TransformationManager(config, str(tmp_path / "*.las"), str(tmp_path / "out" / "{}.laz"))
+
+    origins = {path.stem: file_config.origin for path, file_config in manager.file_configs.items()}
+    assert origins == {"a": itrf, "b": nad83, "c": itrf}
+
+
+def test_undetected_origins_abort_before_transforming(tmp_path: Path, transform_config: TransformConfig) -> None:
+    write_las(tmp_path / "a.las", transform_config.origin)
+    write_las(tmp_path / "b.las")
+    write_las(tmp_path / "c.las")
+    config = transform_config.model_copy(update={"detect_origin": True, "executor": TrxExecutor.THREAD})
+
+    with pytest.raises(TransformationError, match="2 file") as e:
+        TransformationManager(config, str(tmp_path / "*.las"), str(tmp_path / "out" / "{}.laz"))
+    assert "b.las: no CRS VLRs" in str(e.value)
+    assert "c.las: no CRS VLRs" in str(e.value)
+    assert not (tmp_path / "out").exists()